@@ -1,3 +1,39 @@
+import threading
+import time
+from typing import Tuple
+
+
+class SingletonObserver:
+    """
+    Interface de observação dos eventos da metaclasse (a mesma de 17_singleton_observers.py).
+
+    Métodos:
+        on_hit(cls): Uma chamada reutilizou a instância existente.
+        on_miss(cls, lock_wait): A instância não existia; `lock_wait` é o tempo até obter o lock.
+        on_create(cls, instance, duration): Uma instância foi construída em `duration` segundos.
+        on_error(cls, exc, duration): O construtor levantou `exc`.
+    """
+
+    def on_hit(self, cls) -> None:
+        pass
+
+    def on_miss(self, cls, lock_wait: float) -> None:
+        pass
+
+    def on_create(self, cls, instance, duration: float) -> None:
+        pass
+
+    def on_error(self, cls, exc: BaseException, duration: float) -> None:
+        pass
+
+
+class PrintObserver(SingletonObserver):
+    """Mostra as construções no terminal; registrado apenas pelo exemplo abaixo."""
+
+    def on_create(self, cls, instance, duration: float) -> None:
+        print(f'Criando nova instância da classe {cls.__name__} ({duration * 1000:.2f}ms)')
+
+
 class MetaSingleton(type):
     """
     Metaclasse que implementa o padrão Singleton.
@@ -6,19 +42,43 @@ class MetaSingleton(type):
     Neste caso, a metaclasse `MetaSingleton` redefine o método `__call__` para garantir que
     a classe criada por ela siga o padrão Singleton.
 
+    Os eventos (reutilização, construção com o tempo do `__init__`, espera pelo lock) vão para
+    os observadores registrados com `add_observer`, em vez de `print`. Sem observadores o caminho
+    rápido percorre uma tupla vazia: nenhum relógio é lido e nada é impresso.
+
     Métodos:
+        __init__(cls, name, bases, namespace): Cria o lock exclusivo de cada classe.
+        add_observer(observer) / remove_observer(observer): Gerenciam os observadores.
         __call__(cls, *args, **kwargs): Controla a criação de instâncias, garantindo que apenas
         uma instância seja criada para a classe `Produto`.
     """
 
     _instances = {}
+    _observers: Tuple[SingletonObserver, ...] = ()
+    _observers_lock = threading.Lock()
+
+    def __init__(cls, name, bases, namespace):
+        super().__init__(name, bases, namespace)
+        # Um lock por classe: a construção de uma classe não faz as outras esperarem
+        cls._lock = threading.Lock()
+
+    @staticmethod
+    def add_observer(observer: SingletonObserver) -> None:
+        with MetaSingleton._observers_lock:
+            MetaSingleton._observers = MetaSingleton._observers + (observer,)
+
+    @staticmethod
+    def remove_observer(observer: SingletonObserver) -> None:
+        with MetaSingleton._observers_lock:
+            MetaSingleton._observers = tuple(o for o in MetaSingleton._observers if o is not observer)
 
     def __call__(cls, *args, **kwargs):
         """
         Sobrescreve o método __call__ para controlar a criação de instâncias.
 
         Caso uma instância da classe já exista, ela será retornada. Se ainda não existir,
-        uma nova instância será criada e armazenada.
+        uma nova instância será criada e armazenada. A verificação é repetida dentro do
+        lock (double-checked locking) para que duas threads não criem duas instâncias.
 
         Args:
             *args: Argumentos posicionais para o construtor da classe.
@@ -27,12 +87,34 @@ class MetaSingleton(type):
         Returns:
             A única instância da classe `Produto`.
         """
-        if cls not in cls._instances:
-            print(f'Criando nova instância da classe {cls.__name__} com argumentos: {args}')
-            cls._instances[cls] = super().__call__(*args, **kwargs)
-        else:
-            print(f'Retornando instância existente da classe {cls.__name__}')
-        return cls._instances[cls]
+        observers = MetaSingleton._observers
+        if cls in cls._instances:
+            for observer in observers:
+                observer.on_hit(cls)
+            return cls._instances[cls]
+
+        wait_start = time.perf_counter()
+        with cls._lock:
+            lock_wait = time.perf_counter() - wait_start
+            if cls in cls._instances:
+                # Outra thread construiu a instância enquanto esperávamos o lock
+                for observer in observers:
+                    observer.on_hit(cls)
+                return cls._instances[cls]
+            for observer in observers:
+                observer.on_miss(cls, lock_wait)
+            start = time.perf_counter()
+            try:
+                instance = super().__call__(*args, **kwargs)
+            except BaseException as exc:
+                for observer in observers:
+                    observer.on_error(cls, exc, time.perf_counter() - start)
+                raise
+            duration = time.perf_counter() - start
+            cls._instances[cls] = instance
+        for observer in observers:
+            observer.on_create(cls, instance, duration)
+        return instance
 
 
 class Produto(metaclass=MetaSingleton):
@@ -50,6 +132,7 @@ class Produto(metaclass=MetaSingleton):
 
 
 # Testando o padrão Singleton com metaclasses
+MetaSingleton.add_observer(PrintObserver())
 obj1 = Produto("Camisa", 720)  # Criando a primeira instância
 print(f'Objeto 1: {obj1}, ID: {id(obj1)}')
 
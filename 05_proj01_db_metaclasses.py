@@ -1,5 +1,39 @@
 import sqlite3
-from typing import Optional
+import threading
+import time
+from typing import Optional, Tuple
+
+
+class SingletonObserver:
+    """
+    Interface de observação dos eventos da metaclasse (a mesma de 17_singleton_observers.py).
+
+    Métodos:
+        on_hit(cls): Uma chamada reutilizou a instância existente.
+        on_miss(cls, lock_wait): A instância não existia; `lock_wait` é o tempo até obter o lock.
+        on_create(cls, instance, duration): Uma instância foi construída em `duration` segundos.
+        on_error(cls, exc, duration): O construtor levantou `exc`.
+    """
+
+    def on_hit(self, cls) -> None:
+        pass
+
+    def on_miss(self, cls, lock_wait: float) -> None:
+        pass
+
+    def on_create(self, cls, instance, duration: float) -> None:
+        pass
+
+    def on_error(self, cls, exc: BaseException, duration: float) -> None:
+        pass
+
+
+class PrintObserver(SingletonObserver):
+    """Mostra as construções no terminal; registrado apenas pelo exemplo abaixo."""
+
+    def on_create(self, cls, instance, duration: float) -> None:
+        print(f'Criando nova instância da classe {cls.__name__} ({duration * 1000:.2f}ms)')
+
 
 class Singleton(type):
     """
@@ -11,12 +45,33 @@ class Singleton(type):
 
     Atributos:
         __instances (dict): Um dicionário para armazenar as instâncias únicas das classes.
+        __lock (threading.Lock): Lock de cada classe, usado apenas na primeira criação.
+        _observers (tuple): Observadores que recebem os eventos no lugar do `print`.
 
     Métodos:
+        __init__(cls, name, bases, namespace): Cria o lock exclusivo de cada classe.
+        add_observer(observer) / remove_observer(observer): Gerenciam os observadores.
         __call__(cls, *args, **kwargs): Sobrescreve o método de criação de instâncias, garantindo
         que apenas uma instância seja criada por classe.
     """
     __instances = {}
+    _observers: Tuple[SingletonObserver, ...] = ()
+    _observers_lock = threading.Lock()
+
+    def __init__(cls, name, bases, namespace):
+        super().__init__(name, bases, namespace)
+        # Um lock por classe: a construção de uma classe não faz as outras esperarem
+        cls.__lock = threading.Lock()
+
+    @staticmethod
+    def add_observer(observer: SingletonObserver) -> None:
+        with Singleton._observers_lock:
+            Singleton._observers = Singleton._observers + (observer,)
+
+    @staticmethod
+    def remove_observer(observer: SingletonObserver) -> None:
+        with Singleton._observers_lock:
+            Singleton._observers = tuple(o for o in Singleton._observers if o is not observer)
 
     def __call__(cls, *args, **kwargs):
         """
@@ -29,10 +84,34 @@ class Singleton(type):
         Returns:
             A instância única da classe.
         """
-        if cls not in cls.__instances:
-            cls.__instances[cls] = super(Singleton, cls).__call__(*args, **kwargs)
-            print(f'Criando nova instância da classe {cls.__name__} com argumentos: {args}')
-        return cls.__instances[cls]
+        observers = Singleton._observers
+        if cls in cls.__instances:
+            for observer in observers:
+                observer.on_hit(cls)
+            return cls.__instances[cls]
+
+        wait_start = time.perf_counter()
+        with cls.__lock:
+            lock_wait = time.perf_counter() - wait_start
+            if cls in cls.__instances:
+                # Outra thread construiu a instância enquanto esperávamos o lock
+                for observer in observers:
+                    observer.on_hit(cls)
+                return cls.__instances[cls]
+            for observer in observers:
+                observer.on_miss(cls, lock_wait)
+            start = time.perf_counter()
+            try:
+                instance = super(Singleton, cls).__call__(*args, **kwargs)
+            except BaseException as exc:
+                for observer in observers:
+                    observer.on_error(cls, exc, time.perf_counter() - start)
+                raise
+            duration = time.perf_counter() - start
+            cls.__instances[cls] = instance
+        for observer in observers:
+            observer.on_create(cls, instance, duration)
+        return instance
 
 
 class Database(metaclass=Singleton):
@@ -66,6 +145,7 @@ class Database(metaclass=Singleton):
 
 
 # Testando o padrão Singleton com a classe Database
+Singleton.add_observer(PrintObserver())
 db1 = Database().connect()  # Cria a primeira conexão com o banco de dados
 db2 = Database().connect()  # Retorna a mesma conexão existente
 
@@ -0,0 +1,198 @@
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+
+class ThreadSafeSingleton(type):
+    """
+    Metaclasse Singleton segura para uso com várias threads.
+
+    As metaclasses de 04_metaclasses_singleton.py e 05_proj01_db_metaclasses.py fazem
+    "verifica e depois atribui" no dicionário de instâncias. Se duas threads chegam ao
+    mesmo tempo na primeira chamada, ambas podem construir o objeto (e abrir duas
+    conexões com o banco). Esta metaclasse usa double-checked locking:
+
+    - Caminho rápido: uma única leitura no dicionário, sem lock e sem I/O.
+    - Caminho lento: apenas na primeira construção, protegido por um lock exclusivo
+      da classe, para que classes diferentes não disputem o mesmo lock.
+
+    Atributos:
+        _instances (dict): Instâncias únicas, indexadas pela classe.
+
+    Métodos:
+        __init__(cls, name, bases, namespace): Cria o lock exclusivo de cada classe.
+        __call__(cls, *args, **kwargs): Retorna a instância única, criando-a se necessário.
+    """
+
+    _instances = {}
+
+    def __init__(cls, name, bases, namespace):
+        super().__init__(name, bases, namespace)
+        cls._singleton_lock = threading.Lock()
+
+    def __call__(cls, *args, **kwargs):
+        """
+        Retorna a instância única da classe.
+
+        A leitura `dict.get` é atômica no CPython, então depois da primeira construção
+        nenhuma thread precisa adquirir o lock.
+
+        Returns:
+            A instância única da classe.
+        """
+        instance = cls._instances.get(cls)
+        if instance is not None:
+            return instance
+
+        with cls._singleton_lock:
+            # Nova verificação: outra thread pode ter criado a instância enquanto esperávamos
+            instance = cls._instances.get(cls)
+            if instance is None:
+                instance = super().__call__(*args, **kwargs)
+                cls._instances[cls] = instance
+        return instance
+
+
+class NaiveSingleton(type):
+    """
+    Metaclasse equivalente à de 04_metaclasses_singleton.py original (sem lock e sem print).
+
+    Usada apenas no benchmark para mostrar a condição de corrida.
+    """
+
+    _instances = {}
+
+    def __call__(cls, *args, **kwargs):
+        if cls not in cls._instances:
+            cls._instances[cls] = super().__call__(*args, **kwargs)
+        return cls._instances[cls]
+
+
+class Database(metaclass=ThreadSafeSingleton):
+    """
+    Versão da classe `Database` de 05_proj01_db_metaclasses.py usando `ThreadSafeSingleton`.
+
+    Além da metaclasse, o método `connect` também faz double-checked locking, evitando
+    que duas threads abram duas conexões na mesma instância.
+
+    Atributos:
+        connection (Optional[sqlite3.Connection]): Objeto de conexão com o banco de dados.
+        cursor (Optional[sqlite3.Cursor]): Cursor associado à conexão com o banco de dados.
+    """
+    connection: Optional[sqlite3.Connection] = None
+    cursor: Optional[sqlite3.Cursor] = None
+
+    def __init__(self):
+        self._connect_lock = threading.Lock()
+
+    def connect(self) -> sqlite3.Cursor:
+        """
+        Estabelece uma conexão com o banco de dados SQLite, se ainda não estiver conectada.
+
+        Returns:
+            sqlite3.Cursor: O cursor associado à conexão com o banco de dados.
+        """
+        if self.connection is None:
+            with self._connect_lock:
+                if self.connection is None:
+                    connection = sqlite3.connect('db.geek', check_same_thread=False)
+                    self.cursor = connection.cursor()
+                    self.connection = connection
+        return self.cursor
+
+
+# ---------------------------------------------------------------------------
+# Benchmark de contenção
+# ---------------------------------------------------------------------------
+
+THREAD_COUNTS = (1, 2, 4, 8, 16, 32, 64)
+CALLS_PER_THREAD = 20_000
+
+
+def make_counted_class(metaclass):
+    """
+    Cria uma classe nova (com o registro vazio) que conta quantas vezes foi construída.
+
+    O construtor é propositalmente lento para alargar a janela da condição de corrida.
+    """
+    counter = {'builds': 0}
+    counter_lock = threading.Lock()
+
+    def __init__(self):
+        time.sleep(0.001)
+        with counter_lock:
+            counter['builds'] += 1
+
+    cls = metaclass('Recurso', (), {'__init__': __init__})
+    return cls, counter
+
+
+def run_benchmark(metaclass, n_threads):
+    """
+    Executa `CALLS_PER_THREAD` chamadas por thread, todas liberadas ao mesmo tempo.
+
+    Returns:
+        tuple: (chamadas por segundo, número de instâncias construídas, ids distintos)
+    """
+    cls, counter = make_counted_class(metaclass)
+    barrier = threading.Barrier(n_threads)
+    seen_ids = set()
+    seen_lock = threading.Lock()
+
+    def worker():
+        barrier.wait()
+        first = cls()
+        for _ in range(CALLS_PER_THREAD - 1):
+            cls()
+        with seen_lock:
+            seen_ids.add(id(first))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_threads) as executor:
+        for future in [executor.submit(worker) for _ in range(n_threads)]:
+            future.result()
+    elapsed = time.perf_counter() - start
+
+    total_calls = n_threads * CALLS_PER_THREAD
+    return total_calls / elapsed, counter['builds'], len(seen_ids)
+
+
+def main():
+    print(f"{'threads':>8} | {'metaclasse':<20} | {'chamadas/s':>14} | {'construções':>11} | {'ids':>4}")
+    print('-' * 70)
+    for n_threads in THREAD_COUNTS:
+        for metaclass in (NaiveSingleton, ThreadSafeSingleton):
+            calls_per_sec, builds, distinct = run_benchmark(metaclass, n_threads)
+            print(
+                f'{n_threads:>8} | {metaclass.__name__:<20} | {calls_per_sec:>14,.0f} | '
+                f'{builds:>11} | {distinct:>4}'
+            )
+            if metaclass is ThreadSafeSingleton:
+                assert builds == 1 and distinct == 1, 'ThreadSafeSingleton construiu mais de uma instância!'
+
+    # A classe Database também é segura: todas as threads recebem o mesmo cursor
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        cursors = set(executor.map(lambda _: id(Database().connect()), range(64)))
+    print(f'\nCursores distintos obtidos por 64 chamadas em 16 threads: {len(cursors)}')
+
+
+if __name__ == '__main__':
+    main()
+
+# ### Explicação do Double-Checked Locking
+
+# - **Problema**:
+#   - `if cls not in cls._instances: cls._instances[cls] = ...` não é atômico.
+#   - Duas threads podem passar pelo `if` antes que qualquer uma delas termine o construtor,
+# resultando em duas instâncias (na `NaiveSingleton` o benchmark mostra `construções > 1`).
+
+# - **Solução**:
+#   1. Primeiro lê o dicionário sem lock. Se a instância existe, retorna imediatamente (caso comum).
+#   2. Se não existe, adquire o lock da classe e verifica novamente antes de construir.
+#   3. Apenas a primeira construção paga o custo do lock; as demais chamadas seguem sem contenção.
+
+# - **Sem I/O no caminho rápido**:
+#   - Os `print` das versões didáticas foram removidos: escrever no terminal a cada chamada
+# serializa as threads no lock interno do `sys.stdout` e domina o custo da chamada.
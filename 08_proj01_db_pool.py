@@ -0,0 +1,320 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+
+class ThreadSafeSingleton(type):
+    """
+    Metaclasse Singleton com double-checked locking (ver 07_singleton_thread_safe.py).
+
+    Atributos:
+        _instances (dict): Instâncias únicas, indexadas pela classe.
+    """
+
+    _instances = {}
+
+    def __init__(cls, name, bases, namespace):
+        super().__init__(name, bases, namespace)
+        cls._singleton_lock = threading.Lock()
+
+    def __call__(cls, *args, **kwargs):
+        instance = cls._instances.get(cls)
+        if instance is not None:
+            return instance
+        with cls._singleton_lock:
+            instance = cls._instances.get(cls)
+            if instance is None:
+                instance = super().__call__(*args, **kwargs)
+                cls._instances[cls] = instance
+        return instance
+
+
+class PoolTimeout(Exception):
+    """Nenhuma conexão ficou livre dentro do tempo de espera configurado."""
+
+
+class ConnectionPool:
+    """
+    Pool limitado de conexões SQLite.
+
+    As conexões são criadas sob demanda até `size`. Cada conexão recebe o modo WAL e os
+    pragmas uma única vez, ao ser aberta. Na retirada (checkout) a conexão passa por um
+    health check; se falhar, é descartada e substituída por uma nova.
+
+    A retirada é por thread: se a mesma thread pedir uma conexão novamente (por exemplo,
+    em funções aninhadas), recebe a mesma conexão, evitando deadlock no pool.
+
+    Atributos:
+        path (str): Caminho do arquivo do banco de dados.
+        size (int): Número máximo de conexões abertas.
+        timeout (float): Tempo máximo (em segundos) de espera por uma conexão livre.
+        pragmas (dict): Pragmas aplicados em cada nova conexão.
+
+    Métodos:
+        connection() -> Iterator[sqlite3.Connection]: Context manager de retirada/devolução.
+        stats() -> dict: Estatísticas de uso do pool.
+        close() -> None: Fecha todas as conexões livres.
+    """
+
+    DEFAULT_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'temp_store': 'MEMORY',
+    }
+
+    def __init__(self, path: str, size: int = 5, timeout: float = 5.0,
+                 pragmas: Optional[Dict[str, object]] = None):
+        if size < 1:
+            raise ValueError('O tamanho do pool deve ser pelo menos 1')
+        self.path = path
+        self.size = size
+        self.timeout = timeout
+        self.pragmas = dict(self.DEFAULT_PRAGMAS if pragmas is None else pragmas)
+
+        self._idle: List[sqlite3.Connection] = []
+        self._opened = 0
+        self._in_use = 0
+        self._waiters = 0
+        self._checkouts = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._replaced = 0
+        self._condition = threading.Condition(threading.Lock())
+        self._local = threading.local()
+
+    def _open(self) -> sqlite3.Connection:
+        """Abre uma nova conexão e aplica os pragmas uma única vez."""
+        conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name}={value}')
+        return conn
+
+    @staticmethod
+    def _is_healthy(conn: sqlite3.Connection) -> bool:
+        """Verifica se a conexão ainda responde."""
+        try:
+            conn.execute('SELECT 1').fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _acquire(self) -> sqlite3.Connection:
+        start = time.perf_counter()
+        deadline = start + self.timeout
+        with self._condition:
+            self._waiters += 1
+            try:
+                while not self._idle and self._opened >= self.size:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        raise PoolTimeout(
+                            f'Nenhuma conexão livre após {self.timeout}s (pool de {self.size})'
+                        )
+                    self._condition.wait(remaining)
+            finally:
+                self._waiters -= 1
+
+            waited = time.perf_counter() - start
+            self._wait_time_total += waited
+            self._wait_time_max = max(self._wait_time_max, waited)
+            self._checkouts += 1
+            self._in_use += 1
+            if self._idle:
+                conn = self._idle.pop()
+            else:
+                conn = None
+                self._opened += 1
+
+        # Abertura e health check acontecem fora do lock do pool
+        try:
+            if conn is None:
+                return self._open()
+            if not self._is_healthy(conn):
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+                with self._condition:
+                    self._replaced += 1
+                return self._open()
+            return conn
+        except BaseException:
+            with self._condition:
+                self._opened -= 1
+                self._in_use -= 1
+                self._condition.notify()
+            raise
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        broken = False
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except BaseException:
+            # Conexão que não consegue desfazer a transação não volta para o pool
+            broken = True
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+            raise
+        finally:
+            with self._condition:
+                self._in_use -= 1
+                if broken:
+                    self._opened -= 1
+                else:
+                    self._idle.append(conn)
+                self._condition.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Retira uma conexão do pool para a thread atual e a devolve ao sair do bloco.
+
+        Raises:
+            PoolTimeout: Se nenhuma conexão ficar livre dentro de `timeout` segundos.
+        """
+        local = self._local
+        if getattr(local, 'depth', 0):
+            local.depth += 1
+            try:
+                yield local.conn
+            finally:
+                local.depth -= 1
+            return
+
+        conn = self._acquire()
+        local.conn, local.depth = conn, 1
+        try:
+            yield conn
+        finally:
+            local.conn, local.depth = None, 0
+            self._release(conn)
+
+    def stats(self) -> dict:
+        """
+        Retorna um retrato das estatísticas do pool.
+
+        Returns:
+            dict: Conexões abertas, em uso, livres, threads aguardando e tempos de espera.
+        """
+        with self._condition:
+            return {
+                'size': self.size,
+                'opened': self._opened,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'waiters': self._waiters,
+                'checkouts': self._checkouts,
+                'replaced': self._replaced,
+                'wait_time_total': self._wait_time_total,
+                'wait_time_avg': self._wait_time_total / self._checkouts if self._checkouts else 0.0,
+                'wait_time_max': self._wait_time_max,
+            }
+
+    def close(self) -> None:
+        """Fecha todas as conexões livres do pool."""
+        with self._condition:
+            while self._idle:
+                self._idle.pop().close()
+                self._opened -= 1
+
+
+class Database(metaclass=ThreadSafeSingleton):
+    """
+    Fachada Singleton para o banco de dados, agora apoiada em um pool de conexões.
+
+    Em 05/06 existe uma única conexão e um único cursor para o processo inteiro: threads
+    de trabalho ou se serializam nele ou falham com "SQLite objects created in a thread can
+    only be used in that same thread". Aqui a instância continua única, mas cada thread
+    retira sua própria conexão do pool.
+
+    Atributos:
+        pool (ConnectionPool): Pool de conexões usado pela instância.
+
+    Métodos:
+        connection() -> Iterator[sqlite3.Connection]: Retira uma conexão do pool.
+        execute(sql, params) -> None: Executa um comando e confirma a transação.
+        fetchall(sql, params) -> list: Executa uma consulta e retorna todas as linhas.
+        stats() -> dict: Estatísticas do pool.
+    """
+
+    def __init__(self, path: str = 'db.geek', pool_size: int = 5, timeout: float = 5.0,
+                 pragmas: Optional[Dict[str, object]] = None):
+        self.pool = ConnectionPool(path, size=pool_size, timeout=timeout, pragmas=pragmas)
+
+    def connection(self):
+        """Context manager que retira uma conexão do pool para a thread atual."""
+        return self.pool.connection()
+
+    def execute(self, sql: str, params=()) -> None:
+        with self.pool.connection() as conn:
+            with conn:
+                conn.execute(sql, params)
+
+    def fetchall(self, sql: str, params=()) -> list:
+        with self.pool.connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def stats(self) -> dict:
+        return self.pool.stats()
+
+
+def read_workload(db: Database, n_queries: int) -> int:
+    total = 0
+    for i in range(n_queries):
+        rows = db.fetchall('SELECT count(*), sum(preco) FROM produto WHERE id % 7 = ?', (i % 7,))
+        total += rows[0][0]
+    return total
+
+
+if __name__ == '__main__':
+    tmpdir = tempfile.mkdtemp()
+    db = Database(os.path.join(tmpdir, 'db.geek'), pool_size=4, timeout=2.0)
+
+    db.execute('CREATE TABLE IF NOT EXISTS produto (id INTEGER PRIMARY KEY, nome TEXT, preco REAL)')
+    with db.connection() as conn:
+        with conn:
+            conn.executemany(
+                'INSERT INTO produto (nome, preco) VALUES (?, ?)',
+                ((f'produto-{i}', i * 1.5) for i in range(20_000)),
+            )
+
+    print(f'Mesma instância: {Database() is db}')
+    for n_threads in (1, 2, 4, 8, 16):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=n_threads) as executor:
+            list(executor.map(lambda _: read_workload(db, 50), range(n_threads)))
+        elapsed = time.perf_counter() - start
+        print(f'{n_threads:>3} threads: {n_threads * 50 / elapsed:>8,.0f} consultas/s')
+
+    stats = db.stats()
+    print(
+        f"Pool: abertas={stats['opened']} em_uso={stats['in_use']} livres={stats['idle']} "
+        f"retiradas={stats['checkouts']} espera_média={stats['wait_time_avg'] * 1000:.2f}ms "
+        f"espera_máx={stats['wait_time_max'] * 1000:.2f}ms"
+    )
+    db.pool.close()
+
+# ### Explicação do Pool de Conexões
+
+# - **Por que um pool?**:
+#   - Uma conexão `sqlite3` não pode ser compartilhada livremente entre threads, e um único cursor
+# força todas as threads a esperarem umas pelas outras.
+#   - Com o pool, leituras em threads diferentes usam conexões diferentes e, no modo WAL,
+# leitores não bloqueiam uns aos outros nem o escritor.
+
+# - **Limite e espera**:
+#   - O pool nunca abre mais que `size` conexões. Quem chega com o pool cheio espera até `timeout`
+# segundos e então recebe `PoolTimeout`, em vez de ficar preso para sempre.
+
+# - **Health check**:
+#   - Antes de entregar uma conexão reaproveitada, o pool executa `SELECT 1`. Conexões quebradas
+# são fechadas e substituídas de forma transparente.
@@ -0,0 +1,200 @@
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+
+# Objetos herdados do pai que o filho não pode finalizar: se a última referência sumisse, o
+# dealloc de `sqlite3.Connection` chamaria `sqlite3_close` no filho. Ficam vivos até o fim do processo.
+_abandoned: list = []
+
+
+class ForkAwareSingleton(type):
+    """
+    Metaclasse Singleton que cria uma instância por processo.
+
+    Em 01, 04 e 05 a instância fica guardada no estado da classe. Esse estado é herdado
+    por `os.fork()`, então os workers de `multiprocessing` / `ProcessPoolExecutor`
+    reaproveitam a conexão SQLite do processo pai, o que não é seguro e pode corromper dados.
+
+    Esta metaclasse registra hooks com `os.register_at_fork`. No processo filho, logo após
+    o fork, o registro é esvaziado e os locks são recriados (um lock herdado pode ter sido
+    copiado "travado" por outra thread do pai). As instâncias são reconstruídas sob demanda,
+    na primeira chamada dentro do novo processo.
+
+    Cada instância pode definir dois callbacks opcionais:
+
+    - `on_fork_teardown(self)`: chamado no filho logo após o fork, para abandonar recursos
+      herdados (por exemplo, esquecer a conexão do pai *sem* fechá-la).
+    - `on_fork_reinit(self)`: se existir, a instância herdada é mantida e este método é
+      chamado na primeira vez que a classe for usada no filho, em vez de reconstruí-la.
+
+    Atributos:
+        _instances (dict): Instâncias do processo atual, indexadas pela classe.
+        _pending_reinit (dict): Instâncias herdadas aguardando `on_fork_reinit`.
+        _pid (int): PID do processo dono do registro.
+    """
+
+    _instances = {}
+    _pending_reinit = {}
+    _pid = os.getpid()
+    _classes = []
+
+    def __init__(cls, name, bases, namespace):
+        super().__init__(name, bases, namespace)
+        cls._singleton_lock = threading.Lock()
+        ForkAwareSingleton._classes.append(cls)
+
+    def __call__(cls, *args, **kwargs):
+        instance = cls._instances.get(cls)
+        if instance is not None:
+            return instance
+
+        with cls._singleton_lock:
+            instance = cls._instances.get(cls)
+            if instance is None:
+                instance = ForkAwareSingleton._pending_reinit.pop(cls, None)
+                if instance is not None:
+                    instance.on_fork_reinit()
+                else:
+                    instance = super().__call__(*args, **kwargs)
+                cls._instances[cls] = instance
+        return instance
+
+    @staticmethod
+    def _after_fork_in_child():
+        """Hook executado no processo filho logo após o `os.fork()`."""
+        meta = ForkAwareSingleton
+        inherited = list(meta._instances.items()) + list(meta._pending_reinit.items())
+        meta._instances = {}
+        meta._pending_reinit = {}
+        meta._pid = os.getpid()
+
+        for cls in meta._classes:
+            cls._singleton_lock = threading.Lock()
+
+        for cls, instance in inherited:
+            teardown = getattr(instance, 'on_fork_teardown', None)
+            if teardown is not None:
+                teardown()
+            if hasattr(instance, 'on_fork_reinit'):
+                meta._pending_reinit[cls] = instance
+            else:
+                _abandoned.append(instance)  # Sem reinit a instância é descartada, mas não finalizada
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=ForkAwareSingleton._after_fork_in_child)
+
+
+class Database(metaclass=ForkAwareSingleton):
+    """
+    Classe `Database` de 05_proj01_db_metaclasses.py usando `ForkAwareSingleton`.
+
+    A instância herdada é mantida no filho, mas a conexão do pai é abandonada em
+    `on_fork_teardown` e uma nova conexão é aberta de forma preguiçosa no próximo `connect()`.
+
+    Atributos:
+        path (str): Caminho do arquivo do banco de dados.
+        connection (Optional[sqlite3.Connection]): Conexão do processo atual.
+        cursor (Optional[sqlite3.Cursor]): Cursor associado à conexão.
+        connection_pid (Optional[int]): PID do processo que abriu a conexão atual.
+    """
+    connection: Optional[sqlite3.Connection] = None
+    cursor: Optional[sqlite3.Cursor] = None
+    connection_pid: Optional[int] = None
+
+    def __init__(self, path: str = 'db.geek'):
+        self.path = path
+        self.reinit_count = 0
+
+    def connect(self) -> sqlite3.Cursor:
+        """
+        Estabelece uma conexão com o banco de dados SQLite, se ainda não estiver conectada.
+
+        Returns:
+            sqlite3.Cursor: O cursor associado à conexão com o banco de dados.
+        """
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.path, timeout=30)
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.cursor = self.connection.cursor()
+            self.connection_pid = os.getpid()
+        return self.cursor
+
+    def on_fork_teardown(self) -> None:
+        """
+        Abandona a conexão herdada do pai.
+
+        A conexão não deve ser fechada no filho: `close()` mexeria no estado compartilhado
+        com o pai (incluindo os locks POSIX do arquivo). Como soltar a última referência
+        também fecharia a conexão (no dealloc), os objetos herdados vão para `_abandoned`.
+        """
+        if self.connection is not None:
+            _abandoned.append((self.connection, self.cursor))
+        self.connection = None
+        self.cursor = None
+        self.connection_pid = None
+
+    def on_fork_reinit(self) -> None:
+        """Marca a reinicialização; a conexão nova é aberta no próximo `connect()`."""
+        self.reinit_count += 1
+
+
+def worker(task):
+    """Executa consultas e escritas concorrentes dentro de um processo do pool."""
+    worker_id, n_queries = task
+    db = Database()
+    cursor = db.connect()
+    for i in range(n_queries):
+        cursor.execute('INSERT INTO evento (worker, valor) VALUES (?, ?)', (worker_id, i))
+        db.connection.commit()
+        cursor.execute('SELECT count(*) FROM evento WHERE worker = ?', (worker_id,))
+        cursor.fetchone()
+    return os.getpid(), db.connection_pid, db.reinit_count
+
+
+if __name__ == '__main__':
+    N_WORKERS = 8
+    N_QUERIES = 200
+
+    path = os.path.join(tempfile.mkdtemp(), 'db.geek')
+    db = Database(path)
+    parent_cursor = db.connect()
+    parent_cursor.execute('CREATE TABLE evento (worker INTEGER, valor INTEGER)')
+    db.connection.commit()
+
+    context = multiprocessing.get_context('fork')
+    with ProcessPoolExecutor(max_workers=N_WORKERS, mp_context=context) as executor:
+        results = list(executor.map(worker, [(i, N_QUERIES) for i in range(N_WORKERS * 2)]))
+
+    pids = {pid for pid, _, _ in results}
+    print(f'Processo pai: {os.getpid()}, workers distintos: {len(pids)}')
+    for pid, conn_pid, reinit in sorted(set(results)):
+        print(f'  PID {pid}: conexão aberta pelo PID {conn_pid}, reinicializações {reinit}')
+
+    assert os.getpid() not in pids
+    assert all(pid == conn_pid for pid, conn_pid, _ in results), 'worker usando a conexão do pai!'
+    assert all(reinit == 1 for _, _, reinit in results), 'cada worker deve reinicializar uma única vez'
+
+    parent_cursor.execute('SELECT count(*) FROM evento')
+    total = parent_cursor.fetchone()[0]
+    print(f'Linhas gravadas: {total} (esperado {N_WORKERS * 2 * N_QUERIES})')
+    assert total == N_WORKERS * 2 * N_QUERIES
+    assert Database() is db and db.reinit_count == 0
+
+# ### Explicação do Singleton por Processo
+
+# - **Problema**:
+#   - `os.fork()` copia a memória do processo pai, incluindo o dicionário de instâncias da metaclasse.
+#   - O worker passa a usar a mesma conexão SQLite do pai. Duas pontas escrevendo pelo mesmo
+# descritor de arquivo, com caches e locks internos copiados, podem corromper o banco.
+
+# - **Solução**:
+#   - `os.register_at_fork(after_in_child=...)` roda logo após o fork, apenas no filho.
+#   - O hook chama `on_fork_teardown`, esvazia o registro e recria os locks.
+#   - Na primeira chamada `Database()` no filho, a instância é reconstruída ou reinicializada
+# (`on_fork_reinit`), sempre de forma preguiçosa.
@@ -0,0 +1,256 @@
+import asyncio
+import itertools
+import os
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, List, Optional
+
+
+class AsyncDatabase:
+    """
+    Variante assíncrona da classe `Database` de 06_proj01_db_singleton.py.
+
+    Chamar `Database().connect()` e executar consultas dentro de uma corrotina bloqueia o
+    event loop. Aqui todo o trabalho com o SQLite acontece em threads dedicadas, cada uma
+    com sua própria conexão, e as corrotinas apenas aguardam o resultado.
+
+    O Singleton é por event loop: `AsyncDatabase()` chamado dentro do mesmo loop retorna
+    sempre a mesma instância; loops diferentes recebem instâncias diferentes.
+
+    A quantidade de operações pendentes é limitada por `max_pending`. Quando o limite é
+    atingido, novas chamadas aguardam (backpressure) em vez de acumular trabalho sem fim
+    na fila do executor.
+
+    Atributos:
+        _instances (weakref.WeakKeyDictionary): Instância única de cada event loop.
+        path (str): Caminho do arquivo do banco de dados.
+        workers (int): Número de threads (e conexões) dedicadas.
+        max_pending (int): Máximo de operações enviadas e ainda não concluídas.
+
+    Métodos:
+        execute(sql, params) -> int: Executa um comando, confirma e retorna `rowcount`.
+        executemany(sql, seq_of_params) -> int: Executa um comando para várias linhas.
+        fetchall(sql, params) -> list: Executa uma consulta e retorna todas as linhas.
+        stream(sql, params, batch_size) -> AsyncIterator: Itera as linhas em lotes.
+        close() -> None: Encerra as threads e fecha as conexões.
+    """
+
+    _instances: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncDatabase]' = \
+        weakref.WeakKeyDictionary()
+
+    def __new__(cls, path: str = 'db.geek', workers: int = 1, max_pending: int = 64):
+        """
+        Retorna a instância única do event loop em execução, criando-a se necessário.
+
+        Raises:
+            RuntimeError: Se chamado fora de um event loop em execução.
+        """
+        loop = asyncio.get_running_loop()
+        instance = cls._instances.get(loop)
+        if instance is None:
+            instance = super().__new__(cls)
+            instance._setup(path, workers, max_pending)
+            cls._instances[loop] = instance
+        return instance
+
+    def _setup(self, path: str, workers: int, max_pending: int) -> None:
+        if workers < 1 or max_pending < 1:
+            raise ValueError('workers e max_pending devem ser pelo menos 1')
+        self.path = path
+        self.workers = workers
+        self.max_pending = max_pending
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        # Um executor de uma thread por conexão: o cursor de um stream fica preso à sua thread
+        self._executors = [
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'async-db-{i}')
+            for i in range(workers)
+        ]
+        self._next_executor = itertools.cycle(self._executors)
+        self._slots = asyncio.Semaphore(max_pending)
+        self._closed = False
+
+    def _connection(self) -> sqlite3.Connection:
+        """Retorna a conexão da thread atual (executada sempre dentro de uma thread do executor)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA busy_timeout=5000')
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    async def _run(self, func, *args, executor: Optional[ThreadPoolExecutor] = None):
+        if self._closed:
+            raise RuntimeError('AsyncDatabase já foi fechado')
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor or next(self._next_executor), func, *args)
+
+    def _execute_sync(self, sql: str, params) -> int:
+        conn = self._connection()
+        with conn:
+            return conn.execute(sql, params).rowcount
+
+    def _executemany_sync(self, sql: str, seq_of_params) -> int:
+        conn = self._connection()
+        with conn:
+            return conn.executemany(sql, seq_of_params).rowcount
+
+    def _fetchall_sync(self, sql: str, params) -> list:
+        return self._connection().execute(sql, params).fetchall()
+
+    async def execute(self, sql: str, params=()) -> int:
+        return await self._run(self._execute_sync, sql, params)
+
+    async def executemany(self, sql: str, seq_of_params) -> int:
+        return await self._run(self._executemany_sync, sql, list(seq_of_params))
+
+    async def fetchall(self, sql: str, params=()) -> list:
+        return await self._run(self._fetchall_sync, sql, params)
+
+    async def stream(self, sql: str, params=(), batch_size: int = 500) -> AsyncIterator[tuple]:
+        """
+        Itera as linhas de uma consulta sem carregar o resultado inteiro na memória.
+
+        Os lotes são buscados com `fetchmany` sempre na mesma thread do executor, pois o
+        cursor pertence à conexão daquela thread.
+        """
+        executor = next(self._next_executor)
+        cursor = await self._run(lambda: self._connection().execute(sql, params), executor=executor)
+        try:
+            while True:
+                rows = await self._run(cursor.fetchmany, batch_size, executor=executor)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row
+        finally:
+            if not self._closed:
+                await self._run(cursor.close, executor=executor)
+
+    async def close(self) -> None:
+        """Fecha as conexões em suas próprias threads e encerra os executores."""
+        if self._closed:
+            return
+        loop = asyncio.get_running_loop()
+
+        def close_connection():
+            conn = getattr(self._local, 'conn', None)
+            if conn is not None:
+                conn.close()
+                self._local.conn = None
+
+        await asyncio.gather(*(loop.run_in_executor(ex, close_connection) for ex in self._executors))
+        self._closed = True
+        for executor in self._executors:
+            executor.shutdown(wait=True)
+        self._instances.pop(loop, None)
+
+
+# ---------------------------------------------------------------------------
+# Benchmark de latência do event loop
+# ---------------------------------------------------------------------------
+
+TICK = 0.005
+
+
+async def measure_loop_lag(stop: asyncio.Event, samples: List[float]) -> None:
+    """Dorme `TICK` segundos repetidamente e registra o atraso de cada despertar."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        samples.append(time.perf_counter() - start - TICK)
+
+
+def summarize(label: str, samples: List[float], elapsed: float) -> None:
+    ordered = sorted(samples) or [0.0]
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f'{label:<32} | tempo {elapsed * 1000:>8.1f}ms | atraso do loop: '
+        f'p50 {statistics.median(ordered) * 1000:>6.2f}ms  p99 {p99 * 1000:>7.2f}ms  '
+        f'máx {ordered[-1] * 1000:>7.2f}ms'
+    )
+
+
+async def scenario(label: str, workload) -> None:
+    stop = asyncio.Event()
+    samples: List[float] = []
+    ticker = asyncio.create_task(measure_loop_lag(stop, samples))
+    await asyncio.sleep(TICK * 4)
+    start = time.perf_counter()
+    await workload()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+    summarize(label, samples, elapsed)
+
+
+QUERY = 'SELECT count(*), avg(preco) FROM produto WHERE id % 13 = ?'
+N_QUERIES = 1_000
+
+
+async def main(path: str) -> None:
+    db = AsyncDatabase(path, workers=2, max_pending=32)
+    assert AsyncDatabase() is db
+
+    await db.execute('CREATE TABLE produto (id INTEGER PRIMARY KEY, nome TEXT, preco REAL)')
+    await db.executemany(
+        'INSERT INTO produto (nome, preco) VALUES (?, ?)',
+        ((f'produto-{i}', i * 0.5) for i in range(50_000)),
+    )
+
+    async def idle():
+        await asyncio.sleep(0.5)
+
+    async def async_queries():
+        await asyncio.gather(*(db.fetchall(QUERY, (i % 13,)) for i in range(N_QUERIES)))
+
+    blocking_conn = sqlite3.connect(path)
+
+    async def blocking_queries():
+        async def one(i):
+            return blocking_conn.execute(QUERY, (i % 13,)).fetchall()
+        await asyncio.gather(*(one(i) for i in range(N_QUERIES)))
+
+    await scenario('loop ocioso', idle)
+    await scenario(f'{N_QUERIES} consultas AsyncDatabase', async_queries)
+    await scenario(f'{N_QUERIES} consultas bloqueantes', blocking_queries)
+    blocking_conn.close()
+
+    streamed = 0
+    async for _ in db.stream('SELECT * FROM produto', batch_size=1_000):
+        streamed += 1
+    print(f'Linhas lidas via stream: {streamed}')
+    await db.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(os.path.join(tempfile.mkdtemp(), 'db.geek')))
+
+# ### Explicação do Database Assíncrono
+
+# - **Por que não chamar o sqlite3 direto na corrotina?**:
+#   - Cada consulta ocupa a thread do event loop. Enquanto ela roda, nenhuma outra corrotina
+# avança, e o cenário "consultas bloqueantes" mostra o atraso do loop crescendo.
+
+# - **Executor dedicado**:
+#   - As consultas rodam em threads próprias, cada uma com sua conexão. O event loop só agenda
+# e recebe resultados, então o atraso medido fica praticamente igual ao do loop ocioso.
+
+# - **Backpressure**:
+#   - O `asyncio.Semaphore(max_pending)` limita quantas operações estão na fila do executor.
+# Com 1000 consultas disparadas ao mesmo tempo, apenas `max_pending` ficam enfileiradas; as demais
+# esperam no próprio loop, sem consumir memória no executor.
+
+# - **Uma instância por event loop**:
+#   - Objetos do asyncio (como o semáforo) pertencem a um loop. Por isso o Singleton é indexado
+# pelo loop em execução, em um `WeakKeyDictionary` que libera a instância quando o loop é descartado.
@@ -0,0 +1,357 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import FrozenSet, Hashable, Iterable, Optional, Set, Tuple
+
+
+class ThreadSafeSingleton(type):
+    """
+    Metaclasse Singleton com double-checked locking (ver 07_singleton_thread_safe.py).
+
+    Atributos:
+        _instances (dict): Instâncias únicas, indexadas pela classe.
+    """
+
+    _instances = {}
+
+    def __init__(cls, name, bases, namespace):
+        super().__init__(name, bases, namespace)
+        cls._singleton_lock = threading.Lock()
+
+    def __call__(cls, *args, **kwargs):
+        instance = cls._instances.get(cls)
+        if instance is not None:
+            return instance
+        with cls._singleton_lock:
+            instance = cls._instances.get(cls)
+            if instance is None:
+                instance = super().__call__(*args, **kwargs)
+                cls._instances[cls] = instance
+        return instance
+
+
+def estimate_size(rows: list) -> int:
+    """Estima, em bytes, a memória ocupada por uma lista de linhas retornada pelo sqlite3."""
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += sys.getsizeof(row)
+        for value in row:
+            size += sys.getsizeof(value)
+    return size
+
+
+class CacheEntry:
+    """Resultado armazenado no cache, com as tabelas lidas e o instante de expiração."""
+
+    __slots__ = ('rows', 'tables', 'size', 'expires_at')
+
+    def __init__(self, rows: list, tables: FrozenSet[str], size: int, expires_at: float):
+        self.rows = rows
+        self.tables = tables
+        self.size = size
+        self.expires_at = expires_at
+
+
+class QueryCache:
+    """
+    Cache LRU de resultados de consultas, limitado pelo tamanho em bytes.
+
+    Cada entrada tem seu próprio TTL e guarda as tabelas lidas pela consulta. Quando um
+    INSERT/UPDATE/DELETE toca uma tabela, todas as entradas que dependem dela são removidas.
+
+    Uma consulta só é armazenada se nenhuma escrita aconteceu entre o início da sua execução
+    e o `put` (contador `epoch`), evitando guardar um resultado já desatualizado.
+
+    Atributos:
+        max_bytes (int): Tamanho máximo do cache, em bytes.
+        default_ttl (float): TTL padrão das entradas, em segundos.
+
+    Métodos:
+        get(key) -> Optional[list]: Retorna o resultado armazenado ou None.
+        put(key, rows, tables, epoch, ttl) -> None: Armazena um resultado.
+        invalidate_tables(tables) -> int: Remove as entradas que leem alguma das tabelas.
+        clear() -> None: Esvazia o cache.
+        stats() -> dict: Contadores de acertos, falhas, remoções e uso de memória.
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024, default_ttl: float = 60.0):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._entries: 'OrderedDict[Hashable, CacheEntry]' = OrderedDict()
+        self._by_table = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        for table in entry.tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+
+    def get(self, key: Hashable) -> Optional[list]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry.rows)
+
+    def put(self, key: Hashable, rows: list, tables: Iterable[str], epoch: int,
+            ttl: Optional[float] = None) -> None:
+        size = estimate_size(rows)
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            if epoch != self.epoch:
+                return  # Houve escrita durante a consulta: o resultado pode estar desatualizado
+            if key in self._entries:
+                self._remove(key)
+            entry = CacheEntry(list(rows), frozenset(tables), size, expires_at)
+            self._entries[key] = entry
+            self._bytes += size
+            for table in entry.tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate_tables(self, tables: Iterable[str]) -> int:
+        removed = 0
+        with self._lock:
+            self.epoch += 1
+            for table in tables:
+                for key in list(self._by_table.get(table, ())):
+                    self._remove(key)
+                    removed += 1
+            self.invalidations += removed
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self.epoch += 1
+            self._entries.clear()
+            self._by_table.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
+
+
+_READ_ACTIONS = {sqlite3.SQLITE_READ}
+_WRITE_ACTIONS = {
+    sqlite3.SQLITE_INSERT, sqlite3.SQLITE_UPDATE, sqlite3.SQLITE_DELETE,
+    sqlite3.SQLITE_DROP_TABLE, sqlite3.SQLITE_ALTER_TABLE,
+}
+
+
+class Database(metaclass=ThreadSafeSingleton):
+    """
+    Classe `Database` de 05_proj01_db_metaclasses.py com cache opcional de resultados.
+
+    As tabelas lidas e escritas por cada comando são descobertas pelo authorizer do sqlite3,
+    que é chamado quando o comando é compilado (inclusive para tabelas tocadas por triggers).
+    Como o módulo `sqlite3` reutiliza comandos já compilados, as tabelas ficam memorizadas
+    por texto SQL em `_statement_tables`.
+
+    O cache pode ser ligado para a instância inteira (`cache_enabled`) e ajustado por
+    consulta com `fetchall(..., cache=True/False, ttl=...)`. Escritas devem passar por
+    `execute`/`executemany` para que a invalidação aconteça.
+
+    Atributos:
+        connection (sqlite3.Connection): Conexão com o banco de dados.
+        cache (QueryCache): Cache de resultados.
+        cache_enabled (bool): Se as consultas usam o cache por padrão.
+
+    Métodos:
+        execute(sql, params) -> int: Executa um comando e invalida as tabelas escritas.
+        executemany(sql, seq_of_params) -> int: Idem, para várias linhas.
+        fetchall(sql, params, cache, ttl) -> list: Consulta usando o cache quando habilitado.
+    """
+
+    def __init__(self, path: str = 'db.geek', cache_enabled: bool = True,
+                 cache_max_bytes: int = 16 * 1024 * 1024, cache_ttl: float = 60.0):
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.set_authorizer(self._authorizer)
+        self.cache = QueryCache(max_bytes=cache_max_bytes, default_ttl=cache_ttl)
+        self.cache_enabled = cache_enabled
+        self._lock = threading.RLock()
+        self._statement_tables = {}
+        self._captured: Optional[Tuple[Set[str], Set[str]]] = None
+
+    def _authorizer(self, action, arg1, arg2, db_name, trigger):
+        captured = self._captured
+        if captured is not None and arg1 and not arg1.startswith('sqlite_'):
+            if action in _READ_ACTIONS:
+                captured[0].add(arg1)
+            elif action in _WRITE_ACTIONS:
+                captured[1].add(arg1)
+        return sqlite3.SQLITE_OK
+
+    def _run(self, method, sql: str, params):
+        """
+        Executa `sql` com a conexão travada e retorna (cursor, tabelas lidas, tabelas escritas).
+
+        Deve ser chamado com `self._lock` adquirido.
+        """
+        known = self._statement_tables.get(sql)
+        if known is not None:
+            return method(sql, params), known[0], known[1]
+
+        self._captured = (set(), set())
+        try:
+            cursor = method(sql, params)
+            reads, writes = self._captured
+        finally:
+            self._captured = None
+        known = (frozenset(reads), frozenset(writes))
+        self._statement_tables[sql] = known
+        return cursor, known[0], known[1]
+
+    def _write(self, method, sql: str, params) -> int:
+        with self._lock:
+            try:
+                with self.connection:
+                    cursor, _, writes = self._run(method, sql, params)
+            finally:
+                # Invalida também em caso de erro: parte do comando pode ter sido aplicada
+                known = self._statement_tables.get(sql)
+                if known is not None and known[1]:
+                    self.cache.invalidate_tables(known[1])
+            return cursor.rowcount
+
+    def execute(self, sql: str, params=()) -> int:
+        return self._write(self.connection.execute, sql, params)
+
+    def executemany(self, sql: str, seq_of_params) -> int:
+        return self._write(self.connection.executemany, sql, seq_of_params)
+
+    @staticmethod
+    def _cache_key(sql: str, params) -> Optional[Hashable]:
+        if isinstance(params, dict):
+            params = tuple(sorted(params.items()))
+        else:
+            params = tuple(params)
+        key = (sql, params)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def fetchall(self, sql: str, params=(), cache: Optional[bool] = None,
+                 ttl: Optional[float] = None) -> list:
+        """
+        Executa uma consulta e retorna todas as linhas.
+
+        Args:
+            sql (str): Consulta SQL.
+            params: Parâmetros da consulta (sequência ou dicionário).
+            cache (Optional[bool]): Força o uso (True) ou não (False) do cache nesta consulta.
+                Quando None, usa `cache_enabled`.
+            ttl (Optional[float]): TTL desta entrada; None usa o TTL padrão do cache.
+
+        Returns:
+            list: As linhas retornadas pela consulta.
+        """
+        use_cache = self.cache_enabled if cache is None else cache
+        key = self._cache_key(sql, params) if use_cache else None
+        if key is not None:
+            rows = self.cache.get(key)
+            if rows is not None:
+                return rows
+
+        with self._lock:
+            epoch = self.cache.epoch
+            cursor, reads, writes = self._run(self.connection.execute, sql, params)
+            rows = cursor.fetchall()
+            if writes:
+                self.connection.commit()
+                self.cache.invalidate_tables(writes)
+                return rows
+
+        if key is not None:
+            self.cache.put(key, rows, reads, epoch, ttl)
+        return rows
+
+
+if __name__ == '__main__':
+    db = Database(os.path.join(tempfile.mkdtemp(), 'db.geek'), cache_max_bytes=256 * 1024)
+    db.execute('CREATE TABLE produto (id INTEGER PRIMARY KEY, categoria INTEGER, preco REAL)')
+    db.execute('CREATE TABLE cliente (id INTEGER PRIMARY KEY, nome TEXT)')
+    db.executemany(
+        'INSERT INTO produto (categoria, preco) VALUES (?, ?)',
+        ((i % 20, i * 0.25) for i in range(100_000)),
+    )
+    db.execute("INSERT INTO cliente (nome) VALUES ('Felicity')")
+
+    hot_query = 'SELECT categoria, count(*), avg(preco) FROM produto WHERE categoria < ? GROUP BY categoria'
+
+    for use_cache in (False, True):
+        start = time.perf_counter()
+        for _ in range(200):
+            db.fetchall(hot_query, (10,), cache=use_cache)
+        elapsed = time.perf_counter() - start
+        print(f"200 consultas {'com' if use_cache else 'sem'} cache: {elapsed * 1000:8.1f}ms")
+
+    before = db.fetchall(hot_query, (10,))
+    db.execute('INSERT INTO cliente (nome) VALUES (?)', ('Oliver',))  # Outra tabela: cache mantido
+    assert db.cache.stats()['invalidations'] == 0
+    db.execute('UPDATE produto SET preco = preco * 2 WHERE categoria = 0')  # Invalida a consulta
+    after = db.fetchall(hot_query, (10,))
+    assert before != after, 'o resultado deveria ter sido recalculado após o UPDATE'
+
+    db.fetchall('SELECT count(*) FROM cliente', ttl=0.05)
+    time.sleep(0.1)
+    db.fetchall('SELECT count(*) FROM cliente')  # Entrada expirada: conta como falha
+
+    def mixed_worker(i):
+        for j in range(200):
+            if j % 50 == 0:
+                db.execute('INSERT INTO produto (categoria, preco) VALUES (?, ?)', (i % 20, 1.0))
+            db.fetchall('SELECT count(*) FROM produto WHERE categoria = ?', (j % 20,))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(mixed_worker, range(8)))
+
+    # Depois das escritas concorrentes, o cache continua coerente com o banco
+    for categoria in range(20):
+        sql = 'SELECT count(*) FROM produto WHERE categoria = ?'
+        assert db.fetchall(sql, (categoria,)) == db.fetchall(sql, (categoria,), cache=False)
+
+    for name, value in db.cache.stats().items():
+        print(f'  {name}: {value}')
@@ -0,0 +1,358 @@
+import itertools
+import os
+import queue
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+
+class ThreadSafeSingleton(type):
+    """
+    Metaclasse Singleton com double-checked locking (ver 07_singleton_thread_safe.py).
+
+    Atributos:
+        _instances (dict): Instâncias únicas, indexadas pela classe.
+    """
+
+    _instances = {}
+
+    def __init__(cls, name, bases, namespace):
+        super().__init__(name, bases, namespace)
+        cls._singleton_lock = threading.Lock()
+
+    def __call__(cls, *args, **kwargs):
+        instance = cls._instances.get(cls)
+        if instance is not None:
+            return instance
+        with cls._singleton_lock:
+            instance = cls._instances.get(cls)
+            if instance is None:
+                instance = super().__call__(*args, **kwargs)
+                cls._instances[cls] = instance
+        return instance
+
+
+def open_connection(path: str, check_same_thread: bool = True) -> sqlite3.Connection:
+    """
+    Abre uma conexão em modo autocommit, para que as transações sejam sempre explícitas.
+    """
+    conn = sqlite3.connect(path, isolation_level=None, check_same_thread=check_same_thread)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA busy_timeout=5000')
+    return conn
+
+
+class GroupCommitWriter:
+    """
+    Thread de escrita em segundo plano que agrupa escritas pequenas em um único commit.
+
+    Várias threads chamam `submit` com um comando e seus parâmetros. A thread de escrita
+    retira da fila tudo o que chegou (até `max_batch` itens ou `max_delay` segundos depois
+    do primeiro) e aplica o lote inteiro em uma única transação: um fsync para o grupo em
+    vez de um por escrita.
+
+    Se um comando do lote falhar (erro do SQLite ou qualquer outra exceção, como um inteiro
+    grande demais para o SQLite), o lote é desfeito e reaplicado item a item, para que apenas
+    o comando inválido receba a exceção. A thread de escrita sobrevive a esses erros; depois de
+    `close()`, `submit` e `flush` levantam RuntimeError em vez de enfileirar para ninguém.
+
+    Atributos:
+        max_batch (int): Número máximo de escritas por transação.
+        max_delay (float): Tempo máximo (em segundos) de espera para completar um lote.
+        batches (int): Quantidade de transações confirmadas.
+        writes (int): Quantidade de escritas confirmadas.
+
+    Métodos:
+        submit(sql, params) -> Future: Enfileira uma escrita e retorna um Future com o rowcount.
+        flush() -> None: Aguarda até que todas as escritas enfileiradas sejam confirmadas.
+        close() -> None: Confirma o que estiver pendente e encerra a thread.
+    """
+
+    _STOP = object()
+
+    def __init__(self, path: str, max_batch: int = 1000, max_delay: float = 0.005,
+                 max_queue: int = 100_000):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batches = 0
+        self.writes = 0
+        self._path = path
+        # Fila sem limite; o backpressure vem dos slots, adquiridos fora do lock de estado
+        self._queue: 'queue.Queue' = queue.Queue()
+        self._slots = threading.Semaphore(max_queue)
+        self._lock = threading.Lock()  # Torna atômicos "verificar _stopped" e "enfileirar"
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name='group-commit-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, sql: str, params: Sequence = ()) -> Future:
+        future: Future = Future()
+        self._slots.acquire()  # Bloqueia quando a fila está cheia (backpressure)
+        with self._lock:
+            if self._stopped:
+                self._slots.release()
+                raise RuntimeError('GroupCommitWriter encerrado')
+            self._queue.put((sql, params, future))
+        return future
+
+    def flush(self) -> None:
+        self.submit('SELECT 1').result()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._stopped:
+                self._stopped = True
+                self._queue.put(self._STOP)
+        self._thread.join()
+
+    def _get(self, timeout: Optional[float] = None):
+        """Retira um item da fila e devolve o slot; levanta queue.Empty após `timeout`."""
+        if timeout is not None and timeout <= 0:
+            item = self._queue.get_nowait()
+        else:
+            item = self._queue.get(timeout=timeout)
+        if item is not self._STOP:
+            self._slots.release()
+        return item
+
+    def _collect(self, first) -> Tuple[List[tuple], bool]:
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            try:
+                item = self._get(deadline - time.monotonic())
+            except queue.Empty:
+                break
+            if item is self._STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    @staticmethod
+    def _rollback(conn: sqlite3.Connection) -> None:
+        if conn.in_transaction:
+            conn.execute('ROLLBACK')
+
+    def _apply(self, conn: sqlite3.Connection, batch: List[tuple]) -> None:
+        results = []
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            for sql, params, _ in batch:
+                results.append(conn.execute(sql, params).rowcount)
+            conn.execute('COMMIT')
+        except Exception:
+            self._rollback(conn)
+            for sql, params, future in batch:
+                try:
+                    rowcount = conn.execute(sql, params).rowcount
+                except Exception as exc:
+                    self._rollback(conn)
+                    future.set_exception(exc)
+                else:
+                    future.set_result(rowcount)
+                    self.writes += 1
+            self.batches += 1
+            return
+        self.batches += 1
+        self.writes += len(batch)
+        for (_, _, future), rowcount in zip(batch, results):
+            future.set_result(rowcount)
+
+    def _run(self) -> None:
+        conn = None
+        try:
+            conn = open_connection(self._path)
+            stop = False
+            while not stop:
+                first = self._get()
+                if first is self._STOP:
+                    break
+                batch, stop = self._collect(first)
+                try:
+                    self._apply(conn, batch)
+                except Exception as exc:
+                    # Falha fora dos comandos (ex.: ROLLBACK recusado): responde o lote e segue
+                    for _, _, future in batch:
+                        if not future.done():
+                            future.set_exception(exc)
+        finally:
+            if conn is not None:
+                conn.close()
+            # Com o lock, nenhum `submit` enfileira entre marcar o encerramento e esvaziar a fila:
+            # quem já tinha enfileirado recebe um erro em vez de esperar para sempre
+            with self._lock:
+                self._stopped = True
+                while True:
+                    try:
+                        item = self._get(0)
+                    except queue.Empty:
+                        break
+                    if item is not self._STOP:
+                        item[2].set_exception(RuntimeError('GroupCommitWriter encerrado'))
+
+
+class Database(metaclass=ThreadSafeSingleton):
+    """
+    Classe `Database` de 05_proj01_db_metaclasses.py com uma API de escrita em massa.
+
+    Em 05/06 cada INSERT executado pelo cursor roda em sua própria transação implícita e
+    paga um fsync. Aqui:
+
+    - `bulk_insert` consome um iterável (ou generator) de linhas em blocos de `chunk_size`,
+      cada bloco gravado com `executemany` dentro de uma transação explícita. Apenas um
+      bloco fica na memória por vez.
+    - `write` envia escritas pequenas para um `GroupCommitWriter` opcional, que agrupa as
+      escritas de várias threads em commits coletivos.
+
+    Atributos:
+        path (str): Caminho do arquivo do banco de dados.
+        connection (sqlite3.Connection): Conexão usada por `bulk_insert` e consultas.
+        writer (Optional[GroupCommitWriter]): Thread de escrita, criada sob demanda.
+
+    Métodos:
+        bulk_insert(sql, rows, chunk_size) -> int: Grava as linhas em blocos transacionais.
+        write(sql, params) -> Future: Escrita pequena via commit em grupo.
+        fetchall(sql, params) -> list: Executa uma consulta.
+        close() -> None: Encerra a thread de escrita e fecha a conexão.
+    """
+
+    def __init__(self, path: str = 'db.geek', chunk_size: int = 50_000):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.connection = open_connection(path, check_same_thread=False)
+        self.writer: Optional[GroupCommitWriter] = None
+        self._lock = threading.Lock()
+
+    def bulk_insert(self, sql: str, rows: Iterable[Sequence],
+                    chunk_size: Optional[int] = None) -> int:
+        """
+        Grava `rows` com `executemany`, um bloco por transação.
+
+        Args:
+            sql (str): Comando INSERT parametrizado.
+            rows (Iterable[Sequence]): Linhas a gravar; pode ser um generator.
+            chunk_size (Optional[int]): Linhas por transação; None usa o padrão da instância.
+
+        Returns:
+            int: Total de linhas gravadas.
+        """
+        size = chunk_size or self.chunk_size
+        iterator = iter(rows)
+        total = 0
+        with self._lock:
+            while True:
+                chunk = list(itertools.islice(iterator, size))
+                if not chunk:
+                    break
+                self.connection.execute('BEGIN IMMEDIATE')
+                try:
+                    self.connection.executemany(sql, chunk)
+                except BaseException:
+                    self.connection.execute('ROLLBACK')
+                    raise
+                self.connection.execute('COMMIT')
+                total += len(chunk)
+        return total
+
+    def write(self, sql: str, params: Sequence = ()) -> Future:
+        """
+        Enfileira uma escrita pequena para ser confirmada em grupo.
+
+        Returns:
+            Future: Resolvido com o rowcount quando a transação do grupo for confirmada.
+        """
+        if self.writer is None:
+            with self._lock:
+                if self.writer is None:
+                    self.writer = GroupCommitWriter(self.path)
+        return self.writer.submit(sql, params)
+
+    def fetchall(self, sql: str, params: Sequence = ()) -> list:
+        with self._lock:
+            return self.connection.execute(sql, params).fetchall()
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        self.connection.close()
+
+
+# ---------------------------------------------------------------------------
+# Benchmark: linhas/segundo
+# ---------------------------------------------------------------------------
+
+INSERT = 'INSERT INTO leitura (sensor, valor, instante) VALUES (?, ?, ?)'
+
+
+def generate_rows(n: int):
+    for i in range(n):
+        yield (i % 64, i * 0.001, 1_700_000_000 + i)
+
+
+def naive_insert(path: str, n: int) -> None:
+    """Um INSERT por linha, cada um na sua própria transação (como em 05/06)."""
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode=WAL')
+    cursor = conn.cursor()
+    for row in generate_rows(n):
+        cursor.execute(INSERT, row)
+        conn.commit()
+    conn.close()
+
+
+def report(label: str, rows: int, elapsed: float) -> None:
+    print(f'{label:<44} {rows:>9,} linhas em {elapsed:>7.2f}s -> {rows / elapsed:>12,.0f} linhas/s')
+
+
+if __name__ == '__main__':
+    N_ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    N_NAIVE = min(N_ROWS, 20_000)  # Por linha é lento demais para 10^6; a taxa é extrapolável
+
+    path = os.path.join(tempfile.mkdtemp(), 'db.geek')
+    db = Database(path)
+    db.connection.execute('CREATE TABLE leitura (sensor INTEGER, valor REAL, instante INTEGER)')
+
+    start = time.perf_counter()
+    naive_insert(path, N_NAIVE)
+    report('INSERT + commit por linha', N_NAIVE, time.perf_counter() - start)
+
+    for chunk_size in (1_000, 50_000):
+        start = time.perf_counter()
+        written = db.bulk_insert(INSERT, generate_rows(N_ROWS), chunk_size=chunk_size)
+        report(f'bulk_insert (chunk_size={chunk_size:,})', written, time.perf_counter() - start)
+
+    # Várias threads fazendo escritas pequenas: commits em grupo
+    N_THREADS, PER_THREAD = 8, 5_000
+
+    def producer(sensor):
+        futures = [db.write(INSERT, (sensor, float(i), i)) for i in range(PER_THREAD)]
+        return sum(f.result() for f in futures)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=N_THREADS) as executor:
+        written = sum(executor.map(producer, range(1000, 1000 + N_THREADS)))
+    report(f'write() em grupo ({N_THREADS} threads)', written, time.perf_counter() - start)
+    print(f'  transações: {db.writer.batches}, escritas por transação: {db.writer.writes / db.writer.batches:.1f}')
+
+    total = db.fetchall('SELECT count(*) FROM leitura')[0][0]
+    assert total == N_NAIVE + 2 * N_ROWS + N_THREADS * PER_THREAD
+    db.close()
+
+# ### Explicação da Escrita em Massa
+
+# - **Custo de um commit**:
+#   - Cada transação confirmada exige que o SQLite sincronize o arquivo no disco (fsync).
+# Com uma transação por linha, o disco dita a velocidade: algumas centenas ou milhares de linhas/s.
+
+# - **executemany em blocos**:
+#   - Um bloco de milhares de linhas em uma única transação paga um fsync para todas.
+#   - O generator é consumido com `itertools.islice`, então 10^6 linhas nunca ficam na memória ao mesmo tempo.
+
+# - **Commit em grupo**:
+#   - Escritas pequenas vindas de várias threads são enfileiradas e aplicadas pela thread de escrita
+# em lotes. Cada chamador recebe um `Future` que só é resolvido depois do COMMIT do seu lote.
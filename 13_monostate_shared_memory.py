@@ -0,0 +1,317 @@
+import multiprocessing
+import struct
+import time
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+
+
+class SharedField:
+    """
+    Descritor de um atributo armazenado em uma posição fixa do segmento de memória compartilhada.
+
+    A leitura usa `struct.unpack_from` direto sobre o buffer do segmento: nenhuma cópia do
+    estado inteiro, nenhum pickle e nenhuma ida e volta por IPC. Ela é validada pela versão do
+    segmento (seqlock, ver `SharedMonostate._read`), então nunca devolve um campo pela metade.
+
+    Atributos:
+        fmt (str): Formato `struct` do campo (por exemplo 'q', 'd' ou '32s').
+        offset (int): Posição do campo no segmento, calculada pela classe dona.
+    """
+
+    def __init__(self, fmt: str, default=0):
+        self.fmt = '<' + fmt
+        self.size = struct.calcsize(self.fmt)
+        self.default = default
+        self.offset = 0
+        self.name = ''
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        value = obj._read(self.fmt, self.offset)
+        if isinstance(value, bytes):
+            return value.rstrip(b'\0').decode('utf-8')
+        return value
+
+    def encode(self, value):
+        """Valor pronto para `struct.pack_into`; textos maiores que o campo são recusados."""
+        if isinstance(value, str):
+            value = value.encode('utf-8')
+            if len(value) > self.size:
+                raise ValueError(f'{self.name}: texto maior que {self.size} bytes')
+        return value
+
+    def __set__(self, obj, value):
+        value = self.encode(value)
+        with obj._lock:
+            obj._begin_write()
+            try:
+                struct.pack_into(self.fmt, obj._buffer, self.offset, value)
+            finally:
+                obj._end_write()
+
+
+class SharedMonostate:
+    """
+    Variante do `Monostate` de 03_monostate.py cujo estado vive em `multiprocessing.shared_memory`.
+
+    No `Monostate` original todas as instâncias apontam o `__dict__` para o mesmo dicionário
+    da classe, o que só funciona dentro de um interpretador. Aqui o estado é um segmento
+    de memória compartilhada com layout fixo, empacotado com `struct`:
+
+        [versão: q][campo 1][campo 2]...
+
+    Os campos são declarados na subclasse com `SharedField`. Todas as instâncias, em
+    qualquer processo que abra o segmento pelo nome, leem e escrevem os mesmos bytes.
+
+    - Escritas: protegidas por um `multiprocessing.Lock`. A palavra de versão funciona como um
+      seqlock: fica ímpar durante a escrita e volta a par ao final.
+    - Leituras: `struct.unpack_from` sobre o buffer, sem lock e sem cópia do estado. O leitor lê
+      a versão, o campo e a versão de novo, e repete se ela estava ímpar ou mudou; assim um
+      campo `'32s'` nunca é visto pela metade. (A ordem das escritas na memória é a da CPU:
+      garantida em x86; em CPUs com ordenação fraca o seqlock reduz, mas não elimina, o risco.)
+      Depois de `READ_SPINS` tentativas o leitor lê sob o lock, esperando até `READ_TIMEOUT`
+      segundos; se um escritor morreu no meio da escrita, a leitura levanta `TimeoutError` em
+      vez de travar o processo para sempre.
+    - `increment(nome, delta)`: leitura-modificação-escrita atômica para contadores.
+
+    Atributos:
+        segment_name (str): Nome do segmento; processos filhos usam o mesmo nome para anexar.
+        _layout (dict): Campo -> SharedField, com os offsets calculados.
+        _size (int): Tamanho total do segmento, em bytes.
+
+    Métodos:
+        create(name, lock) -> SharedMonostate: Cria o segmento e grava os valores padrão.
+        attach(name, lock) -> SharedMonostate: Anexa a um segmento existente.
+        increment(field, delta) -> int/float: Incremento atômico.
+        update(**values) -> None: Atualiza vários campos sob o mesmo lock.
+        snapshot() -> dict: Cópia consistente de todos os campos.
+        close() / unlink(): Desanexa / remove o segmento.
+    """
+
+    _VERSION = struct.Struct('<q')
+    READ_SPINS = 10_000  # Tentativas sem lock antes de recorrer ao lock
+    READ_TIMEOUT = 1.0  # Espera máxima (em segundos) pelo lock na leitura
+    _layout: Dict[str, SharedField] = {}
+    _size = _VERSION.size
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        layout = {}
+        offset = cls._VERSION.size
+        for klass in reversed(cls.__mro__):
+            for name, value in vars(klass).items():
+                if isinstance(value, SharedField):
+                    layout[name] = value
+        for field in layout.values():
+            # Alinha cada campo em 8 bytes para que leituras de inteiros não cruzem palavras
+            offset = (offset + 7) & ~7
+            field.offset = offset
+            offset += field.size
+        cls._layout = layout
+        cls._size = offset
+
+    def __init__(self, shm: shared_memory.SharedMemory, lock, owner: bool):
+        self._shm = shm
+        self._buffer = shm.buf
+        self._lock = lock
+        self._owner = owner
+        self.segment_name = shm.name
+
+    @classmethod
+    def create(cls, name: Optional[str] = None, lock=None) -> 'SharedMonostate':
+        shm = shared_memory.SharedMemory(name=name, create=True, size=cls._size)
+        obj = cls(shm, lock or multiprocessing.Lock(), owner=True)
+        shm.buf[:cls._size] = bytes(cls._size)
+        for field in cls._layout.values():
+            field.__set__(obj, field.default)
+        cls._VERSION.pack_into(obj._buffer, 0, 0)
+        return obj
+
+    @classmethod
+    def attach(cls, name: str, lock) -> 'SharedMonostate':
+        # Processos criados pelo multiprocessing compartilham o resource_tracker do pai,
+        # então anexar não transfere a posse: apenas o dono chama `unlink`.
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, lock, owner=False)
+
+    @property
+    def version(self) -> int:
+        """Quantidade de escritas concluídas (a palavra interna avança 2 por escrita)."""
+        return self._VERSION.unpack_from(self._buffer, 0)[0] >> 1
+
+    def _begin_write(self) -> None:
+        """Deixa a versão ímpar: leitores que a virem assim tentam de novo. Requer o lock."""
+        raw = self._VERSION.unpack_from(self._buffer, 0)[0]
+        self._VERSION.pack_into(self._buffer, 0, raw | 1)
+
+    def _end_write(self) -> None:
+        raw = self._VERSION.unpack_from(self._buffer, 0)[0]
+        self._VERSION.pack_into(self._buffer, 0, (raw | 1) + 1)
+
+    def _read(self, fmt: str, offset: int):
+        """
+        Leitura sem lock validada pela versão (lê versão, campo, versão; repete se mudou).
+
+        Raises:
+            TimeoutError: Se a versão não se estabiliza e o lock não fica livre a tempo.
+            RuntimeError: Se a versão está ímpar com o lock livre (escrita interrompida).
+        """
+        buffer = self._buffer
+        read_version = self._VERSION.unpack_from
+        for _ in range(self.READ_SPINS):
+            before = read_version(buffer, 0)[0]
+            if before & 1:
+                continue  # Escrita em andamento em outro processo
+            value = struct.unpack_from(fmt, buffer, offset)[0]
+            if read_version(buffer, 0)[0] == before:
+                return value
+
+        # Escritor lento ou morto no meio da escrita: lê sob o lock, com prazo
+        if not self._lock.acquire(timeout=self.READ_TIMEOUT):
+            raise TimeoutError(
+                f'{self.segment_name}: lock de escrita preso há mais de {self.READ_TIMEOUT}s '
+                f'(um escritor terminou no meio da escrita?)'
+            )
+        try:
+            if read_version(buffer, 0)[0] & 1:
+                raise RuntimeError(f'{self.segment_name}: escrita interrompida; o segmento pode estar inconsistente')
+            return struct.unpack_from(fmt, buffer, offset)[0]
+        finally:
+            self._lock.release()
+
+    def increment(self, field: str, delta=1):
+        spec = self._layout[field]
+        with self._lock:
+            value = struct.unpack_from(spec.fmt, self._buffer, spec.offset)[0] + delta
+            self._begin_write()
+            try:
+                struct.pack_into(spec.fmt, self._buffer, spec.offset, value)
+            finally:
+                self._end_write()
+        return value
+
+    def update(self, **values) -> None:
+        # Valida tudo antes de escrever: um texto grande demais não deixa a atualização pela metade
+        specs = [(self._layout[name], self._layout[name].encode(value)) for name, value in values.items()]
+        with self._lock:
+            self._begin_write()
+            try:
+                for spec, value in specs:
+                    struct.pack_into(spec.fmt, self._buffer, spec.offset, value)
+            finally:
+                self._end_write()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {name: getattr(self, name) for name in self._layout}
+
+    def __setattr__(self, name, value):
+        if name.startswith('_') or name == 'segment_name' or name in self._layout:
+            object.__setattr__(self, name, value)
+        else:
+            raise AttributeError(f'{type(self).__name__} não possui o campo compartilhado {name!r}')
+
+    def close(self) -> None:
+        self._buffer = None
+        self._shm.close()
+
+    def unlink(self) -> None:
+        if self._owner:
+            self._shm.unlink()
+
+
+class ConfiguracaoCompartilhada(SharedMonostate):
+    """Exemplo de configuração e contadores compartilhados entre os workers."""
+
+    nome = SharedField('32s', 'Felicity')
+    idade = SharedField('q', 32)
+    limite_memoria = SharedField('d', 60.0)
+    requisicoes = SharedField('q', 0)
+
+
+# ---------------------------------------------------------------------------
+# Benchmark de leitura e escrita com 8 processos
+# ---------------------------------------------------------------------------
+
+N_PROCESSES = 8
+READS = 200_000
+WRITES = 20_000
+
+
+def reader(name: str, lock, results) -> None:
+    state = ConfiguracaoCompartilhada.attach(name, lock)
+    start = time.perf_counter()
+    checksum = 0.0
+    for _ in range(READS):
+        checksum += state.limite_memoria
+    results.put(('leitura', READS / (time.perf_counter() - start)))
+    state.close()
+
+
+def writer(name: str, lock, results) -> None:
+    state = ConfiguracaoCompartilhada.attach(name, lock)
+    start = time.perf_counter()
+    for _ in range(WRITES):
+        state.increment('requisicoes')
+    results.put(('escrita', WRITES / (time.perf_counter() - start)))
+    state.close()
+
+
+def run(target, name: str, lock) -> Tuple[float, float]:
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=target, args=(name, lock, results))
+        for _ in range(N_PROCESSES)
+    ]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    rates = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - start
+    return sum(rate for _, rate in rates), elapsed
+
+
+if __name__ == '__main__':
+    lock = multiprocessing.Lock()
+    m1 = ConfiguracaoCompartilhada.create(lock=lock)
+    m2 = ConfiguracaoCompartilhada.attach(m1.segment_name, lock)
+    print(f'M1 ID: {id(m1)}  M2 ID: {id(m2)}  segmento: {m1.segment_name} ({m1._size} bytes)')
+
+    m1.nome = 'Oliver'
+    m1.update(idade=33, limite_memoria=70.0)
+    print(f'M2 vê: {m2.snapshot()} (versão {m2.version})')
+
+    read_rate, elapsed = run(reader, m1.segment_name, lock)
+    print(f'{N_PROCESSES} processos lendo:    {read_rate:>12,.0f} leituras/s agregadas ({elapsed:.2f}s)')
+
+    write_rate, elapsed = run(writer, m1.segment_name, lock)
+    print(f'{N_PROCESSES} processos escrevendo: {write_rate:>10,.0f} incrementos/s agregados ({elapsed:.2f}s)')
+
+    expected = N_PROCESSES * WRITES
+    print(f'Contador final: {m1.requisicoes} (esperado {expected})')
+    assert m1.requisicoes == expected
+
+    m2.close()
+    m1.close()
+    m1.unlink()
+
+# ### Explicação do Monostate em Memória Compartilhada
+
+# - **Por que não um dicionário?**:
+#   - O `__estado` de 03_monostate.py vive na memória de um único processo. Com `fork`, cada worker
+# recebe uma cópia que diverge na primeira escrita; com `spawn`, nem a cópia existe.
+
+# - **Layout fixo**:
+#   - Cada campo tem tipo e posição conhecidos (`SharedField('q')`, `SharedField('32s')`...),
+# então qualquer processo lê um campo com `struct.unpack_from` direto no buffer compartilhado.
+
+# - **Atualizações**:
+#   - Escritas e incrementos usam um `multiprocessing.Lock` compartilhado e marcam a versão como ímpar
+# enquanto escrevem (seqlock). Leitores sem lock conferem a versão antes e depois e repetem a leitura
+# se ela mudou, então nunca veem um texto `'32s'` pela metade.
@@ -0,0 +1,311 @@
+import sys
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Callable, Iterator, List, Tuple
+
+
+class Snapshot:
+    """
+    Versão imutável do estado compartilhado.
+
+    Atributos:
+        version (int): Número da versão; aumenta a cada escrita confirmada.
+        data (MappingProxyType): Visão somente leitura dos atributos.
+    """
+
+    __slots__ = ('version', 'data')
+
+    def __init__(self, version: int, data: dict):
+        object.__setattr__(self, 'version', version)
+        # Copia: quem guardou o dicionário original não consegue alterar o snapshot publicado
+        object.__setattr__(self, 'data', MappingProxyType(dict(data)))
+
+    def __getattr__(self, name):
+        try:
+            return self.data[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Snapshot é imutável')
+
+    def __repr__(self):
+        return f'Snapshot(version={self.version}, data={dict(self.data)})'
+
+
+class VersionedMonostate:
+    """
+    Variante do `Monostate` de 03_monostate.py com cópia na escrita (copy-on-write).
+
+    No `Monostate` original o `__dict__` de todas as instâncias aponta para o mesmo dicionário
+    mutável: um leitor pode ver `nome` da atualização nova e `idade` da antiga. Colocar um lock
+    em cada leitura deixaria lento o caminho de configuração, que é quase só leitura.
+
+    Aqui o estado é um `Snapshot` imutável referenciado pela classe:
+
+    - **Leitores** obtêm o snapshot atual com uma única leitura de referência, sem lock.
+      Todos os atributos lidos a partir do mesmo snapshot são consistentes entre si.
+    - **Escritores** copiam o dicionário, aplicam as mudanças, criam um novo snapshot com a
+      versão seguinte e trocam a referência (a atribuição é atômica no CPython). Um lock
+      serializa apenas os escritores.
+    - `transaction()` agrupa várias mudanças em uma única nova versão. Abrir outra transação da
+      mesma classe dentro do bloco levanta `RuntimeError` em vez de travar.
+    - `subscribe(callback)` recebe `(antigo, novo)` a cada versão publicada. Os callbacks rodam
+      depois que o lock de escrita é liberado, então podem escrever no estado.
+
+    Cada subclasse tem seu próprio estado.
+
+    Métodos:
+        snapshot() -> Snapshot: O estado atual, imutável.
+        transaction() -> Iterator[dict]: Rascunho mutável publicado ao final do bloco.
+        subscribe(callback) -> Callable: Registra um observador; retorna a função de cancelamento.
+    """
+
+    _snapshot = Snapshot(0, {})
+    _write_lock = threading.Lock()
+    _writer = None  # Identificador da thread que está com o lock de escrita
+    _subscribers: Tuple[Callable[[Snapshot, Snapshot], None], ...] = ()
+    _subscribers_lock = threading.Lock()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._snapshot = Snapshot(0, {})
+        cls._write_lock = threading.Lock()
+        cls._writer = None
+        cls._subscribers = ()
+        cls._subscribers_lock = threading.Lock()
+
+    def __getattr__(self, name):
+        # Chamado apenas quando o atributo não existe na instância/classe
+        try:
+            return type(self)._snapshot.data[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        with self.transaction() as draft:
+            draft[name] = value
+
+    def __delattr__(self, name):
+        with self.transaction() as draft:
+            del draft[name]
+
+    @classmethod
+    def snapshot(cls) -> Snapshot:
+        return cls._snapshot
+
+    @property
+    def version(self) -> int:
+        return type(self)._snapshot.version
+
+    @classmethod
+    @contextmanager
+    def transaction(cls) -> Iterator[dict]:
+        """
+        Abre um rascunho com uma cópia do estado atual e publica uma nova versão ao sair do bloco.
+
+        Se o bloco levantar uma exceção, nada é publicado.
+
+        Raises:
+            RuntimeError: Se a thread já estiver dentro de uma transação da mesma classe.
+        """
+        if cls._writer == threading.get_ident():
+            raise RuntimeError(f'{cls.__name__}: transação aninhada; altere o rascunho já aberto')
+        with cls._write_lock:
+            cls._writer = threading.get_ident()
+            try:
+                old = cls._snapshot
+                draft = dict(old.data)
+                yield draft
+                if draft == old.data:
+                    return
+                new = Snapshot(old.version + 1, draft)
+                cls._snapshot = new
+            finally:
+                cls._writer = None
+        cls._notify(old, new)
+
+    @classmethod
+    def _notify(cls, old: Snapshot, new: Snapshot) -> None:
+        """Chama cada observador; a falha de um é relatada e não impede os demais."""
+        for callback in cls._subscribers:
+            try:
+                callback(old, new)
+            except Exception:
+                print(f'{cls.__name__}: observador {callback!r} falhou na versão {new.version}:',
+                      file=sys.stderr)
+                traceback.print_exc()
+
+    @classmethod
+    def subscribe(cls, callback: Callable[[Snapshot, Snapshot], None]) -> Callable[[], None]:
+        """
+        Registra `callback(antigo, novo)`, chamado pelo escritor logo após cada publicação.
+
+        Os callbacks rodam fora do lock de escrita. Com escritores concorrentes, notificações de
+        versões diferentes podem chegar fora de ordem: use `novo.version` para descartar as antigas.
+        Exceções de um callback são relatadas em `stderr` e não chegam ao escritor.
+
+        Returns:
+            Callable: Função que cancela a inscrição.
+        """
+        with cls._subscribers_lock:
+            cls._subscribers = cls._subscribers + (callback,)
+
+        def unsubscribe():
+            with cls._subscribers_lock:
+                cls._subscribers = tuple(c for c in cls._subscribers if c is not callback)
+        return unsubscribe
+
+
+class Configuracao(VersionedMonostate):
+    """Configuração compartilhada usada no exemplo e no benchmark."""
+
+
+def derive(value):
+    """Simula o cálculo do segundo campo de uma atualização com vários atributos."""
+    return value
+
+
+class LockedMonostate:
+    """Monostate de 03_monostate.py com um lock em cada leitura e escrita (para comparação)."""
+
+    _estado = {}
+    _lock = threading.Lock()
+
+    def read_pair(self):
+        with self._lock:
+            return self._estado['a'], self._estado['b']
+
+    def write_pair(self, value):
+        with self._lock:
+            self._estado['a'] = value
+            self._estado['b'] = derive(value)
+
+
+class PlainMonostate:
+    """Monostate de 03_monostate.py sem lock: rápido, mas sujeito a leituras rasgadas."""
+
+    _estado = {}
+
+    def read_pair(self):
+        return self._estado['a'], self._estado['b']
+
+    def write_pair(self, value):
+        self._estado['a'] = value
+        self._estado['b'] = derive(value)
+
+
+class VersionedAdapter:
+    def read_pair(self):
+        snap = Configuracao.snapshot()
+        return snap.data['a'], snap.data['b']
+
+    def write_pair(self, value):
+        with Configuracao.transaction() as draft:
+            draft['a'] = value
+            draft['b'] = derive(value)
+
+
+# ---------------------------------------------------------------------------
+# Benchmark: latência de leitura com escritores concorrentes
+# ---------------------------------------------------------------------------
+
+N_READERS = 4
+N_WRITERS = 2
+BATCHES = 200
+BATCH_SIZE = 1_000
+
+
+def benchmark(impl) -> dict:
+    impl.write_pair(0)
+    stop = threading.Event()
+    batch_ns: List[float] = []
+    torn = [0]
+    writes = [0]
+    lock = threading.Lock()
+
+    def writer():
+        value = 0
+        while not stop.is_set():
+            value += 1
+            impl.write_pair(value)
+            writes[0] += 1
+
+    def reader():
+        local_ns, local_torn = [], 0
+        for _ in range(BATCHES):
+            start = time.perf_counter_ns()
+            for _ in range(BATCH_SIZE):
+                a, b = impl.read_pair()
+                if a != b:
+                    local_torn += 1
+            local_ns.append((time.perf_counter_ns() - start) / BATCH_SIZE)
+        with lock:
+            batch_ns.extend(local_ns)
+            torn[0] += local_torn
+
+    writers = [threading.Thread(target=writer) for _ in range(N_WRITERS)]
+    readers = [threading.Thread(target=reader) for _ in range(N_READERS)]
+    for thread in writers + readers:
+        thread.start()
+    for thread in readers:
+        thread.join()
+    stop.set()
+    for thread in writers:
+        thread.join()
+
+    batch_ns.sort()
+    return {
+        'p50': batch_ns[len(batch_ns) // 2],
+        'p99': batch_ns[int(len(batch_ns) * 0.99)],
+        'torn': torn[0],
+        'writes': writes[0],
+    }
+
+
+if __name__ == '__main__':
+    m1 = Configuracao()
+    m2 = Configuracao()
+    print(f'M1 ID: {id(m1)}  M2 ID: {id(m2)}')
+
+    events = []
+    unsubscribe = Configuracao.subscribe(lambda old, new: events.append((old.version, new.version)))
+
+    m1.nome = 'Felicity'
+    with m1.transaction() as draft:
+        draft['nome'] = 'Oliver'
+        draft['idade'] = 33
+    print(f'M2: nome={m2.nome}, idade={m2.idade}, versão={m2.version}')
+    print(f'Notificações: {events}')
+    unsubscribe()
+
+    print(f"\n{'implementação':<18} | {'p50 ns/leitura':>14} | {'p99 ns/leitura':>14} | "
+          f"{'rasgadas':>8} | {'escritas':>9}")
+    print('-' * 76)
+    # Trocas de thread mais frequentes deixam visíveis as condições de corrida entre leitores e escritores
+    sys.setswitchinterval(1e-5)
+    for label, impl in (('dict sem lock', PlainMonostate()),
+                        ('dict com lock', LockedMonostate()),
+                        ('copy-on-write', VersionedAdapter())):
+        result = benchmark(impl)
+        print(f"{label:<18} | {result['p50']:>14.1f} | {result['p99']:>14.1f} | "
+              f"{result['torn']:>8} | {result['writes']:>9}")
+        if impl.__class__ is VersionedAdapter:
+            assert result['torn'] == 0
+
+# ### Explicação do Monostate com Cópia na Escrita
+
+# - **Leituras rasgadas**:
+#   - Com um único dicionário mutável, um escritor pode atualizar `a` e ainda não ter atualizado `b`
+# quando um leitor lê os dois. A coluna "rasgadas" do benchmark conta essas leituras inconsistentes.
+
+# - **Cópia na escrita**:
+#   - O escritor nunca altera o snapshot publicado: monta um novo e troca a referência de uma vez.
+#   - O leitor pega a referência atual uma única vez e lê todos os campos dela, sempre da mesma versão.
+
+# - **Custo**:
+#   - Cada escrita copia o dicionário (adequado a estados pequenos e pouco escritos, como configuração).
+#   - Leituras não adquirem lock, então não disputam com escritores nem entre si.
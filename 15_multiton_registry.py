@@ -0,0 +1,264 @@
+import gc
+import inspect
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+
+class _Identity:
+    """Chave por identidade para um argumento não hashable; a referência impede a reutilização do id."""
+
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __hash__(self):
+        return id(self.value)
+
+    def __eq__(self, other):
+        return isinstance(other, _Identity) and other.value is self.value
+
+
+def freeze(value) -> Hashable:
+    """
+    Converte argumentos em uma forma hashable e canônica.
+
+    Cada valor leva o seu tipo na chave, então `1`, `1.0` e `True` não colidem. Dicts viram um
+    `frozenset` de pares (não precisa ordenar chaves de tipos misturados) e listas, tuplas e
+    conjuntos são convertidos recursivamente. Um valor não hashable de outro tipo é comparado
+    por identidade: o mesmo objeto devolve a mesma instância.
+    """
+    kind = type(value)
+    if isinstance(value, dict):
+        return kind, frozenset((freeze(k), freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return kind, tuple(freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return kind, frozenset(freeze(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        return kind, _Identity(value)
+    return kind, value
+
+
+class MetaMultiton(type):
+    """
+    Metaclasse Multiton: uma instância por classe *e* por combinação de argumentos.
+
+    O `MetaSingleton` de 04_metaclasses_singleton.py indexa `_instances` apenas pela classe e
+    ignora os argumentos: `Produto("Caneta", 36)` devolve silenciosamente a instância "Camisa".
+    Aqui a chave é a classe mais os argumentos normalizados pela assinatura do `__init__`,
+    então `Produto("Caneta", 36)` e `Produto(nome="Caneta", preco=36)` são a mesma instância,
+    diferente de `Produto("Camisa", 720)`.
+
+    Opções passadas na definição da classe:
+
+        class Database(metaclass=MetaMultiton, max_entries=8, on_evict=close_database): ...
+
+    - `weak` (bool): guarda as instâncias em um `WeakValueDictionary`; uma instância sem
+      referências externas é liberada e recriada na próxima chamada.
+    - `max_entries` (int): limite de instâncias vivas; a menos usada recentemente é removida.
+    - `on_evict` (callable): chamado com a instância removida pelo limite (ex.: fechar conexão).
+
+    Métodos:
+        live_instances() -> dict: Chave -> instância, para as instâncias vivas.
+        registry_stats() -> dict: Acertos, falhas, remoções e memória estimada.
+        evict(*args, **kwargs) -> bool: Remove explicitamente a instância desses argumentos.
+    """
+
+    def __new__(mcs, name, bases, namespace, weak: bool = False,
+                max_entries: Optional[int] = None,
+                on_evict: Optional[Callable[[object], None]] = None):
+        return super().__new__(mcs, name, bases, namespace)
+
+    def __init__(cls, name, bases, namespace, weak: bool = False,
+                 max_entries: Optional[int] = None,
+                 on_evict: Optional[Callable[[object], None]] = None):
+        super().__init__(name, bases, namespace)
+        if max_entries is not None and max_entries < 1:
+            raise ValueError('max_entries deve ser pelo menos 1')
+        cls._multiton_weak = weak
+        cls._multiton_max_entries = max_entries
+        cls._multiton_on_evict = on_evict
+        cls._multiton_instances = weakref.WeakValueDictionary() if weak else {}
+        cls._multiton_order = OrderedDict()  # Ordem de uso para o LRU (apenas chaves)
+        cls._multiton_lock = threading.RLock()
+        cls._multiton_signature = inspect.signature(cls.__init__)
+        cls._multiton_hits = 0
+        cls._multiton_misses = 0
+        cls._multiton_evictions = 0
+
+    def _multiton_key(cls, args, kwargs) -> Hashable:
+        try:
+            bound = cls._multiton_signature.bind(None, *args, **kwargs)
+        except TypeError:
+            # __init__ genérico (*args, **kwargs): usa os argumentos como vieram
+            return freeze(args), freeze(kwargs)
+        bound.apply_defaults()
+        arguments = list(bound.arguments.items())[1:]  # Ignora o `self`
+        return tuple((name, freeze(value)) for name, value in arguments)
+
+    def __call__(cls, *args, **kwargs):
+        key = cls._multiton_key(args, kwargs)
+        with cls._multiton_lock:
+            instance = cls._multiton_instances.get(key)
+            if instance is not None:
+                cls._multiton_hits += 1
+                cls._multiton_order.move_to_end(key)
+                return instance
+
+            cls._multiton_misses += 1
+            instance = super().__call__(*args, **kwargs)
+            cls._multiton_instances[key] = instance
+            cls._multiton_order[key] = None
+            cls._multiton_order.move_to_end(key)
+            evicted = cls._multiton_enforce_bound()
+
+        for old in evicted:
+            if cls._multiton_on_evict is not None:
+                cls._multiton_on_evict(old)
+        return instance
+
+    def _multiton_enforce_bound(cls) -> list:
+        """Remove as instâncias menos usadas além de `max_entries` (com o lock adquirido)."""
+        evicted = []
+        order, instances = cls._multiton_order, cls._multiton_instances
+        if cls._multiton_weak:
+            # Chaves de instâncias já liberadas pelo coletor de lixo
+            for key in [k for k in order if k not in instances]:
+                del order[key]
+        limit = cls._multiton_max_entries
+        while limit is not None and len(order) > limit:
+            key, _ = order.popitem(last=False)
+            instance = instances.pop(key, None)
+            if instance is not None:
+                cls._multiton_evictions += 1
+                evicted.append(instance)
+        return evicted
+
+    def evict(cls, *args, **kwargs) -> bool:
+        key = cls._multiton_key(args, kwargs)
+        with cls._multiton_lock:
+            cls._multiton_order.pop(key, None)
+            instance = cls._multiton_instances.pop(key, None)
+        if instance is None:
+            return False
+        cls._multiton_evictions += 1
+        if cls._multiton_on_evict is not None:
+            cls._multiton_on_evict(instance)
+        return True
+
+    def live_instances(cls) -> dict:
+        with cls._multiton_lock:
+            return dict(cls._multiton_instances.items())
+
+    def registry_stats(cls) -> dict:
+        live = cls.live_instances()
+        footprint = 0
+        for instance in live.values():
+            footprint += sys.getsizeof(instance)
+            state = getattr(instance, '__dict__', None)
+            if state is not None:
+                footprint += sys.getsizeof(state)
+                footprint += sum(sys.getsizeof(v) for v in state.values())
+        return {
+            'class': cls.__name__,
+            'mode': 'weak' if cls._multiton_weak else 'strong',
+            'live': len(live),
+            'max_entries': cls._multiton_max_entries,
+            'hits': cls._multiton_hits,
+            'misses': cls._multiton_misses,
+            'evictions': cls._multiton_evictions,
+            'footprint_bytes': footprint,
+        }
+
+
+class Produto(metaclass=MetaMultiton):
+    """
+    A classe `Produto` de 04_metaclasses_singleton.py, agora com uma instância por (nome, preco).
+    """
+
+    def __init__(self, nome, preco):
+        self.nome = nome
+        self.preco = preco
+
+
+def close_database(db: 'Database') -> None:
+    print(f'  Fechando conexão com {db.path}')
+    db.connection.close()
+
+
+class Database(metaclass=MetaMultiton, max_entries=2, on_evict=close_database):
+    """
+    Uma conexão por arquivo de banco de dados; no máximo duas abertas ao mesmo tempo.
+
+    Atributos:
+        path (str): Caminho do arquivo do banco de dados.
+        connection (sqlite3.Connection): Conexão com o banco de dados.
+    """
+
+    def __init__(self, path: str = ':memory:'):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+
+
+class Tenant(metaclass=MetaMultiton, weak=True):
+    """Objeto por cliente que deve ser liberado quando ninguém mais o usa."""
+
+    def __init__(self, tenant_id: str, config: dict = None):
+        self.tenant_id = tenant_id
+        self.config = config or {}
+
+
+if __name__ == '__main__':
+    obj1 = Produto("Camisa", 720)
+    obj2 = Produto("Caneta", 36)
+    obj3 = Produto(nome="Caneta", preco=36)
+    print(f'Objeto 1: nome={obj1.nome}, preco={obj1.preco}, ID: {id(obj1)}')
+    print(f'Objeto 2: nome={obj2.nome}, preco={obj2.preco}, ID: {id(obj2)}')
+    print(f'Objeto 3 é o Objeto 2? {obj3 is obj2}')
+    assert obj1 is not obj2 and obj2 is obj3
+
+    print('\nDatabase com max_entries=2:')
+    tmpdir = tempfile.mkdtemp()
+    a = Database(os.path.join(tmpdir, 'a.geek'))
+    b = Database(os.path.join(tmpdir, 'b.geek'))
+    assert Database(os.path.join(tmpdir, 'a.geek')) is a
+    Database(os.path.join(tmpdir, 'c.geek'))  # Remove a menos usada recentemente: b.geek
+    print(f'  {Database.registry_stats()}')
+
+    print('\nTenant com referências fracas:')
+    t1 = Tenant('acme', {'plano': ['pro', 'sla']})
+    assert Tenant('acme', {'plano': ['pro', 'sla']}) is t1
+    Tenant('globex')
+    gc.collect()  # 'globex' não tem referências externas e já foi liberado
+    print(f'  Vivos: {sorted(k[0][1][1] for k in Tenant.live_instances())}')
+    del t1
+    gc.collect()
+    print(f'  Vivos após liberar acme: {len(Tenant.live_instances())}')
+    print(f'  {Tenant.registry_stats()}')
+
+# ### Explicação do Multiton
+
+# - **Singleton x Multiton**:
+#   - O Singleton garante uma instância por classe. O Multiton garante uma instância por *chave*:
+# aqui, a classe mais os argumentos do construtor (por cliente, por arquivo de banco...).
+
+# - **Normalização dos argumentos**:
+#   - `inspect.signature(...).bind` aplica os valores padrão e resolve argumentos nomeados, então
+# chamadas equivalentes geram a mesma chave. Listas e dicionários são convertidos para tuplas.
+
+# - **Referências fracas**:
+#   - Com `weak=True`, o registro não mantém as instâncias vivas; quando o último usuário solta a
+# referência, o objeto é coletado e sai do registro sozinho.
+
+# - **Limite com LRU**:
+#   - Com `max_entries`, a instância usada há mais tempo é removida e entregue a `on_evict`,
+# que pode, por exemplo, fechar a conexão com o banco.
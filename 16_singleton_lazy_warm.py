@@ -0,0 +1,235 @@
+import threading
+import time
+from concurrent.futures import Executor, Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Optional
+
+
+class WarmSingleton:
+    """
+    Singleton com Lazy Initialization (02_singleton_lazy_instance.py) e pré-aquecimento em segundo plano.
+
+    Em 02 a instância é construída no primeiro `get_instance()`. Para objetos caros (conexões,
+    modelos carregados do disco) a primeira requisição depois da inicialização paga toda a
+    latência de construção. Aqui:
+
+    - `warm()` inicia a construção em uma thread (ou em um `Executor` informado) e retorna na hora.
+    - `get_instance(timeout)` bloqueia apenas até o aquecimento terminar. Se `warm()` nunca
+      foi chamado, a construção começa nesse momento, como na versão preguiçosa original.
+    - Falhas de construção são repetidas até `warm_max_attempts` vezes, com espera
+      exponencial (`warm_backoff`, dobrando até `warm_backoff_max`).
+    - `warm_stats()` informa o tempo de construção, as tentativas e quanto tempo os
+      chamadores esperaram, para medir a latência de partida a frio.
+
+    Cada subclasse tem a sua própria instância e as suas próprias métricas. As subclasses
+    constroem a instância normalmente no `__init__`.
+
+    Atributos:
+        warm_max_attempts (int): Número máximo de tentativas de construção.
+        warm_backoff (float): Espera (em segundos) antes da segunda tentativa.
+        warm_backoff_max (float): Espera máxima entre tentativas.
+    """
+
+    warm_max_attempts = 3
+    warm_backoff = 0.1
+    warm_backoff_max = 5.0
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._warm_lock = threading.Lock()
+        cls._warm_future: Optional[Future] = None
+        cls._warm_stats = {
+            'state': 'cold',
+            'attempts': 0,
+            'failures': 0,
+            'construction_time': None,
+            'started_at': None,
+            'ready_at': None,
+            'waits': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+            'last_error': None,
+        }
+
+    @classmethod
+    def _build(cls):
+        """Constrói a instância com novas tentativas e espera exponencial."""
+        stats = cls._warm_stats
+        delay = cls.warm_backoff
+        for attempt in range(1, cls.warm_max_attempts + 1):
+            stats['attempts'] += 1
+            start = time.perf_counter()
+            try:
+                instance = cls()
+            except Exception as exc:
+                stats['failures'] += 1
+                stats['last_error'] = repr(exc)
+                if attempt == cls.warm_max_attempts:
+                    raise
+                time.sleep(delay)
+                delay = min(delay * 2, cls.warm_backoff_max)
+            else:
+                stats['construction_time'] = time.perf_counter() - start
+                return instance
+
+    @classmethod
+    def _run_build(cls, future: Future) -> None:
+        try:
+            instance = cls._build()
+        except BaseException as exc:
+            with cls._warm_lock:
+                cls._warm_stats['state'] = 'failed'
+                cls._warm_future = None  # Permite uma nova tentativa em warm()/get_instance()
+            future.set_exception(exc)
+        else:
+            cls._warm_stats['state'] = 'ready'
+            cls._warm_stats['ready_at'] = time.monotonic()
+            future.set_result(instance)
+
+    @classmethod
+    def warm(cls, executor: Optional[Executor] = None) -> Future:
+        """
+        Inicia a construção em segundo plano, se ainda não foi iniciada.
+
+        Args:
+            executor (Optional[Executor]): Executor a usar; None cria uma thread daemon.
+
+        Returns:
+            Future: Resolvido com a instância quando a construção terminar.
+        """
+        with cls._warm_lock:
+            future = cls._warm_future
+            if future is not None:
+                return future
+            future = Future()
+            future.set_running_or_notify_cancel()
+            cls._warm_future = future
+            cls._warm_stats['state'] = 'warming'
+            cls._warm_stats['started_at'] = time.monotonic()
+
+        if executor is not None:
+            executor.submit(cls._run_build, future)
+        else:
+            threading.Thread(target=cls._run_build, args=(future,),
+                             name=f'warm-{cls.__name__}', daemon=True).start()
+        return future
+
+    @classmethod
+    def get_instance(cls, timeout: Optional[float] = None):
+        """
+        Retorna a instância única, esperando o aquecimento terminar se necessário.
+
+        Args:
+            timeout (Optional[float]): Tempo máximo de espera, em segundos.
+
+        Raises:
+            TimeoutError: Se a instância não ficar pronta dentro de `timeout`.
+            Exception: A última exceção do construtor, se todas as tentativas falharem.
+        """
+        future = cls._warm_future
+        if future is not None and future.done() and future.exception() is None:
+            return future.result()  # Caminho rápido: sem espera e sem métricas
+
+        future = cls.warm()
+        start = time.perf_counter()
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            raise TimeoutError(
+                f'{cls.__name__} não ficou pronta em {timeout}s (estado: {cls._warm_stats["state"]})'
+            ) from None
+        finally:
+            waited = time.perf_counter() - start
+            with cls._warm_lock:
+                stats = cls._warm_stats
+                stats['waits'] += 1
+                stats['wait_time_total'] += waited
+                stats['wait_time_max'] = max(stats['wait_time_max'], waited)
+
+    @classmethod
+    def warm_stats(cls) -> dict:
+        with cls._warm_lock:
+            return dict(cls._warm_stats)
+
+
+class ModeloPesado(WarmSingleton):
+    """
+    Objeto caro de construir (simula carregar um modelo ou abrir conexões).
+
+    A primeira tentativa falha para demonstrar a repetição com espera exponencial.
+    """
+
+    LOAD_TIME = 0.5
+    _failures_left = 1
+
+    def __init__(self):
+        time.sleep(self.LOAD_TIME)
+        if ModeloPesado._failures_left:
+            ModeloPesado._failures_left -= 1
+            raise ConnectionError('falha transitória ao carregar o modelo')
+        self.pesos = list(range(1000))
+
+
+class ConexaoFria(WarmSingleton):
+    """Mesmo custo de construção, mas sem pré-aquecimento (comportamento de 02)."""
+
+    def __init__(self):
+        time.sleep(ModeloPesado.LOAD_TIME)
+
+
+def print_stats(cls) -> None:
+    stats = cls.warm_stats()
+    construction = stats['construction_time'] or 0.0
+    print(
+        f"  {cls.__name__}: estado={stats['state']} tentativas={stats['attempts']} "
+        f"falhas={stats['failures']} construção={construction * 1000:.0f}ms "
+        f"esperas={stats['waits']} espera_máx={stats['wait_time_max'] * 1000:.0f}ms"
+    )
+
+
+if __name__ == '__main__':
+    # Na inicialização do serviço: dispara o aquecimento e continua o resto do startup
+    ModeloPesado.warm()
+    time.sleep(1.2)  # Outras tarefas de inicialização (o modelo falha uma vez e é repetido)
+
+    start = time.perf_counter()
+    modelo = ModeloPesado.get_instance(timeout=5)
+    print(f'Primeira requisição (com warm): {(time.perf_counter() - start) * 1000:.0f}ms')
+
+    start = time.perf_counter()
+    ConexaoFria.get_instance()
+    print(f'Primeira requisição (a frio):   {(time.perf_counter() - start) * 1000:.0f}ms')
+
+    start = time.perf_counter()
+    assert ModeloPesado.get_instance() is modelo
+    print(f'Requisições seguintes:          {(time.perf_counter() - start) * 1e6:.1f}µs')
+
+    class Lenta(WarmSingleton):
+        def __init__(self):
+            time.sleep(1)
+
+    Lenta.warm()
+    try:
+        Lenta.get_instance(timeout=0.1)
+    except TimeoutError as exc:
+        print(f'Timeout: {exc}')
+
+    print('Métricas:')
+    for cls in (ModeloPesado, ConexaoFria, Lenta):
+        print_stats(cls)
+
+# ### Explicação do Pré-Aquecimento
+
+# - **Lazy x Warm**:
+#   - Na Lazy Initialization pura, o custo da construção recai sobre quem chama `get_instance` primeiro,
+# normalmente a primeira requisição de um usuário.
+#   - Com `warm()`, a construção começa durante o startup em segundo plano. Quando a primeira requisição
+# chega, a instância já está pronta (ou falta apenas o restante do tempo de construção).
+
+# - **Repetição com espera exponencial**:
+#   - Falhas transitórias (rede, disco) não devem derrubar o serviço na primeira tentativa.
+# A espera dobra a cada falha para não sobrecarregar o recurso que está se recuperando.
+
+# - **Métricas de partida a frio**:
+#   - `construction_time` mostra o custo real do construtor e `wait_time_max` quanto disso
+# ainda foi sentido pelos chamadores.
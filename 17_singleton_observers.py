@@ -0,0 +1,240 @@
+import json
+import threading
+import time
+from collections import defaultdict
+from typing import Tuple
+
+
+class SingletonObserver:
+    """
+    Interface de observação dos eventos de uma metaclasse Singleton.
+
+    As implementações sobrescrevem apenas os métodos que interessam; os demais não fazem nada.
+
+    Métodos:
+        on_hit(cls): Uma chamada reutilizou a instância existente.
+        on_miss(cls, lock_wait): A instância não existia; `lock_wait` é o tempo até obter o lock.
+        on_create(cls, instance, duration): Uma instância foi construída em `duration` segundos.
+        on_error(cls, exc, duration): O construtor levantou `exc`.
+    """
+
+    def on_hit(self, cls) -> None:
+        pass
+
+    def on_miss(self, cls, lock_wait: float) -> None:
+        pass
+
+    def on_create(self, cls, instance, duration: float) -> None:
+        pass
+
+    def on_error(self, cls, exc: BaseException, duration: float) -> None:
+        pass
+
+
+class InstrumentedSingleton(type):
+    """
+    Metaclasse Singleton thread-safe (07_singleton_thread_safe.py) com observadores plugáveis.
+
+    Mesma interface de observadores das metaclasses de 04/05, aplicada à versão de 07: os
+    eventos são entregues aos observadores registrados com `add_observer`. Sem observadores, o caminho
+    rápido faz apenas uma leitura no dicionário e um teste em uma tupla vazia, sem relógio,
+    sem contadores e sem I/O.
+
+    Atributos:
+        _instances (dict): Instâncias únicas, indexadas pela classe.
+        _observers (tuple): Observadores registrados (tupla imutável, trocada inteira).
+
+    Métodos:
+        add_observer(observer) / remove_observer(observer): Gerenciam os observadores.
+    """
+
+    _instances = {}
+    _observers: Tuple[SingletonObserver, ...] = ()
+    _observers_lock = threading.Lock()
+
+    def __init__(cls, name, bases, namespace):
+        super().__init__(name, bases, namespace)
+        cls._singleton_lock = threading.Lock()
+
+    @staticmethod
+    def add_observer(observer: SingletonObserver) -> None:
+        with InstrumentedSingleton._observers_lock:
+            InstrumentedSingleton._observers = InstrumentedSingleton._observers + (observer,)
+
+    @staticmethod
+    def remove_observer(observer: SingletonObserver) -> None:
+        with InstrumentedSingleton._observers_lock:
+            InstrumentedSingleton._observers = tuple(
+                o for o in InstrumentedSingleton._observers if o is not observer
+            )
+
+    def __call__(cls, *args, **kwargs):
+        instance = cls._instances.get(cls)
+        if instance is not None:
+            observers = InstrumentedSingleton._observers
+            if observers:
+                for observer in observers:
+                    observer.on_hit(cls)
+            return instance
+
+        observers = InstrumentedSingleton._observers
+        if not observers:
+            with cls._singleton_lock:
+                instance = cls._instances.get(cls)
+                if instance is None:
+                    instance = super().__call__(*args, **kwargs)
+                    cls._instances[cls] = instance
+            return instance
+        return cls._observed_create(observers, args, kwargs)
+
+    def _observed_create(cls, observers, args, kwargs):
+        """Caminho lento instrumentado: mede a espera pelo lock e o tempo do construtor."""
+        wait_start = time.perf_counter()
+        with cls._singleton_lock:
+            lock_wait = time.perf_counter() - wait_start
+            instance = cls._instances.get(cls)
+            if instance is not None:
+                # Outra thread construiu enquanto esperávamos: conta como reutilização
+                for observer in observers:
+                    observer.on_hit(cls)
+                return instance
+
+            for observer in observers:
+                observer.on_miss(cls, lock_wait)
+            start = time.perf_counter()
+            try:
+                instance = super().__call__(*args, **kwargs)
+            except BaseException as exc:
+                duration = time.perf_counter() - start
+                for observer in observers:
+                    observer.on_error(cls, exc, duration)
+                raise
+            duration = time.perf_counter() - start
+            cls._instances[cls] = instance
+        for observer in observers:
+            observer.on_create(cls, instance, duration)
+        return instance
+
+
+class PrintObserver(SingletonObserver):
+    """Reproduz as mensagens de 04/05 por meio dos hooks, em vez de `print` dentro do `__call__`."""
+
+    def on_hit(self, cls) -> None:
+        print(f'Retornando instância existente da classe {cls.__name__}')
+
+    def on_create(self, cls, instance, duration: float) -> None:
+        print(f'Criando nova instância da classe {cls.__name__} ({duration * 1000:.2f}ms)')
+
+
+class MetricsObserver(SingletonObserver):
+    """
+    Contadores por classe exportados em um snapshot legível por máquina.
+
+    `creations` maior que 1 indica recriação inesperada (registro limpo, fork, recarga de módulo);
+    `init_time_max` alto indica um construtor pesado no caminho quente.
+
+    Métodos:
+        snapshot() -> dict: Contadores por classe, serializáveis em JSON.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(lambda: {
+            'hits': 0, 'misses': 0, 'creations': 0, 'errors': 0,
+            'init_time_total': 0.0, 'init_time_max': 0.0,
+            'lock_wait_total': 0.0, 'lock_wait_max': 0.0,
+        })
+
+    @staticmethod
+    def _name(cls) -> str:
+        return f'{cls.__module__}.{cls.__qualname__}'
+
+    def on_hit(self, cls) -> None:
+        # Com lock: o primeiro acerto de uma classe insere uma chave, o que não pode acontecer
+        # enquanto `snapshot()` percorre o dicionário
+        with self._lock:
+            self._counters[self._name(cls)]['hits'] += 1
+
+    def on_miss(self, cls, lock_wait: float) -> None:
+        with self._lock:
+            counters = self._counters[self._name(cls)]
+            counters['misses'] += 1
+            counters['lock_wait_total'] += lock_wait
+            counters['lock_wait_max'] = max(counters['lock_wait_max'], lock_wait)
+
+    def on_create(self, cls, instance, duration: float) -> None:
+        with self._lock:
+            counters = self._counters[self._name(cls)]
+            counters['creations'] += 1
+            counters['init_time_total'] += duration
+            counters['init_time_max'] = max(counters['init_time_max'], duration)
+
+    def on_error(self, cls, exc: BaseException, duration: float) -> None:
+        with self._lock:
+            self._counters[self._name(cls)]['errors'] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            classes = {name: dict(values) for name, values in self._counters.items()}
+        for values in classes.values():
+            values['recreated'] = values['creations'] > 1
+        return {'timestamp': time.time(), 'classes': classes}
+
+
+class Produto(metaclass=InstrumentedSingleton):
+    def __init__(self, nome, preco):
+        time.sleep(0.01)  # Construtor "pesado"
+        self.nome = nome
+        self.preco = preco
+
+
+class Configuracao(metaclass=InstrumentedSingleton):
+    pass
+
+
+def calls_per_second(cls, n: int = 500_000) -> float:
+    cls()
+    start = time.perf_counter()
+    for _ in range(n):
+        cls()
+    return n / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    printer = PrintObserver()
+    InstrumentedSingleton.add_observer(printer)
+    obj1 = Produto("Camisa", 720)
+    obj2 = Produto("Caneta", 36)
+    InstrumentedSingleton.remove_observer(printer)
+
+    metrics = MetricsObserver()
+    InstrumentedSingleton.add_observer(metrics)
+    threads = [threading.Thread(target=lambda: [Configuracao() for _ in range(1000)]) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Simula uma recriação inesperada (ex.: alguém limpou o registro)
+    InstrumentedSingleton._instances.pop(Configuracao)
+    Configuracao()
+    print(json.dumps(metrics.snapshot(), indent=2))
+
+    with_observer = calls_per_second(Configuracao)
+    InstrumentedSingleton.remove_observer(metrics)
+    without_observer = calls_per_second(Configuracao)
+    print(f'Chamadas/s sem observadores: {without_observer:,.0f}')
+    print(f'Chamadas/s com MetricsObserver: {with_observer:,.0f}')
+
+# ### Explicação dos Observadores
+
+# - **Por que não `print`?**:
+#   - `print` no `__call__` gera I/O em toda chamada, não pode ser desligado e não produz números.
+#   - Os observadores recebem eventos estruturados (acerto, falha, construção, erro) com tempos medidos.
+
+# - **Custo zero quando desligado**:
+#   - Os observadores ficam em uma tupla imutável. Sem observadores, o caminho rápido testa uma tupla
+# vazia e retorna; nenhum relógio é lido e nenhum contador é incrementado.
+
+# - **Snapshot**:
+#   - `MetricsObserver.snapshot()` retorna um dicionário serializável em JSON, pronto para ser exportado
+# para logs estruturados ou sistemas de métricas. `recreated: true` sinaliza recriações inesperadas.
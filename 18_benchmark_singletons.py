@@ -0,0 +1,332 @@
+"""
+Benchmark comparando as formas de obter uma instância compartilhada vistas nos scripts 01 a 07.
+
+Para cada estratégia mede:
+
+- latência de acesso (ns por chamada, depois da primeira construção);
+- memória por instância/handle (tracemalloc);
+- custo da primeira construção (classe nova a cada repetição);
+- vazão com 1..N threads e 1..N processos.
+
+A suíte roda `--runs` vezes e cada métrica é a mediana das rodadas, para que uma rodada ruidosa
+(comum em máquinas compartilhadas de CI) não vire uma regressão. Os resultados são gravados em
+JSON e comparados com um baseline gerado na mesma máquina. Uma métrica que piora além da
+tolerância faz o script terminar com código 1; sem baseline, com código 2, para que o CI não
+passe sem ter comparado nada.
+
+Uso:
+    python 18_benchmark_singletons.py --output resultados.json --update-baseline
+    python 18_benchmark_singletons.py --baseline baseline_singletons.json --tolerance 0.25
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+import timeit
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+
+# ---------------------------------------------------------------------------
+# Estratégias (mesma lógica dos scripts originais, sem os prints)
+# ---------------------------------------------------------------------------
+
+def make_new_hasattr():
+    """01_padrao_singleton.py: `__new__` com `hasattr`."""
+    class Singleton:
+        def __new__(cls):
+            if not hasattr(cls, 'instance'):
+                cls.instance = super().__new__(cls)
+            return cls.instance
+    return Singleton
+
+
+def make_get_instance():
+    """02_singleton_lazy_instance.py: `get_instance` com Lazy Initialization."""
+    class Singleton:
+        __instance = None
+
+        @classmethod
+        def get_instance(cls):
+            if not cls.__instance:
+                cls.__instance = cls()
+            return cls.__instance
+    return Singleton.get_instance
+
+
+def make_monostate():
+    """03_monostate.py: instâncias distintas com `__dict__` compartilhado."""
+    class Monostate:
+        __estado = {}
+
+        def __new__(cls, *args, **kwargs):
+            obj = super().__new__(cls)
+            obj.__dict__ = cls.__estado
+            return obj
+    return Monostate
+
+
+def make_metaclass():
+    """04/05: `MetaSingleton` com `_instances` indexado pela classe."""
+    class MetaSingleton(type):
+        _instances = {}
+
+        def __call__(cls, *args, **kwargs):
+            if cls not in cls._instances:
+                cls._instances[cls] = super().__call__(*args, **kwargs)
+            return cls._instances[cls]
+
+    class Produto(metaclass=MetaSingleton):
+        pass
+    return Produto
+
+
+def make_new_is_none():
+    """06_proj01_db_singleton.py: `_instance is None` no `__new__`."""
+    class Database:
+        _instance = None
+
+        def __new__(cls, *args, **kwargs):
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+            return cls._instance
+    return Database
+
+
+def make_thread_safe():
+    """07_singleton_thread_safe.py: metaclasse com double-checked locking."""
+    class ThreadSafeSingleton(type):
+        _instances = {}
+
+        def __init__(cls, name, bases, namespace):
+            super().__init__(name, bases, namespace)
+            cls._singleton_lock = threading.Lock()
+
+        def __call__(cls, *args, **kwargs):
+            instance = cls._instances.get(cls)
+            if instance is not None:
+                return instance
+            with cls._singleton_lock:
+                instance = cls._instances.get(cls)
+                if instance is None:
+                    instance = super().__call__(*args, **kwargs)
+                    cls._instances[cls] = instance
+            return instance
+
+    class Produto(metaclass=ThreadSafeSingleton):
+        pass
+    return Produto
+
+
+STRATEGIES: Dict[str, Callable[[], Callable[[], object]]] = {
+    '01_new_hasattr': make_new_hasattr,
+    '02_get_instance': make_get_instance,
+    '03_monostate': make_monostate,
+    '04_metaclass': make_metaclass,
+    '06_new_is_none': make_new_is_none,
+    '07_thread_safe': make_thread_safe,
+}
+
+# Métricas em que "maior é pior"; as de vazão são tratadas ao contrário na comparação
+LOWER_IS_BETTER = ('access_ns', 'first_construction_us', 'bytes_per_handle')
+
+# Folga absoluta somada à tolerância relativa: a memória por handle costuma ser ~0 (o handle é só
+# uma referência), e uma estratégia que passa a alocar por chamada precisa falhar mesmo assim
+ABSOLUTE_SLACK = {'bytes_per_handle': 8.0}
+
+
+# ---------------------------------------------------------------------------
+# Medições
+# ---------------------------------------------------------------------------
+
+def measure_access_ns(factory, number: int) -> float:
+    get = factory()
+    get()
+    timer = timeit.Timer(get)
+    best = min(timer.repeat(repeat=5, number=number))
+    return best / number * 1e9
+
+
+def measure_first_construction_us(factory, repeat: int = 200) -> float:
+    samples = []
+    for _ in range(repeat):
+        get = factory()
+        start = time.perf_counter()
+        get()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e6
+
+
+def measure_bytes_per_handle(factory, handles: int = 10_000) -> float:
+    """Memória retida por `handles` referências obtidas com a estratégia (sem contar a lista)."""
+    get = factory()
+    get()
+    holder = [None] * handles
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(handles):
+        holder[i] = get()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del holder
+    return max(0.0, (after - before) / handles)
+
+
+def _thread_worker(get, calls: int, barrier: threading.Barrier) -> None:
+    barrier.wait()
+    for _ in range(calls):
+        get()
+
+
+def measure_threads(factory, n_threads: int, calls: int) -> float:
+    get = factory()
+    get()
+    barrier = threading.Barrier(n_threads + 1)
+    threads = [threading.Thread(target=_thread_worker, args=(get, calls, barrier)) for _ in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return n_threads * calls / (time.perf_counter() - start)
+
+
+def _process_worker(args: Tuple[str, int]) -> float:
+    name, calls = args
+    get = STRATEGIES[name]()
+    get()
+    start = time.perf_counter()
+    for _ in range(calls):
+        get()
+    return calls / (time.perf_counter() - start)
+
+
+def measure_processes(pool, name: str, n_processes: int, calls: int) -> float:
+    rates = pool.map(_process_worker, [(name, calls)] * n_processes, chunksize=1)
+    return sum(rates)
+
+
+def measure_once(pool, name: str, factory, args) -> Dict[str, float]:
+    entry = {
+        'access_ns': measure_access_ns(factory, args.calls),
+        'first_construction_us': measure_first_construction_us(factory),
+        'bytes_per_handle': measure_bytes_per_handle(factory),
+    }
+    for n in args.threads:
+        entry[f'threads_{n}_calls_per_s'] = measure_threads(factory, n, args.calls // n)
+    for n in args.processes:
+        entry[f'processes_{n}_calls_per_s'] = measure_processes(pool, name, n, args.calls)
+    return entry
+
+
+def run_suite(args) -> dict:
+    runs = {name: [] for name in STRATEGIES}
+    max_processes = max(args.processes)
+    with multiprocessing.Pool(processes=max_processes) as pool:
+        # Rodadas intercaladas: uma perturbação passageira atinge uma rodada de cada estratégia
+        for _ in range(args.runs):
+            for name, factory in STRATEGIES.items():
+                runs[name].append(measure_once(pool, name, factory, args))
+
+    results = {}
+    for name, entries in runs.items():
+        entry = {metric: statistics.median(run[metric] for run in entries) for metric in entries[0]}
+        results[name] = entry
+        print(
+            f"{name:<16} acesso {entry['access_ns']:>7.1f}ns  "
+            f"1ª construção {entry['first_construction_us']:>7.2f}µs  "
+            f"memória/handle {entry['bytes_per_handle']:>6.1f}B  "
+            f"1 thread {entry[f'threads_{args.threads[0]}_calls_per_s']:>12,.0f} chamadas/s"
+        )
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'timestamp': time.time(),
+            'calls': args.calls,
+            'runs': args.runs,
+        },
+        'results': results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Retorna a lista de regressões em relação ao baseline."""
+    regressions = []
+    for name, metrics in current['results'].items():
+        base_metrics = baseline.get('results', {}).get(name)
+        if base_metrics is None:
+            continue
+        for metric, value in metrics.items():
+            base = base_metrics.get(metric)
+            slack = ABSOLUTE_SLACK.get(metric, 0.0)
+            if base is None or (not base and not slack):
+                continue
+            if metric in LOWER_IS_BETTER:
+                ratio = value / base if base else float('inf')
+                worse = value > base * (1 + tolerance) + slack
+            else:
+                ratio = base / value if value else float('inf')
+                worse = ratio > 1 + tolerance
+            if worse:
+                regressions.append(f'{name}.{metric}: {base:,.2f} -> {value:,.2f} ({(ratio - 1) * 100:+.0f}%)')
+    return regressions
+
+
+def parse_counts(text: str) -> List[int]:
+    return [int(part) for part in text.split(',') if part]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark das implementações de Singleton')
+    parser.add_argument('--output', default='resultados_singletons.json')
+    parser.add_argument('--baseline', default='baseline_singletons.json')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='grava os resultados atuais como o novo baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='piora relativa aceita antes de falhar (0.25 = 25%%)')
+    parser.add_argument('--calls', type=int, default=200_000)
+    parser.add_argument('--runs', type=int, default=5, help='rodadas da suíte; compara as medianas')
+    parser.add_argument('--threads', type=parse_counts, default=[1, 2, 4, 8])
+    parser.add_argument('--processes', type=parse_counts, default=[1, 2, 4])
+    args = parser.parse_args(argv)
+
+    current = run_suite(args)
+    with open(args.output, 'w') as output:
+        json.dump(current, output, indent=2)
+    print(f'Resultados gravados em {args.output}')
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as output:
+            json.dump(current, output, indent=2)
+        print(f'Baseline atualizado em {args.baseline}')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        # O baseline depende da máquina, então não é versionado: gere-o no próprio runner de CI
+        print(f'Baseline {args.baseline} não encontrado; nada foi comparado. '
+              f'Gere-o nesta máquina com --update-baseline.')
+        return 2
+
+    with open(args.baseline) as source:
+        baseline = json.load(source)
+    regressions = compare(current, baseline, args.tolerance)
+    if regressions:
+        print(f'{len(regressions)} regressão(ões) acima de {args.tolerance:.0%}:')
+        for line in regressions:
+            print(f'  {line}')
+        return 1
+    print(f'Nenhuma regressão acima de {args.tolerance:.0%} em relação a {args.baseline}.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,535 @@
+import bisect
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Callable, Iterable, List, Optional, Sequence
+
+
+class ThreadSafeSingleton(type):
+    """
+    Metaclasse Singleton com double-checked locking (ver 07_singleton_thread_safe.py).
+
+    Atributos:
+        _instances (dict): Instâncias únicas, indexadas pela classe.
+    """
+
+    _instances = {}
+
+    def __init__(cls, name, bases, namespace):
+        super().__init__(name, bases, namespace)
+        cls._singleton_lock = threading.Lock()
+
+    def __call__(cls, *args, **kwargs):
+        instance = cls._instances.get(cls)
+        if instance is not None:
+            return instance
+        with cls._singleton_lock:
+            instance = cls._instances.get(cls)
+            if instance is None:
+                instance = super().__call__(*args, **kwargs)
+                cls._instances[cls] = instance
+        return instance
+
+
+# ---------------------------------------------------------------------------
+# Normalização dos comandos
+# ---------------------------------------------------------------------------
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b')
+_IN_LIST = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+_VALUES_LIST = re.compile(r'(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+')
+_SPACES = re.compile(r'\s+')
+_NAMED = re.compile(r'[:@$]\w+')
+
+_NORMALIZED_MAX = 4096
+_normalized = {}
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Forma canônica de um comando: literais e parâmetros viram `?`, listas `IN (...)` e
+    `VALUES (...), (...)` de tamanho variável viram uma só, e os espaços são compactados.
+
+    Assim `WHERE id = 7` e `WHERE id = 8` somam no mesmo histograma. O resultado é memorizado
+    por texto SQL, então o custo das expressões regulares só é pago na primeira execução.
+    """
+    normalized = _normalized.get(sql)
+    if normalized is not None:
+        return normalized
+    text = _STRING.sub('?', sql)
+    text = _NUMBER.sub('?', text)
+    text = _NAMED.sub('?', text)
+    text = _IN_LIST.sub('IN (?)', text)
+    text = _VALUES_LIST.sub(r'\1', text)
+    normalized = _SPACES.sub(' ', text).strip().rstrip(';')
+    if len(_normalized) >= _NORMALIZED_MAX:
+        _normalized.clear()  # Comandos montados com literais não crescem a memória sem limite
+    _normalized[sql] = normalized
+    return normalized
+
+
+# ---------------------------------------------------------------------------
+# Estatísticas por comando
+# ---------------------------------------------------------------------------
+
+# Limites superiores dos baldes do histograma (segundos): 10µs, 20µs, 40µs, ... ~10,5s
+LATENCY_BOUNDS = tuple(10e-6 * 2 ** i for i in range(21))
+
+
+class LatencyHistogram:
+    """
+    Histograma de latências com baldes fixos em escala logarítmica.
+
+    Registrar uma medida é uma busca binária e um incremento; a memória não depende da
+    quantidade de execuções. Os percentis são estimados pelo limite superior do balde
+    (erro de no máximo 2x, suficiente para achar o comando lento).
+    """
+
+    __slots__ = ('counts', 'total', 'maximum')
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BOUNDS) + 1)  # O último balde recebe o que passar de ~10s
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BOUNDS, seconds)] += 1
+        self.total += seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+    def percentile(self, q: float) -> float:
+        count = sum(self.counts)
+        if not count:
+            return 0.0
+        rank = q / 100 * count
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= rank and bucket:
+                return min(LATENCY_BOUNDS[index], self.maximum) if index < len(LATENCY_BOUNDS) else self.maximum
+        return self.maximum
+
+    def buckets(self) -> List[tuple]:
+        """Pares (limite superior em segundos, contagem) dos baldes não vazios."""
+        bounds = LATENCY_BOUNDS + (float('inf'),)
+        return [(bounds[i], n) for i, n in enumerate(self.counts) if n]
+
+
+class StatementStats:
+    """Contadores acumulados de um comando normalizado."""
+
+    __slots__ = ('calls', 'errors', 'rows', 'busy_retries', 'lock_wait', 'vm_steps', 'latency',
+                 'untimed_calls')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.busy_retries = 0
+        self.lock_wait = 0.0
+        self.vm_steps = 0
+        self.latency = LatencyHistogram()
+        self.untimed_calls = 0  # Vistas só pelo trace (commit(), executescript...), sem medição
+
+
+class StatementProfiler:
+    """
+    Perfil dos comandos executados pelo `Database`, agrupados pelo texto normalizado.
+
+    Para cada comando guarda execuções, erros, linhas, tentativas repetidas por SQLITE_BUSY,
+    tempo esperando o lock, passos da VM do SQLite (aproximados pelo progress handler) e um
+    histograma de latência. Comandos acima de `slow_threshold` segundos entram no log de
+    comandos lentos (os últimos `slow_log_size`, com o SQL original) e são repassados a
+    `on_slow`, se informado.
+
+    Atributos:
+        slow_threshold (float): Latência (segundos) a partir da qual o comando é lento.
+        slow_queries (deque): Últimos comandos lentos.
+        on_slow (Optional[Callable[[dict], None]]): Chamado para cada comando lento.
+
+    Métodos:
+        record(sql, elapsed, rows, retries, lock_wait, vm_steps, error) -> None: Registra uma execução.
+        record_untimed(sql) -> None: Conta um comando executado fora dos métodos do `Database`.
+        snapshot(sort, limit) -> list: Cópia das estatísticas, do comando mais caro ao mais barato.
+        reset() -> None: Zera tudo.
+    """
+
+    def __init__(self, slow_threshold: float = 0.1, slow_log_size: int = 100,
+                 on_slow: Optional[Callable[[dict], None]] = None):
+        self.slow_threshold = slow_threshold
+        self.on_slow = on_slow
+        self.slow_queries = deque(maxlen=slow_log_size)
+        self._stats = {}
+        self._by_sql = {}  # Atalho do SQL original para as estatísticas do comando normalizado
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def _entry(self, sql: str) -> StatementStats:
+        stats = self._by_sql.get(sql)
+        if stats is None:
+            key = normalize_sql(sql)
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = StatementStats()
+            if len(self._by_sql) >= _NORMALIZED_MAX:
+                self._by_sql.clear()
+            self._by_sql[sql] = stats
+        return stats
+
+    def record(self, sql: str, elapsed: float, rows: int = 0, retries: int = 0,
+               lock_wait: float = 0.0, vm_steps: int = 0, error: bool = False) -> None:
+        with self._lock:
+            stats = self._entry(sql)
+            stats.calls += 1
+            stats.errors += error
+            stats.rows += max(rows, 0)
+            stats.busy_retries += retries
+            stats.lock_wait += lock_wait
+            stats.vm_steps += vm_steps
+            stats.latency.add(elapsed)
+        if elapsed >= self.slow_threshold:
+            entry = {
+                'timestamp': time.time(),
+                'statement': normalize_sql(sql),
+                'sql': sql,
+                'seconds': elapsed,
+                'rows': rows,
+                'busy_retries': retries,
+                'lock_wait': lock_wait,
+                'error': error,
+            }
+            self.slow_queries.append(entry)
+            if self.on_slow is not None:
+                self.on_slow(entry)
+
+    def record_untimed(self, sql: str) -> None:
+        if sql.startswith('--'):
+            return  # Comandos internos do SQLite (triggers, ANALYZE), já contados no comando que os disparou
+        with self._lock:
+            self._entry(sql).untimed_calls += 1
+
+    def snapshot(self, sort: str = 'total', limit: Optional[int] = None) -> List[dict]:
+        """
+        Estatísticas por comando normalizado.
+
+        Args:
+            sort (str): Campo de ordenação decrescente ('total', 'calls', 'p99', 'rows', ...).
+            limit (Optional[int]): Quantidade máxima de comandos retornados.
+
+        Returns:
+            list: Um dicionário por comando, com latências em segundos.
+        """
+        with self._lock:
+            items = list(self._stats.items())
+            result = []
+            for statement, stats in items:
+                latency = stats.latency
+                result.append({
+                    'statement': statement,
+                    'calls': stats.calls,
+                    'untimed_calls': stats.untimed_calls,
+                    'errors': stats.errors,
+                    'rows': stats.rows,
+                    'busy_retries': stats.busy_retries,
+                    'lock_wait': stats.lock_wait,
+                    'vm_steps': stats.vm_steps,
+                    'total': latency.total,
+                    'mean': latency.total / stats.calls if stats.calls else 0.0,
+                    'p50': latency.percentile(50),
+                    'p95': latency.percentile(95),
+                    'p99': latency.percentile(99),
+                    'max': latency.maximum,
+                    'histogram': latency.buckets(),
+                })
+        result.sort(key=lambda item: item[sort], reverse=True)
+        return result[:limit] if limit else result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._by_sql.clear()
+            self.slow_queries.clear()
+            self.started_at = time.time()
+
+
+def is_busy(exc: sqlite3.Error) -> bool:
+    """
+    Se o erro é o SQLITE_BUSY simples (outra conexão segura o lock do banco).
+
+    Códigos estendidos como SQLITE_BUSY_SNAPSHOT e o SQLITE_LOCKED (conflito dentro da mesma
+    conexão) não se resolvem esperando, então não contam.
+    """
+    code = getattr(exc, 'sqlite_errorcode', None)
+    if code is not None:
+        return code == sqlite3.SQLITE_BUSY
+    return str(exc) == 'database is locked'
+
+
+class Database(metaclass=ThreadSafeSingleton):
+    """
+    Classe `Database` de 05_proj01_db_metaclasses.py com perfil opcional dos comandos.
+
+    Todos os comandos passam por `_call`, que mede o tempo com `perf_counter`, conta as linhas
+    e repete o comando quando o banco está travado por outra conexão. O `busy_timeout` do
+    SQLite fica em zero e a espera é feita aqui, com recuo exponencial até `busy_timeout`
+    segundos: o SQLite esperaria em silêncio, e assim cada SQLITE_BUSY vira uma tentativa
+    contada e o tempo parado no lock aparece separado da execução.
+
+    Com o perfil ligado (`enable_profiling`), dois callbacks do sqlite3 são instalados:
+
+    - progress handler a cada `progress_steps` instruções da VM, que estima o trabalho de cada
+      comando (uma consulta sem índice aparece pelos passos, mesmo em um banco pequeno);
+    - trace callback, que conta os comandos executados por fora dos métodos da classe
+      (`connection.commit()`, `executescript`), que não têm medição própria.
+
+    Desligado, o custo é só o do `with` no lock e do laço de tentativas.
+
+    Atributos:
+        connection (sqlite3.Connection): Conexão em modo autocommit.
+        profiler (Optional[StatementProfiler]): Perfil dos comandos, None quando desligado.
+        busy_timeout (float): Tempo máximo (segundos) repetindo um comando com o banco travado.
+
+    Métodos:
+        enable_profiling(slow_threshold, slow_log_size, on_slow) -> StatementProfiler: Liga o perfil.
+        disable_profiling() -> None: Desliga o perfil e remove os callbacks.
+        execute(sql, params) -> int: Executa um comando e retorna o rowcount.
+        executemany(sql, seq_of_params) -> int: Idem, para várias linhas em uma transação.
+        fetchall(sql, params) -> list: Executa uma consulta.
+        close() -> None: Fecha a conexão.
+    """
+
+    def __init__(self, path: str = 'db.geek', profiling: bool = False, slow_threshold: float = 0.1,
+                 busy_timeout: float = 5.0, progress_steps: int = 1000):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self.progress_steps = progress_steps
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False, timeout=0)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.profiler: Optional[StatementProfiler] = None
+        self._lock = threading.RLock()
+        self._progress_ticks = 0
+        self._in_call = False
+        if profiling:
+            self.enable_profiling(slow_threshold)
+
+    # -- callbacks do sqlite3 ------------------------------------------------
+
+    def _progress(self):
+        self._progress_ticks += 1
+        return 0  # Diferente de zero interromperia o comando
+
+    def _trace(self, sql: str) -> None:
+        profiler = self.profiler
+        if profiler is not None and not self._in_call:
+            profiler.record_untimed(sql)
+
+    def enable_profiling(self, slow_threshold: float = 0.1, slow_log_size: int = 100,
+                         on_slow: Optional[Callable[[dict], None]] = None) -> StatementProfiler:
+        with self._lock:
+            if self.profiler is None:
+                self.profiler = StatementProfiler(slow_threshold, slow_log_size, on_slow)
+                self.connection.set_progress_handler(self._progress, self.progress_steps)
+                self.connection.set_trace_callback(self._trace)
+            return self.profiler
+
+    def disable_profiling(self) -> None:
+        with self._lock:
+            self.connection.set_progress_handler(None, 0)
+            self.connection.set_trace_callback(None)
+            self.profiler = None
+
+    # -- execução --------------------------------------------------------------
+
+    def _call(self, sql: str, run: Callable[[], tuple]):
+        """
+        Executa `run()` (que retorna (resultado, linhas)) repetindo enquanto o banco estiver
+        travado, e registra a execução no perfil quando ligado.
+        """
+        with self._lock:
+            profiler = self.profiler
+            retries = 0
+            lock_wait = 0.0
+            delay = 0.001
+            start = time.perf_counter()
+            ticks = self._progress_ticks
+            self._in_call = True
+            try:
+                while True:
+                    try:
+                        result, rows = run()
+                        break
+                    except sqlite3.OperationalError as exc:
+                        waited = time.perf_counter() - start
+                        # Dentro de um BEGIN explícito desta conexão a nova tentativa não tem como dar certo
+                        if (not is_busy(exc) or self.connection.in_transaction
+                                or waited >= self.busy_timeout):
+                            raise
+                        retries += 1
+                        pause = min(delay, self.busy_timeout - waited)
+                        time.sleep(pause)
+                        lock_wait += pause
+                        delay = min(delay * 2, 0.05)
+            except sqlite3.Error:
+                if profiler is not None:
+                    profiler.record(sql, time.perf_counter() - start, 0, retries, lock_wait,
+                                    (self._progress_ticks - ticks) * self.progress_steps, error=True)
+                raise
+            finally:
+                self._in_call = False
+            if profiler is not None:
+                profiler.record(sql, time.perf_counter() - start, rows, retries, lock_wait,
+                                (self._progress_ticks - ticks) * self.progress_steps)
+            return result
+
+    def execute(self, sql: str, params: Sequence = ()) -> int:
+        """Comando único em autocommit: um SQLITE_BUSY acontece antes de qualquer alteração."""
+        def run():
+            rowcount = self.connection.execute(sql, params).rowcount
+            return rowcount, rowcount
+        return self._call(sql, run)
+
+    def executemany(self, sql: str, seq_of_params: Iterable[Sequence]) -> int:
+        """
+        Várias linhas em uma transação. Os parâmetros são materializados para que uma nova
+        tentativa depois de SQLITE_BUSY grave as mesmas linhas.
+        """
+        rows = list(seq_of_params)
+
+        def run():
+            conn = self.connection
+            conn.execute('BEGIN IMMEDIATE')  # O lock de escrita é pedido aqui: é onde o BUSY aparece
+            try:
+                rowcount = conn.executemany(sql, rows).rowcount
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            return rowcount, rowcount
+        return self._call(sql, run)
+
+    def fetchall(self, sql: str, params: Sequence = ()) -> list:
+        def run():
+            rows = self.connection.execute(sql, params).fetchall()
+            return rows, len(rows)
+        return self._call(sql, run)
+
+    def close(self) -> None:
+        self.disable_profiling()
+        self.connection.close()
+
+
+# ---------------------------------------------------------------------------
+# Demonstração
+# ---------------------------------------------------------------------------
+
+def format_ms(seconds: float) -> str:
+    return f'{seconds * 1000:8.2f}ms'
+
+
+def print_snapshot(snapshot: List[dict]) -> None:
+    print(f"{'comando':<60} {'exec':>6} {'linhas':>8} {'p50':>10} {'p99':>10} {'total':>10} "
+          f"{'BUSY':>5} {'passos VM':>10}")
+    for item in snapshot:
+        statement = item['statement'] if len(item['statement']) <= 60 else item['statement'][:57] + '...'
+        print(f"{statement:<60} {item['calls'] or item['untimed_calls']:>6} {item['rows']:>8} "
+              f"{format_ms(item['p50'])} {format_ms(item['p99'])} {format_ms(item['total'])} "
+              f"{item['busy_retries']:>5} {item['vm_steps']:>10,}")
+
+
+def hold_write_lock(path: str, seconds: float, ready: threading.Event) -> None:
+    """Outra conexão segura o lock de escrita por `seconds` segundos (ex.: um job de manutenção)."""
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute('BEGIN IMMEDIATE')
+    ready.set()
+    time.sleep(seconds)
+    conn.execute('COMMIT')
+    conn.close()
+
+
+def overhead(db: Database, n: int) -> float:
+    """Tempo médio (segundos) de uma consulta curta pelo `Database`."""
+    start = time.perf_counter()
+    for i in range(n):
+        db.fetchall('SELECT preco FROM produto WHERE id = ?', (i % 1000 + 1,))
+    return (time.perf_counter() - start) / n
+
+
+if __name__ == '__main__':
+    N_CALLS = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+
+    path = os.path.join(tempfile.mkdtemp(), 'db.geek')
+    db = Database(path)
+
+    # Custo do perfil: a mesma consulta curta, com o perfil desligado e ligado
+    db.execute('CREATE TABLE produto (id INTEGER PRIMARY KEY, categoria INTEGER, nome TEXT, preco REAL)')
+    db.executemany('INSERT INTO produto (categoria, nome, preco) VALUES (?, ?, ?)',
+                   ((i % 50, f'produto {i}', i * 0.1) for i in range(20_000)))
+    overhead(db, 1000)  # Aquece o cache de comandos compilados
+    plain = overhead(db, N_CALLS)
+    profiler = db.enable_profiling(slow_threshold=0.02,
+                                   on_slow=lambda e: print(f"  [lento] {format_ms(e['seconds']).strip()} {e['sql']}"))
+    profiled = overhead(db, N_CALLS)
+    print(f'Consulta curta: {plain * 1e6:.1f}µs sem perfil, {profiled * 1e6:.1f}µs com perfil '
+          f'(+{(profiled - plain) * 1e6:.1f}µs, {(profiled - plain) / plain:+.0%})\n')
+    profiler.reset()
+
+    print('Comandos lentos (limite de 20ms):')
+    # Literais diferentes caem no mesmo comando normalizado
+    for categoria in range(10):
+        db.fetchall(f'SELECT count(*), avg(preco) FROM produto WHERE categoria = {categoria}')
+    db.fetchall('SELECT * FROM produto WHERE id IN (1, 2, 3)')
+    db.fetchall('SELECT * FROM produto WHERE id IN (4, 5)')
+    # Sem índice em `nome`: varre a tabela a cada busca
+    for i in range(20):
+        db.fetchall('SELECT id FROM produto WHERE nome = ?', (f'produto {i * 997}',))
+    # Junção sem índice: o comando lento do exemplo
+    # (o `+ 0` impede o SQLite de criar um índice automático para a junção)
+    db.fetchall('SELECT count(*) FROM produto a JOIN produto b ON a.preco + 0 = b.preco + 0 '
+                'WHERE a.categoria = ?', (1,))
+
+    # Outra conexão segura o lock de escrita: as escritas esperam e são repetidas
+    ready = threading.Event()
+    holder = threading.Thread(target=hold_write_lock, args=(path, 0.05, ready))
+    holder.start()
+    ready.wait()
+    db.execute("UPDATE produto SET preco = preco * 1.1 WHERE categoria = 3")
+    holder.join()
+    db.connection.execute('ANALYZE')  # Fora dos métodos da classe: visto apenas pelo trace
+
+    print('\nPerfil por comando normalizado (mais caros primeiro):')
+    print_snapshot(profiler.snapshot())
+
+    snapshot = {item['statement']: item for item in profiler.snapshot()}
+    assert snapshot['SELECT count(*), avg(preco) FROM produto WHERE categoria = ?']['calls'] == 10
+    assert snapshot['SELECT * FROM produto WHERE id IN (?)']['rows'] == 5
+    assert snapshot['UPDATE produto SET preco = preco * ? WHERE categoria = ?']['busy_retries'] > 0
+    assert snapshot['ANALYZE']['untimed_calls'] == 1
+    assert profiler.slow_queries, 'a junção sem índice deveria estar no log de comandos lentos'
+    db.close()
+
+# ### Explicação do Perfil de Comandos
+
+# - **Normalização**:
+#   - Literais, parâmetros nomeados e listas `IN (...)` viram `?`: o perfil agrupa por forma do comando,
+# não por valor. O texto normalizado é memorizado, então o custo das regex é pago uma vez por SQL distinto.
+
+# - **Histograma**:
+#   - Baldes fixos de 10µs a ~10s, dobrando a cada balde. Registrar é uma busca binária; a memória é fixa
+# por comando, não por execução, o que permite deixar o perfil ligado em produção.
+
+# - **SQLITE_BUSY**:
+#   - Com `timeout=0` o SQLite devolve o erro na hora em vez de esperar internamente. O `Database` espera
+# com recuo exponencial e conta cada nova tentativa, separando o tempo parado no lock do tempo de execução.
+#   - Só o SQLITE_BUSY simples fora de uma transação aberta é repetido: SQLITE_BUSY_SNAPSHOT, SQLITE_LOCKED
+# e BUSY dentro de um `BEGIN` explícito sobem na hora, pois esperar não os resolve.
+
+# - **Callbacks do sqlite3**:
+#   - O progress handler, chamado a cada `progress_steps` instruções da VM, mede o trabalho do comando.
+#   - O trace callback mostra comandos que não passaram pelos métodos da classe e não foram medidos.
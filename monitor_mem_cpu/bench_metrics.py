@@ -0,0 +1,96 @@
+"""
+Benchmark da latência de coleta do endpoint de métricas sob coletas frequentes.
+
+Sobe o amostrador do serviço (em modo dry-run, com logs e histórico em um diretório temporário)
+e o `MetricsServer` no mesmo laço, e dispara `--clients` processos que coletam `/metrics` em
+conexões keep-alive durante `--duration` segundos. Mostra a latência das coletas (p50/p99/máx),
+a vazão e o efeito sobre o amostrador (duração das fases e rodadas atrasadas).
+
+Uso:
+    python bench_metrics.py --clients 4 --duration 10
+    python bench_metrics.py --clients 1 --poll-interval 0.1
+"""
+import argparse
+import asyncio
+import http.client
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+
+import service_mem_monitor as service
+from metrics import MetricsServer
+from timeseries import TimeSeriesStore
+
+
+def poll(port, duration, poll_interval, results):
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    latencies = []
+    size = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        connection.request("GET", "/metrics")
+        response = connection.getresponse()
+        body = response.read()
+        latencies.append(time.perf_counter() - start)
+        size = len(body)
+        if poll_interval:
+            time.sleep(poll_interval)
+    connection.close()
+    results.put((latencies, size))
+
+
+async def run(args, directory):
+    service.MONITOR_LOG = os.path.join(directory, "monitor_memoria.log")
+    service.RESTART_LOG = os.path.join(directory, "historico_reinicios.txt")
+    service.sample_store = TimeSeriesStore(os.path.join(directory, "amostras"))
+    service.remediation.dry_run = True
+
+    server = await MetricsServer(service.metrics, "127.0.0.1", 0).start()
+    sampler = service.build_sampler()
+    sampler.slow_interval = sampler.fast_interval = args.tick
+    sampler_task = asyncio.create_task(sampler.run())
+    while not service.metrics.body:
+        await asyncio.sleep(0.01)
+
+    results = multiprocessing.Queue()
+    clients = [
+        multiprocessing.Process(target=poll, args=(server.port, args.duration, args.poll_interval, results))
+        for _ in range(args.clients)
+    ]
+    for client in clients:
+        client.start()
+    loop = asyncio.get_running_loop()
+    collected = [await loop.run_in_executor(None, results.get) for _ in clients]
+    for client in clients:
+        client.join()
+    sampler.stop()
+    await sampler_task
+    server.close()
+
+    latencies = sorted(latency for batch, _ in collected for latency in batch)
+    size = collected[0][1]
+    stats = sampler.stats()
+    print(f"{args.clients} cliente(s), {len(latencies)} coletas em {args.duration:.0f}s "
+          f"({len(latencies) / args.duration:,.0f}/s), corpo de {size} bytes")
+    print(f"latência p50 {statistics.median(latencies) * 1e6:,.0f}µs  "
+          f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1e6:,.0f}µs  máx {latencies[-1] * 1e6:,.0f}µs")
+    print(f"amostrador: {stats['ticks']} rodadas, {stats['overruns']} atrasadas, "
+          + ", ".join(f"{phase} máx {duration * 1000:.2f}ms" for phase, duration in stats["max_durations"].items()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latência de coleta do endpoint de métricas")
+    parser.add_argument("--clients", type=int, default=4, help="processos coletando em paralelo")
+    parser.add_argument("--duration", type=float, default=10.0, help="segundos de coleta")
+    parser.add_argument("--poll-interval", type=float, default=0.0, help="pausa entre coletas (0 = sem pausa)")
+    parser.add_argument("--tick", type=float, default=0.5, help="intervalo do amostrador durante o teste")
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(run(args, directory))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,47 @@
-import psutil
+import argparse
+import re
+import sys
+import time
 from datetime import datetime
 
-def main():
+import psutil
+
+import timeseries
+
+# Diretório onde o serviço grava as amostras (ver SAMPLES_DIR em service_mem_monitor.py)
+SAMPLES_DIR = "/home/ubuntu/logs/amostras"
+
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+
+def parse_duration(text):
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([smhdw])", text)
+    if not match:
+        raise argparse.ArgumentTypeError(f"duração inválida: {text} (use 30s, 5m, 2h, 7d, 1w)")
+    return float(match.group(1)) * DURATION_UNITS[match.group(2)]
+
+
+def parse_moment(text):
+    """Instante absoluto (ISO, ex.: 2024-05-07 ou 2024-05-07T13:00) ou relativo a agora (ex.: 7d)."""
+    try:
+        return time.time() - parse_duration(text)
+    except argparse.ArgumentTypeError:
+        pass
+    try:
+        return datetime.fromisoformat(text).timestamp()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"instante inválido: {text}")
+
+
+def format_time(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def format_value(value):
+    return "-" if value is None or value != value else f"{value:.1f}"
+
+
+def show_current():
     # Obtém uso da CPU
     cpu_usage = psutil.cpu_percent(interval=1)
     # Obtém uso da memória
@@ -9,9 +49,71 @@ def main():
 
     # Mensagem com os dados
     log_message = f"[{datetime.now()}] CPU: {cpu_usage}%, Memória: {memory_usage}%"
-    
+
     # Imprime no console
     print(log_message)
 
+
+def show_raw(args):
+    columns = timeseries.read_range(args.dir, args.since, args.until)
+    print("instante             cpu    mem    swap   load")
+    for timestamp, cpu, mem, swap, load in zip(*(columns[field] for field in timeseries.FIELDS)):
+        print(f"{format_time(timestamp)}  {format_value(cpu):>5}  {format_value(mem):>5}  "
+              f"{format_value(swap):>5}  {format_value(load):>5}")
+    return len(columns["timestamp"])
+
+
+def show_downsampled(args):
+    rows = timeseries.downsample(args.dir, args.field, args.every, args.since, args.until)
+    print(f"início               amostras  mín    média  máx    ({args.field})")
+    for bucket, count, low, mean, high in rows:
+        print(f"{format_time(bucket)}  {count:>8}  {low:>5.1f}  {mean:>5.1f}  {high:>5.1f}")
+    return sum(row[1] for row in rows)
+
+
+def show_summary(args):
+    stats = timeseries.summarize(args.dir, args.field, args.since, args.until)
+    if not stats["count"]:
+        print("Nenhuma amostra no intervalo.")
+        return 0
+    print(f"{args.field}: {stats['count']} amostras de {format_time(stats['first'])} a {format_time(stats['last'])}")
+    print(f"  mín {stats['min']:.1f}  média {stats['mean']:.1f}  máx {stats['max']:.1f}")
+    print(f"  p50 {stats['p50']:.1f}  p95 {stats['p95']:.1f}  p99 {stats['p99']:.1f}")
+    return stats["count"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Status atual de CPU/memória ou consulta ao histórico gravado pelo monitor.",
+        epilog="Exemplos: --since 7d --summary | --since 2024-05-07 --until 2024-05-08 --every 1h",
+    )
+    parser.add_argument("--dir", default=SAMPLES_DIR, help="diretório dos segmentos de amostras")
+    parser.add_argument("--since", type=parse_moment, help="início (ISO ou relativo: 30m, 2h, 7d)")
+    parser.add_argument("--until", type=parse_moment, help="fim (ISO ou relativo); padrão: agora")
+    parser.add_argument("--field", choices=timeseries.FIELDS[1:], default="mem")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--every", type=parse_duration, help="agrega em faixas desta duração (ex.: 5m, 1h)")
+    mode.add_argument("--summary", action="store_true", help="estatísticas do intervalo")
+    mode.add_argument("--raw", action="store_true", help="todas as amostras do intervalo")
+    args = parser.parse_args(argv)
+
+    if not (args.every or args.summary or args.raw):
+        if args.since is None and args.until is None:
+            show_current()
+            return 0
+        args.summary = True
+
+    start = time.perf_counter()
+    if args.raw:
+        count = show_raw(args)
+    elif args.every:
+        count = show_downsampled(args)
+    else:
+        count = show_summary(args)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"({count} amostras lidas em {elapsed:.1f}ms)", file=sys.stderr)
+    return 0
+
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,296 @@
+"""
+Coletor central das amostras enviadas pelos monitores da frota (modo push de service_mem_monitor.py).
+
+Recebe lotes binários por UDP e TCP, guarda as amostras de cada host em um `SampleRing` de
+tamanho fixo e responde consultas da frota por HTTP (JSON):
+
+    GET /fleet?field=mem&above=60            hosts com memória acima de 60% (última amostra)
+    GET /fleet?field=cpu&above=90&seconds=300  média dos últimos 5 minutos acima de 90%
+    GET /host/<nome>?seconds=600             amostras recentes de um host
+    GET /stats                               contadores do coletor (recebidos, descartados, memória)
+
+A memória é limitada: no máximo `--max-hosts` hosts, cada um com `--capacity` amostras. Lotes
+inválidos, hosts acima do limite, quadros TCP grandes demais, lotes UDP perdidos (lacunas na
+numeração) e lotes que chegam fora de ordem são contados em vez de acumulados.
+
+Cada início do agente usa uma sessão nova no cabeçalho; ao ver outra sessão o coletor recomeça a
+numeração daquele host. Lotes repetidos (reenvio pela TCP) e amostras mais antigas que a mais
+recente do host não são gravados, então o anel fica sempre em ordem e `latest()` é a mais nova.
+
+Uso:
+    python collector.py --udp 0.0.0.0:9200 --tcp 0.0.0.0:9201 --http 127.0.0.1:9202
+"""
+import argparse
+import asyncio
+import json
+import socket
+import time
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from fleet import FRAME, decode_batch
+from samples import FIELDS, SampleRing
+
+MAX_FRAME = 64 * 1024
+REORDER_WINDOW = 64  # Lacunas mais antigas que isto deixam de esperar o lote atrasado
+
+
+class HostSeries:
+    def __init__(self, capacity):
+        self.ring = SampleRing(capacity)
+        self.last_seen = 0.0  # Relógio do coletor, para não depender do relógio do agente
+        self.session = None
+        self.last_seq = None
+        self.missing = set()  # Números das lacunas recentes (até REORDER_WINDOW lotes atrás)
+        self.lost_batches = 0
+        self.reordered_batches = 0
+        self.samples = 0
+
+
+class Collector:
+    """Séries por host com memória fixa e consultas sobre a frota."""
+
+    def __init__(self, capacity=1024, max_hosts=1000, stale_after=120.0):
+        self.capacity = capacity
+        self.max_hosts = max_hosts
+        self.stale_after = stale_after
+        self.hosts = {}
+        self.counters = {
+            "packets": 0,
+            "samples": 0,
+            "malformed": 0,
+            "rejected_hosts": 0,  # Lotes de hosts novos quando já há max_hosts
+            "rejected_samples": 0,
+            "lost_batches": 0,  # Lacunas na numeração dos lotes (perdas na UDP)
+            "reordered_batches": 0,  # Lotes que chegaram depois de um lote mais novo
+            "duplicate_batches": 0,  # Lotes já recebidos (reenvio) ou atrasados demais
+            "stale_samples": 0,  # Amostras mais antigas que a mais recente do host, não gravadas
+            "agent_restarts": 0,  # Sessões novas de hosts já conhecidos
+            "oversized_frames": 0,
+        }
+
+    def ingest(self, data):
+        try:
+            host, session, seq, records = decode_batch(data)
+        except ValueError:
+            self.counters["malformed"] += 1
+            return
+        series = self.hosts.get(host)
+        if series is None:
+            if len(self.hosts) >= self.max_hosts:
+                self.counters["rejected_hosts"] += 1
+                self.counters["rejected_samples"] += len(records)
+                return
+            series = self.hosts[host] = HostSeries(self.capacity)
+
+        if session != series.session:
+            # Agente reiniciado: a numeração recomeça e as lacunas antigas não serão preenchidas
+            if series.session is not None:
+                self.counters["agent_restarts"] += 1
+            series.session = session
+            series.last_seq = None
+            series.missing.clear()
+        series.last_seen = time.time()
+        self.counters["packets"] += 1
+
+        last = series.last_seq
+        if last is None or seq > last:
+            if last is not None and seq > last + 1:
+                lost = seq - last - 1
+                series.lost_batches += lost
+                self.counters["lost_batches"] += lost
+                series.missing.update(range(max(last + 1, seq - REORDER_WINDOW), seq))
+            series.last_seq = seq
+            series.missing = {gap for gap in series.missing if gap >= seq - REORDER_WINDOW}
+        elif seq in series.missing:
+            # Atrasado (reordenado pela rede): já contado como perdido quando a lacuna apareceu
+            series.missing.discard(seq)
+            series.reordered_batches += 1
+            series.lost_batches -= 1
+            self.counters["reordered_batches"] += 1
+            self.counters["lost_batches"] -= 1
+        else:
+            # Já recebido (reenvio após falha na TCP) ou atrasado além da janela
+            self.counters["duplicate_batches"] += 1
+            return
+
+        # O anel só cresce para a frente: amostras mais antigas que a última gravada são descartadas
+        ring = series.ring
+        newest = ring.value("timestamp", ring.next_seq - 1) if ring.next_seq else float("-inf")
+        stored = 0
+        for record in records:
+            if record[0] <= newest:
+                continue
+            ring.append(*record)
+            newest = record[0]
+            stored += 1
+        series.samples += stored
+        self.counters["samples"] += stored
+        self.counters["stale_samples"] += len(records) - stored
+
+    def _recent(self, series, field, seconds):
+        """Valores de `field` nos últimos `seconds` segundos (pelo instante da amostra), do mais novo ao mais antigo."""
+        ring = series.ring
+        newest = ring.next_seq - 1
+        cutoff = ring.value("timestamp", newest) - seconds
+        values = []
+        for seq in range(newest, ring.oldest_seq - 1, -1):
+            if ring.value("timestamp", seq) < cutoff:
+                break
+            values.append(ring.value(field, seq))
+        return values
+
+    def live_hosts(self):
+        now = time.time()
+        return {host: series for host, series in self.hosts.items()
+                if series.ring.next_seq and now - series.last_seen <= self.stale_after}
+
+    def hosts_above(self, field, threshold, seconds=None):
+        """Hosts ativos cujo valor (último, ou média em `seconds`) está acima de `threshold`."""
+        if seconds is not None and not seconds > 0:
+            raise ValueError("seconds deve ser maior que zero")
+        result = []
+        for host, series in self.live_hosts().items():
+            if seconds:
+                values = self._recent(series, field, seconds)
+                value = sum(values) / len(values)
+            else:
+                value = series.ring.latest()[field]
+            if value > threshold:
+                result.append({"host": host, field: round(value, 2), "last_seen": series.last_seen})
+        result.sort(key=lambda item: item[field], reverse=True)
+        return result
+
+    def host_samples(self, host, seconds=300):
+        if not seconds > 0:
+            raise ValueError("seconds deve ser maior que zero")
+        series = self.hosts.get(host)
+        if series is None or not series.ring.next_seq:
+            return None
+        columns = {field: self._recent(series, field, seconds)[::-1] for field in FIELDS}
+        return {
+            "host": host,
+            "lost_batches": series.lost_batches,
+            "reordered_batches": series.reordered_batches,
+            "samples": [dict(zip(FIELDS, row)) for row in zip(*(columns[field] for field in FIELDS))],
+        }
+
+    def memory_bytes(self):
+        return sum(series.ring.memory_bytes() for series in self.hosts.values())
+
+    def stats(self):
+        return dict(self.counters, hosts=len(self.hosts), live_hosts=len(self.live_hosts()),
+                    ring_bytes=self.memory_bytes())
+
+
+class UdpReceiver(asyncio.DatagramProtocol):
+    def __init__(self, collector):
+        self.collector = collector
+
+    def datagram_received(self, data, addr):
+        self.collector.ingest(data)
+
+
+async def handle_tcp(collector, reader, writer):
+    try:
+        while True:
+            size, = FRAME.unpack(await reader.readexactly(FRAME.size))
+            if size > MAX_FRAME:
+                # Sem como ressincronizar o fluxo: descarta a conexão
+                collector.counters["oversized_frames"] += 1
+                break
+            collector.ingest(await reader.readexactly(size))
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def handle_http(collector, reader, writer):
+    try:
+        request_line = await reader.readline()
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        parts = request_line.decode(errors="replace").split()
+        url = urlsplit(parts[1] if len(parts) > 1 else "/")
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        status, payload = "200 OK", None
+        try:
+            if url.path == "/fleet":
+                field = query.get("field", "mem")
+                if field not in FIELDS[1:]:
+                    raise ValueError(f"campo inválido: {field}")
+                payload = collector.hosts_above(field, float(query.get("above", "0")),
+                                                float(query["seconds"]) if "seconds" in query else None)
+            elif url.path.startswith("/host/"):
+                payload = collector.host_samples(unquote(url.path[len("/host/"):]), float(query.get("seconds", "300")))
+                if payload is None:
+                    status, payload = "404 Not Found", {"error": "host desconhecido"}
+            elif url.path == "/stats":
+                payload = collector.stats()
+            else:
+                status, payload = "404 Not Found", {"error": "use /fleet, /host/<nome> ou /stats"}
+        except ValueError as exc:
+            status, payload = "400 Bad Request", {"error": str(exc)}
+        body = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+    except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+        pass  # ValueError: linha maior que o limite do StreamReader
+    finally:
+        writer.close()
+
+
+def split_address(text):
+    host, _, port = text.rpartition(":")
+    return host or "0.0.0.0", int(port)
+
+
+async def start(collector, udp=None, tcp=None, http=None, receive_buffer=4 * 1024 * 1024):
+    """Abre os receptores configurados; retorna os objetos a fechar e as portas efetivas."""
+    loop = asyncio.get_running_loop()
+    closers, ports = [], {}
+    if udp:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        # Buffer do kernel maior absorve rajadas de muitos agentes enviando ao mesmo tempo
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, receive_buffer)
+        sock.bind(split_address(udp))
+        transport, _ = await loop.create_datagram_endpoint(lambda: UdpReceiver(collector), sock=sock)
+        closers.append(transport)
+        ports["udp"] = sock.getsockname()[1]
+    if tcp:
+        server = await asyncio.start_server(lambda r, w: handle_tcp(collector, r, w), *split_address(tcp))
+        closers.append(server)
+        ports["tcp"] = server.sockets[0].getsockname()[1]
+    if http:
+        server = await asyncio.start_server(lambda r, w: handle_http(collector, r, w), *split_address(http))
+        closers.append(server)
+        ports["http"] = server.sockets[0].getsockname()[1]
+    return closers, ports
+
+
+async def serve(args):
+    collector = Collector(capacity=args.capacity, max_hosts=args.max_hosts, stale_after=args.stale_after)
+    _, ports = await start(collector, args.udp, args.tcp, args.http)
+    print(f"Coletor ouvindo em {ports}; memória máxima das séries: "
+          f"{args.max_hosts * SampleRing(args.capacity).memory_bytes() / 1024 / 1024:.1f}MB")
+    await asyncio.Event().wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Coletor de amostras da frota de monitores")
+    parser.add_argument("--udp", default="0.0.0.0:9200", help="endereço UDP (vazio desativa)")
+    parser.add_argument("--tcp", default="0.0.0.0:9201", help="endereço TCP (vazio desativa)")
+    parser.add_argument("--http", default="127.0.0.1:9202", help="endereço das consultas HTTP")
+    parser.add_argument("--capacity", type=int, default=1024, help="amostras mantidas por host")
+    parser.add_argument("--max-hosts", type=int, default=1000)
+    parser.add_argument("--stale-after", type=float, default=120.0,
+                        help="segundos sem lotes até um host sair das consultas da frota")
+    args = parser.parse_args(argv)
+    asyncio.run(serve(args))
+
+
+if __name__ == "__main__":
+    main()
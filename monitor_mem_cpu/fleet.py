@@ -0,0 +1,167 @@
+import asyncio
+import random
+import socket
+import struct
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+# Formato binário dos lotes enviados ao coletor:
+#   cabeçalho: assinatura, versão, tamanho do nome do host, quantidade de amostras, sessão (número
+#     aleatório escolhido a cada início do agente, para o coletor reconhecer reinícios) e número do lote
+#   nome do host (UTF-8, até 255 bytes)
+#   amostras: instante (float64) e CPU, memória, swap e load (float32) = 24 bytes cada
+MAGIC = b"MS"
+VERSION = 2
+HEADER = struct.Struct("<2sBBHII")
+RECORD = struct.Struct("<dffff")
+# Pela TCP cada lote vai precedido do seu tamanho
+FRAME = struct.Struct("<I")
+# Lotes cabem em um datagrama sem fragmentação em uma rede Ethernet comum
+MAX_DATAGRAM = 1400
+MAX_BATCH = (MAX_DATAGRAM - HEADER.size - 255) // RECORD.size
+
+
+def encode_batch(host, session, seq, records):
+    name = host.encode()[:255]
+    return b"".join([
+        HEADER.pack(MAGIC, VERSION, len(name), len(records), session, seq & 0xFFFFFFFF),
+        name,
+        *(RECORD.pack(*record) for record in records),
+    ])
+
+
+def decode_batch(data):
+    """Retorna (host, sessão, número do lote, [(instante, cpu, mem, swap, load), ...]); ValueError se inválido."""
+    if len(data) < HEADER.size:
+        raise ValueError("lote menor que o cabeçalho")
+    magic, version, name_size, count, session, seq = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("assinatura ou versão desconhecida")
+    offset = HEADER.size + name_size
+    if len(data) != offset + count * RECORD.size:
+        raise ValueError("tamanho do lote não confere com o cabeçalho")
+    host = data[HEADER.size:offset].decode(errors="replace")
+    return host, session, seq, list(RECORD.iter_unpack(data[offset:]))
+
+
+def parse_address(url):
+    """'udp://coletor:9200' ou 'tcp://coletor:9201' -> (protocolo, host, porta)."""
+    parts = urlsplit(url)
+    if parts.scheme not in ("udp", "tcp") or not parts.hostname or not parts.port:
+        raise ValueError(f"endereço inválido: {url} (use udp://host:porta ou tcp://host:porta)")
+    return parts.scheme, parts.hostname, parts.port
+
+
+class SamplePusher:
+    """
+    Envia as amostras do monitor para um coletor central, em lotes binários compactos.
+
+    `add()` só enfileira (fila limitada a `max_pending` amostras; quando cheia, a mais antiga é
+    descartada e contada em `dropped`). `flush()` envia um lote quando há `batch_size` amostras
+    ou quando a mais antiga espera há `max_delay` segundos. `run()` chama `flush()` em uma
+    tarefa própria, para que um coletor lento ou inacessível nunca atrase quem chama `add()`.
+
+    - UDP: cada lote é um datagrama, sem conexão e sem espera; perdas aparecem no coletor como
+      lacunas na numeração dos lotes.
+    - TCP: uma conexão persistente; se ela cair, o lote volta para a fila e o envio é tentado
+      de novo na próxima chamada, após `retry_delay` segundos.
+    """
+
+    def __init__(self, url, host=None, batch_size=20, max_delay=10.0, max_pending=2000, retry_delay=5.0):
+        self.protocol, self.address, self.port = parse_address(url)
+        self.host = host or socket.gethostname()
+        self.batch_size = min(batch_size, MAX_BATCH)
+        self.max_delay = max_delay
+        self.retry_delay = retry_delay
+        self._pending = deque(maxlen=max_pending)  # (instante monotônico de chegada, amostra)
+        self._session = random.getrandbits(32)  # Muda a cada início: o coletor reinicia a numeração
+        self._seq = 0
+        self._transport = None
+        self._writer = None
+        self._retry_at = 0.0
+
+        self.sent_batches = 0
+        self.sent_samples = 0
+        self.dropped = 0
+        self.send_errors = 0
+
+    def add(self, timestamp, cpu, mem, swap, load):
+        if len(self._pending) == self._pending.maxlen:
+            self.dropped += 1
+        self._pending.append((time.monotonic(), (timestamp, cpu, mem, swap, load)))
+
+    def pending(self):
+        return len(self._pending)
+
+    def _due(self, force):
+        if not self._pending:
+            return False
+        return (
+            force
+            or len(self._pending) >= self.batch_size
+            or time.monotonic() - self._pending[0][0] >= self.max_delay
+        )
+
+    async def flush(self, force=False):
+        if time.monotonic() < self._retry_at:
+            return
+        while self._due(force):
+            entries = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+            batch = encode_batch(self.host, self._session, self._seq, [record for _, record in entries])
+            try:
+                await self._send(batch)
+            except (OSError, asyncio.TimeoutError):
+                self.send_errors += 1
+                self._close()
+                self._retry_at = time.monotonic() + self.retry_delay
+                # Devolve o lote à fila; se ela encher enquanto isso, as mais antigas são descartadas
+                free = self._pending.maxlen - len(self._pending)
+                keep = entries[-free:] if free else []
+                self.dropped += len(entries) - len(keep)
+                self._pending.extendleft(reversed(keep))
+                return
+            self._seq += 1
+            self.sent_batches += 1
+            self.sent_samples += len(entries)
+
+    async def run(self, poll_interval=1.0):
+        """Laço de envio em segundo plano; encerre cancelando a tarefa e chamando `close()`."""
+        while True:
+            await self.flush()
+            await asyncio.sleep(poll_interval)
+
+    async def _send(self, batch):
+        loop = asyncio.get_running_loop()
+        if self.protocol == "udp":
+            if self._transport is None:
+                self._transport, _ = await loop.create_datagram_endpoint(
+                    asyncio.DatagramProtocol, remote_addr=(self.address, self.port)
+                )
+            self._transport.sendto(batch)
+            return
+        if self._writer is None:
+            _, self._writer = await asyncio.wait_for(asyncio.open_connection(self.address, self.port), timeout=5)
+        self._writer.write(FRAME.pack(len(batch)) + batch)
+        await asyncio.wait_for(self._writer.drain(), timeout=5)
+
+    def _close(self):
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    async def close(self):
+        await self.flush(force=True)
+        self._close()
+
+    def stats(self):
+        return {
+            "sent_batches": self.sent_batches,
+            "sent_samples": self.sent_samples,
+            "pending": len(self._pending),
+            "dropped": self.dropped,
+            "send_errors": self.send_errors,
+        }
@@ -0,0 +1,144 @@
+import math
+import statistics
+from collections import deque
+
+
+class LinearTrend:
+    """
+    Regressão linear incremental com esquecimento exponencial (peso `exp(-idade / tau)`).
+
+    Mantém apenas as somas ponderadas (Σw, Σwx, Σwy, Σwxx, Σwxy), com a origem de tempo sempre
+    na amostra mais recente: cada atualização é O(1) e o intercepto já é o nível atual estimado.
+    """
+
+    def __init__(self, tau=1800.0):
+        self.tau = tau
+        self.reset()
+
+    def reset(self):
+        self._last = None
+        self._s0 = self._sx = self._sy = self._sxx = self._sxy = 0.0
+        self.count = 0
+        self.span = 0.0
+
+    def update(self, timestamp, value):
+        if self._last is not None:
+            dt = max(timestamp - self._last, 0.0)
+            decay = math.exp(-dt / self.tau)
+            # Envelhece as somas e move a origem para o novo instante (x' = x - dt)
+            s0, sx, sy = self._s0 * decay, self._sx * decay, self._sy * decay
+            sxx, sxy = self._sxx * decay, self._sxy * decay
+            self._sxx = sxx - 2 * dt * sx + dt * dt * s0
+            self._sxy = sxy - dt * sy
+            self._sx = sx - dt * s0
+            self._s0, self._sy = s0, sy
+            self.span += dt
+        self._last = timestamp
+        self._s0 += 1.0
+        self._sy += value
+        self.count += 1
+
+    def fit(self):
+        """(nível atual, inclinação por segundo) ou None com dados insuficientes."""
+        denominator = self._s0 * self._sxx - self._sx * self._sx
+        if self.count < 2 or denominator <= 0:
+            return None
+        slope = (self._s0 * self._sxy - self._sx * self._sy) / denominator
+        return (self._sy - slope * self._sx) / self._s0, slope
+
+
+class RobustTrend:
+    """
+    Estimador de Theil-Sen sobre as últimas `window` amostras: a inclinação é a mediana das
+    inclinações entre todos os pares, e o nível é a mediana dos resíduos. Picos isolados (um
+    processo que aloca e libera) quase não mudam a estimativa. Custo O(window²) por ajuste.
+    """
+
+    def __init__(self, window=60):
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        self._points = deque(maxlen=self.window)
+        self.count = 0
+
+    @property
+    def span(self):
+        return self._points[-1][0] - self._points[0][0] if self._points else 0.0
+
+    def update(self, timestamp, value):
+        self._points.append((timestamp, value))
+        self.count += 1
+
+    def fit(self):
+        points = list(self._points)
+        if len(points) < 2:
+            return None
+        slopes = [
+            (y2 - y1) / (x2 - x1)
+            for i, (x1, y1) in enumerate(points)
+            for x2, y2 in points[i + 1:]
+            if x2 > x1
+        ]
+        if not slopes:
+            return None
+        slope = statistics.median(slopes)
+        last = points[-1][0]
+        level = statistics.median(y - slope * (x - last) for x, y in points)
+        return level, slope
+
+
+class LeakForecaster:
+    """
+    Previsão do tempo até a memória atingir `critical` (%), a partir da tendência das amostras.
+
+    A cada `update()` a tendência é reajustada e `eta` passa a ser os segundos estimados até o
+    nível crítico (None se a memória não está subindo ou faltam dados). `imminent` fica verdadeiro
+    quando `eta` está abaixo de `horizon` em `confirmations` atualizações seguidas, o que evita
+    disparos por uma única oscilação.
+
+    Depois de uma remediação a memória cai e a própria queda torna a inclinação negativa, então
+    não é preciso descartar o histórico; `reset()` existe para quem quiser recomeçar do zero.
+
+    Métodos de ajuste: "linear" (`LinearTrend`, O(1)) ou "robust" (`RobustTrend`, Theil-Sen).
+    """
+
+    def __init__(self, critical=90.0, horizon=900.0, method="linear", tau=1800.0, window=60,
+                 min_span=600.0, min_samples=10, min_slope=0.001 / 60, confirmations=3):
+        self.critical = critical
+        self.horizon = horizon
+        self.method = method
+        self.min_span = min_span
+        self.min_samples = min_samples
+        self.min_slope = min_slope  # Inclinação mínima (pontos por segundo) considerada crescimento
+        self.confirmations = confirmations
+        self.trend = LinearTrend(tau) if method == "linear" else RobustTrend(window)
+        self.level = None
+        self.slope = None
+        self.eta = None
+        self.streak = 0
+
+    @property
+    def imminent(self):
+        return self.streak >= self.confirmations
+
+    def reset(self):
+        self.trend.reset()
+        self.level = self.slope = self.eta = None
+        self.streak = 0
+
+    def update(self, timestamp, value):
+        self.trend.update(timestamp, value)
+        fit = self.trend.fit()
+        self.eta = None
+        if fit is not None:
+            self.level, self.slope = fit
+            if (self.trend.count >= self.min_samples and self.trend.span >= self.min_span
+                    and self.slope > self.min_slope):
+                self.eta = max(0.0, (self.critical - self.level) / self.slope)
+
+        if self.eta is not None and self.eta <= self.horizon:
+            self.streak += 1
+        else:
+            self.streak = 0
+        return self.eta
@@ -0,0 +1,241 @@
+import atexit
+import gzip
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+
+
+class BufferedLogWriter:
+    """
+    Escritor de log com arquivo aberto, buffer em memória e rotação.
+
+    Em vez de abrir, escrever e fechar o arquivo a cada mensagem, as linhas ficam em um buffer
+    e uma thread em segundo plano grava tudo de uma vez quando o buffer passa de
+    `buffer_size` bytes ou quando `flush_interval` segundos se passam.
+
+    Rotação:
+        - por tamanho: quando o arquivo passa de `max_bytes`;
+        - por tempo: quando o dia muda (`rotate_daily`).
+    O segmento antigo é renomeado com data e hora, comprimido com gzip e apenas os
+    `backup_count` mais recentes são mantidos. A compressão roda fora do lock de escrita, para
+    que a rotação não segure as gravações seguintes.
+
+    Se a gravação falhar (disco cheio, permissão), a thread continua viva: as linhas voltam para
+    o buffer e a gravação é tentada de novo no próximo intervalo. O buffer nunca passa de
+    `max_buffer_bytes`; as linhas que não cabem são descartadas e contadas em `dropped_lines`.
+    """
+
+    def __init__(self, path, buffer_size=64 * 1024, flush_interval=5.0,
+                 max_bytes=10 * 1024 * 1024, rotate_daily=True, backup_count=7, compress=True,
+                 max_buffer_bytes=8 * 1024 * 1024):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.max_buffer_bytes = max_buffer_bytes
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.backup_count = backup_count
+        self.compress = compress
+
+        self._buffer = []
+        self._buffered_bytes = 0
+        self._condition = threading.Condition()
+        self._io_lock = threading.Lock()  # Serializa escrita, fsync e rotação
+        self._compress_lock = threading.Lock()  # Serializa compressão e limpeza dos segmentos
+        self._closed = False
+        self._file = None
+        self._opened_day = None
+        self._open()
+
+        # Métricas para observabilidade do próprio escritor
+        self.flushes = 0
+        self.rotations = 0
+        self.bytes_written = 0
+        self.last_flush = time.time()
+        self.write_errors = 0
+        self.dropped_lines = 0
+        self.last_error = None
+
+        self._thread = threading.Thread(target=self._run, name=f"log-writer-{os.path.basename(path)}",
+                                        daemon=True)
+        self._thread.start()
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._opened_day = datetime.now().date()
+
+    def write(self, message):
+        line = f"{message}\n"
+        with self._condition:
+            if self._closed:
+                raise ValueError(f"Log {self.path} já foi fechado")
+            if self._buffered_bytes + len(line) > self.max_buffer_bytes:
+                self.dropped_lines += 1  # Disco travado há muito tempo: não cresce sem limite
+                return
+            self._buffer.append(line)
+            self._buffered_bytes += len(line)
+            if self._buffered_bytes >= self.buffer_size:
+                self._condition.notify()
+
+    def pending_bytes(self):
+        """Bytes ainda no buffer, aguardando gravação (atraso do escritor)."""
+        with self._condition:
+            return self._buffered_bytes
+
+    def _take_buffer(self):
+        with self._condition:
+            lines, self._buffer = self._buffer, []
+            self._buffered_bytes = 0
+        return lines
+
+    def _requeue(self, lines):
+        """Devolve ao início do buffer as linhas que não foram gravadas, respeitando o limite."""
+        with self._condition:
+            free = self.max_buffer_bytes - self._buffered_bytes
+            kept = []
+            for line in reversed(lines):  # Se não couber tudo, mantém as mais recentes do lote
+                if len(line) > free:
+                    break
+                kept.append(line)
+                free -= len(line)
+            self.dropped_lines += len(lines) - len(kept)
+            kept.reverse()
+            self._buffer[:0] = kept
+            self._buffered_bytes += sum(len(line) for line in kept)
+
+    def _write_lines(self, lines, sync=False):
+        rotated = None
+        with self._io_lock:
+            data = "".join(lines)
+            try:
+                if self._file is None:
+                    self._open()  # Uma rotação anterior falhou depois de fechar o arquivo
+                if data:
+                    self._file.write(data)
+                    self._file.flush()
+            except BaseException:
+                self._requeue(lines)
+                raise
+            if data:
+                self.bytes_written += len(data)
+                self.flushes += 1
+            if sync:
+                os.fsync(self._file.fileno())
+            self.last_flush = time.time()
+            if self._should_rotate():
+                rotated = self._rotate()
+        if rotated is not None:
+            self._archive(rotated)
+
+    def flush(self, sync=True):
+        """Grava o buffer imediatamente; com `sync=True` garante que os dados chegaram ao disco."""
+        self._write_lines(self._take_buffer(), sync=sync)
+
+    def _should_rotate(self):
+        if self.max_bytes and self._file.tell() >= self.max_bytes:
+            return True
+        return self.rotate_daily and datetime.now().date() != self._opened_day
+
+    def _rotate(self):
+        """Troca o arquivo (com `_io_lock`); retorna o segmento antigo, a arquivar fora do lock."""
+        self._file.close()
+        self._file = None
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        rotated = f"{self.path}.{stamp}"
+        try:
+            os.replace(self.path, rotated)
+        finally:
+            self._open()
+        self.rotations += 1
+        return rotated
+
+    def _archive(self, rotated):
+        with self._compress_lock:
+            if self.compress:
+                with open(rotated, "rb") as source, gzip.open(f"{rotated}.gz", "wb") as target:
+                    shutil.copyfileobj(source, target)
+                os.remove(rotated)
+            self._remove_old_segments()
+
+    def _remove_old_segments(self):
+        directory = os.path.dirname(self.path) or "."
+        prefix = os.path.basename(self.path) + "."
+        segments = sorted(name for name in os.listdir(directory) if name.startswith(prefix))
+        for name in segments[:-self.backup_count] if self.backup_count else segments:
+            os.remove(os.path.join(directory, name))
+
+    def _run(self):
+        failed = False
+        while True:
+            with self._condition:
+                # Depois de uma falha espera o intervalo inteiro, mesmo com o buffer cheio
+                if not self._closed and (failed or self._buffered_bytes < self.buffer_size):
+                    self._condition.wait(self.flush_interval)
+                closed = self._closed
+            try:
+                self._write_lines(self._take_buffer())
+                failed = False
+            except Exception as exc:
+                failed = True
+                self.write_errors += 1
+                self.last_error = repr(exc)
+            if closed:
+                return
+
+    def close(self):
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        with self._io_lock:
+            if self._file is None:
+                return
+            try:
+                os.fsync(self._file.fileno())
+            finally:
+                self._file.close()
+
+
+# Um escritor por arquivo, compartilhado por todo o processo
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(path, **options):
+    writer = _writers.get(path)
+    if writer is None:
+        with _writers_lock:
+            writer = _writers.get(path)
+            if writer is None:
+                writer = BufferedLogWriter(path, **options)
+                _writers[path] = writer
+    return writer
+
+
+def writers():
+    """Escritores abertos no processo (usado para expor métricas de atraso dos logs)."""
+    return list(_writers.values())
+
+
+def flush_all(sync=True):
+    """Grava todos os buffers no disco (usado antes de reiniciar o servidor)."""
+    for writer in list(_writers.values()):
+        try:
+            writer.flush(sync=sync)
+        except OSError as exc:
+            # Um log inacessível não pode impedir quem chama (ex.: o reboot) de seguir
+            writer.write_errors += 1
+            writer.last_error = repr(exc)
+
+
+def close_all():
+    for writer in list(_writers.values()):
+        writer.close()
+
+
+atexit.register(close_all)
@@ -0,0 +1,124 @@
+import asyncio
+import math
+import time
+
+
+def format_value(value):
+    if value is None:
+        return "NaN"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, float):
+        if math.isnan(value):
+            return "NaN"
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsSnapshot:
+    """
+    Texto no formato de exposição do Prometheus, renderizado uma vez por rodada do amostrador.
+
+    `begin()` abre uma rodada, `gauge`/`counter` acumulam as famílias de métricas e `publish()`
+    troca o corpo pronto (bytes) de uma só vez. Se a montagem de uma rodada falhar no meio, o
+    `begin()` seguinte descarta as famílias parciais, e o corpo publicado continua o anterior.
+    Uma coleta apenas devolve o último corpo publicado: nenhuma leitura do psutil nem
+    formatação acontece por requisição, e quem coleta nunca vê uma rodada pela metade.
+    """
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self._families = []
+        self.body = b""
+        self.published_at = None
+
+    def begin(self):
+        self._families = []
+
+    def _family(self, kind, name, help_text, samples):
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        for labels, value in samples:
+            if labels:
+                rendered = ",".join(f'{key}="{escape_label(label)}"' for key, label in labels.items())
+                lines.append(f"{name}{{{rendered}}} {format_value(value)}")
+            else:
+                lines.append(f"{name} {format_value(value)}")
+        self._families.append("\n".join(lines))
+
+    def gauge(self, name, help_text, value=None, samples=None):
+        """Registra um gauge; `samples` é uma lista de (labels, valor) para séries com labels."""
+        self._family("gauge", name, help_text, samples if samples is not None else [(None, value)])
+
+    def counter(self, name, help_text, value=None, samples=None):
+        self._family("counter", name, help_text, samples if samples is not None else [(None, value)])
+
+    def publish(self):
+        self.body = ("\n".join(self._families) + "\n").encode()
+        self._families = []
+        self.published_at = time.time()
+
+
+class MetricsServer:
+    """
+    Servidor HTTP mínimo em asyncio que expõe `GET /metrics` a partir de um `MetricsSnapshot`.
+
+    Roda no mesmo laço do amostrador, sem threads. Mantém a conexão aberta entre coletas
+    (keep-alive, como faz o Prometheus) e só escuta em `host` (por padrão, apenas localhost).
+    """
+
+    def __init__(self, snapshot, host="127.0.0.1", port=9101):
+        self.snapshot = snapshot
+        self.host = host
+        self.port = port
+        self._server = None
+        self.scrapes = 0
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]  # Porta real quando port=0
+        return self
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                keep_alive = request_line.rstrip().endswith(b"HTTP/1.1")
+                # Cabeçalhos: só interessa saber se o cliente pediu para fechar a conexão
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    if header.lower().startswith(b"connection:"):
+                        keep_alive = b"keep-alive" in header.lower()
+
+                parts = request_line.split()
+                if len(parts) >= 2 and parts[0] == b"GET" and parts[1].split(b"?")[0] == b"/metrics":
+                    status, body = b"200 OK", self.snapshot.body
+                    self.scrapes += 1
+                else:
+                    status, body = b"404 Not Found", b"use GET /metrics\n"
+                writer.write(
+                    b"HTTP/1.1 " + status + b"\r\n"
+                    b"Content-Type: " + MetricsSnapshot.CONTENT_TYPE.encode() + b"\r\n"
+                    b"Content-Length: " + str(len(body)).encode() + b"\r\n"
+                    b"Connection: " + (b"keep-alive" if keep_alive else b"close") + b"\r\n\r\n" + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass  # ValueError: linha maior que o limite do StreamReader
+        finally:
+            writer.close()
+
+    def close(self):
+        if self._server is not None:
+            self._server.close()
@@ -0,0 +1,116 @@
+import time
+
+import psutil
+
+# Atributos lidos de uma só vez por processo_iter (leituras baratas de /proc/<pid>/stat e statm)
+PREFETCH_ATTRS = ["pid", "name", "create_time", "memory_info"]
+
+
+class ProcessTracker:
+    """
+    Atribui o uso de memória aos processos e aponta os maiores responsáveis (top-N).
+
+    A cada chamada de `sample()`:
+
+    1. Percorre todos os processos com `psutil.process_iter(attrs=...)`, que lê os atributos
+       pré-definidos de uma só vez. O RSS de cada processo é comparado com o da amostra anterior.
+    2. Para os `uss_candidates` processos de maior RSS, lê o USS (memória exclusiva do processo)
+       dentro de `proc.oneshot()`. O USS é caro (lê /proc/<pid>/smaps), por isso só os candidatos.
+
+    Os processos ficam em cache entre as amostras, indexados por (pid, create_time), para que
+    um PID reutilizado por outro programa não herde o histórico do anterior.
+
+    A passagem inteira respeita `cpu_budget` segundos de CPU do próprio monitor: ao estourar o
+    limite, a etapa de USS é interrompida (e, no limite, também a varredura), e a amostra é
+    marcada como `truncated`.
+    """
+
+    # Amostras sem ver um processo (em passagens truncadas) antes de removê-lo do cache
+    STALE_AFTER = 10
+
+    def __init__(self, top_n=5, uss_candidates=10, cpu_budget=0.1):
+        self.top_n = top_n
+        self.uss_candidates = uss_candidates
+        self.cpu_budget = cpu_budget
+        self._cache = {}  # (pid, create_time) -> estado da última amostra
+        self._tick = 0
+        self.last_cpu_time = 0.0
+        self.last_truncated = False
+        self.last_process_count = 0
+
+    def sample(self):
+        start = time.process_time()
+        deadline = start + self.cpu_budget
+        truncated = False
+        self._tick += 1
+        seen = {}
+
+        for proc in psutil.process_iter(attrs=PREFETCH_ATTRS, ad_value=None):
+            info = proc.info
+            memory = info["memory_info"]
+            if memory is None:
+                continue
+            key = (info["pid"], info["create_time"])
+            previous = self._cache.get(key)
+            entry = {
+                "pid": info["pid"],
+                "name": info["name"] or "?",
+                "rss": memory.rss,
+                "rss_delta": memory.rss - previous["rss"] if previous else 0,
+                "uss": previous["uss"] if previous else None,
+                "uss_delta": None,
+                "proc": proc,
+                "tick": self._tick,
+            }
+            seen[key] = entry
+            if time.process_time() > deadline:
+                truncated = True
+                break
+
+        # USS apenas para os maiores consumidores, enquanto houver orçamento de CPU
+        candidates = sorted(seen.items(), key=lambda item: item[1]["rss"], reverse=True)
+        for key, entry in candidates[:self.uss_candidates]:
+            if time.process_time() > deadline:
+                truncated = True
+                break
+            try:
+                with entry["proc"].oneshot():
+                    uss = entry["proc"].memory_full_info().uss
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+            previous = self._cache.get(key)
+            if previous and previous["uss"] is not None:
+                entry["uss_delta"] = uss - previous["uss"]
+            entry["uss"] = uss
+
+        # Mantém no cache apenas os processos vivos (processos encerrados saem sozinhos)
+        if not truncated:
+            self._cache = seen
+        else:
+            # Varredura incompleta: quem não foi visto pode estar vivo, mas não fica para sempre
+            self._cache.update(seen)
+            oldest = self._tick - self.STALE_AFTER
+            self._cache = {key: entry for key, entry in self._cache.items() if entry["tick"] > oldest}
+
+        self.last_cpu_time = time.process_time() - start
+        self.last_truncated = truncated
+        self.last_process_count = len(seen)
+        top = [entry for _, entry in candidates[:self.top_n]]
+        return [{k: v for k, v in entry.items() if k not in ("proc", "tick")} for entry in top]
+
+
+def format_mb(value):
+    return "?" if value is None else f"{value / (1024 * 1024):.1f}MB"
+
+
+def format_delta_mb(value):
+    return "" if not value else f" ({value / (1024 * 1024):+.1f}MB)"
+
+
+def format_top(top):
+    """Formata a lista de maiores consumidores em uma linha de log."""
+    return "; ".join(
+        f"{p['name']}[{p['pid']}] RSS {format_mb(p['rss'])}{format_delta_mb(p['rss_delta'])} "
+        f"USS {format_mb(p['uss'])}{format_delta_mb(p['uss_delta'])}"
+        for p in top
+    )
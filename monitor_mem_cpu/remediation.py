@@ -0,0 +1,230 @@
+import asyncio
+import os
+import signal
+import subprocess
+
+import psutil
+
+
+class RemediationStep:
+    """
+    Um degrau da escada de remediação.
+
+    Subclasses implementam `describe(tick)` (o que será feito, usado no log e no modo de teste)
+    e `run(tick)` (a ação em si, síncrona; roda em uma thread para não bloquear o amostrador).
+
+    Atributos:
+        cooldown (float): Segundos mínimos entre duas execuções deste degrau. Em espera, a escada
+            pula para o próximo degrau.
+        settle (float): Segundos aguardados depois da ação antes de verificar se ela resolveu.
+    """
+
+    name = "degrau"
+
+    def __init__(self, cooldown=600.0, settle=30.0):
+        self.cooldown = cooldown
+        self.settle = settle
+        self.last_run = None
+
+    def available(self, tick):
+        """Se o degrau pode ser usado agora (configurado e fora do cool-down)."""
+        return self.last_run is None or tick.timestamp - self.last_run >= self.cooldown
+
+    def describe(self, tick):
+        return self.name
+
+    def run(self, tick):
+        raise NotImplementedError
+
+
+def run_command(command, timeout=60):
+    """Executa um comando sem shell; falhas viram exceção com a saída de erro."""
+    result = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(command)} retornou {result.returncode}: {result.stderr.strip()}")
+
+
+class DropPageCaches(RemediationStep):
+    """
+    Grava o que está pendente e libera page cache, dentries e inodes (`vm.drop_caches=3`).
+
+    O percentual de memória do psutil (`virtual_memory().percent`) é calculado a partir de
+    `available`, que já conta o page cache recuperável como livre. Por isso este degrau quase
+    nunca baixa o percentual, e é esperado que a verificação o dê como "não resolveu": ele é o
+    primeiro por ser barato e sem efeitos colaterais, e só ajuda quando a pressão vem de slab
+    (dentries/inodes) ou de cache que o kernel não estava conseguindo devolver a tempo.
+    """
+
+    name = "limpar caches"
+
+    def describe(self, tick):
+        return "sync; echo 3 > /proc/sys/vm/drop_caches"
+
+    def run(self, tick):
+        os.sync()
+        if os.geteuid() == 0:
+            with open("/proc/sys/vm/drop_caches", "w") as target:
+                target.write("3\n")
+        else:
+            run_command(["sudo", "sh", "-c", "echo 3 > /proc/sys/vm/drop_caches"])
+
+
+class RestartPrograms(RemediationStep):
+    """
+    Reinicia programas do Supervisor nomeados na configuração.
+
+    Sem programas configurados o degrau é pulado, a não ser que `kill_top_process` seja
+    verdadeiro: então encerra (SIGTERM) o processo que mais usa memória, contando que quem o
+    supervisiona o suba de novo. Como esse processo costuma ser justamente o banco ou a aplicação
+    que o servidor existe para rodar, isso só acontece quando pedido explicitamente. Processos em
+    `protected` (e o próprio monitor) nunca são escolhidos.
+    """
+
+    name = "reiniciar programas"
+
+    def __init__(self, programs=(), protected=("systemd", "init", "sshd", "supervisord"),
+                 cooldown=600.0, settle=60.0, kill_top_process=False):
+        super().__init__(cooldown=cooldown, settle=settle)
+        self.programs = list(programs)
+        self.protected = set(protected)
+        self.kill_top_process = kill_top_process
+
+    def _target(self, tick):
+        for process in tick.notes.get("top_processes") or []:
+            if process["pid"] not in (1, os.getpid()) and process["name"] not in self.protected:
+                return process
+        return None
+
+    def available(self, tick):
+        if not super().available(tick):
+            return False
+        return bool(self.programs) or (self.kill_top_process and self._target(tick) is not None)
+
+    def describe(self, tick):
+        if self.programs:
+            return f"supervisorctl restart {' '.join(self.programs)}"
+        target = self._target(tick)
+        return f"SIGTERM em {target['name']}[{target['pid']}]"
+
+    def run(self, tick):
+        if self.programs:
+            run_command(["sudo", "supervisorctl", "restart", *self.programs])
+            return
+        target = self._target(tick)
+        try:
+            process = psutil.Process(target["pid"])
+            if process.name() == target["name"]:  # O PID pode ter sido reutilizado
+                process.send_signal(signal.SIGTERM)
+        except psutil.NoSuchProcess:
+            pass
+
+
+class Reboot(RemediationStep):
+    """
+    Último recurso: executa `action(tick)` (registro do reinício e `sudo reboot`).
+
+    `allowed(tick)`, quando informado, também precisa ser verdadeiro: permite exigir uma condição
+    mais forte para o reboot do que a que aciona os degraus anteriores (por exemplo, a previsão de
+    vazamento pode limpar caches e reiniciar programas, mas só a CPU ociosa confirmada reinicia).
+    """
+
+    name = "reiniciar servidor"
+
+    def __init__(self, action, cooldown=1800.0, settle=300.0, allowed=None):
+        super().__init__(cooldown=cooldown, settle=settle)
+        self.action = action
+        self.allowed = allowed
+
+    def available(self, tick):
+        if not super().available(tick):
+            return False
+        return self.allowed is None or self.allowed(tick)
+
+    def describe(self, tick):
+        return "sudo reboot"
+
+    def run(self, tick):
+        self.action(tick)
+
+
+class RemediationLadder:
+    """
+    Escada de remediação: tenta cada degrau em ordem, do mais barato ao mais drástico.
+
+    `handle(tick, needed)` é chamado a cada rodada do amostrador:
+
+    - com um degrau aguardando (`settle`), nada é feito até o prazo; então `check(tick)` decide se
+      ele resolveu. Se sim, a escada volta ao primeiro degrau; se não, sobe um degrau;
+    - quando `needed` é verdadeiro e nada está aguardando, executa o primeiro degrau disponível a
+      partir do nível atual (degraus em cool-down ou indisponíveis são pulados);
+    - quando o problema some sozinho, a escada volta ao primeiro degrau.
+
+    Em `dry_run` as ações são apenas registradas em `log`, o que permite medir o comportamento
+    da escada (e o tempo de recuperação) sem tocar no servidor.
+    """
+
+    def __init__(self, steps, check, dry_run=False, log=print):
+        self.steps = list(steps)
+        self.check = check
+        self.dry_run = dry_run
+        self.log = log
+        self.level = 0
+        self.pending = None  # (índice do degrau, instante da execução)
+        self.exhausted = False  # Nenhum degrau restante disponível (registrado uma vez)
+        self.counts = {step.name: {"attempts": 0, "successes": 0, "failures": 0, "errors": 0}
+                       for step in self.steps}
+
+    async def handle(self, tick, needed):
+        if self.pending is not None:
+            index, started = self.pending
+            step = self.steps[index]
+            if tick.timestamp - started < step.settle:
+                return
+            self.pending = None
+            if self.check(tick):
+                self.counts[step.name]["successes"] += 1
+                self.log(f"Remediação '{step.name}' resolveu o problema.")
+                self.level = 0
+                return
+            self.counts[step.name]["failures"] += 1
+            self.log(f"Remediação '{step.name}' não resolveu; subindo um degrau.")
+            self.level = min(index + 1, len(self.steps) - 1)
+
+        if not needed:
+            self.level = 0
+            self.exhausted = False
+            return
+
+        for index in range(self.level, len(self.steps)):
+            step = self.steps[index]
+            if step.available(tick):
+                self.exhausted = False
+                await self._execute(index, step, tick)
+                return
+        if not self.exhausted:
+            self.exhausted = True
+            self.log("Remediação necessária, mas nenhum degrau restante está disponível agora.")
+
+    async def _execute(self, index, step, tick):
+        description = step.describe(tick)
+        counts = self.counts[step.name]
+        counts["attempts"] += 1
+        step.last_run = tick.timestamp
+        self.pending = (index, tick.timestamp)
+        if self.dry_run:
+            self.log(f"[dry-run] Remediação '{step.name}': {description}")
+            return
+        self.log(f"Remediação '{step.name}': {description}")
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, step.run, tick)
+        except Exception as exc:
+            # Uma ação que falhou conta como não resolvida: após o `settle` a escada sobe
+            counts["errors"] += 1
+            self.log(f"Remediação '{step.name}' falhou: {exc!r}")
+
+    def stats(self):
+        return {
+            "level": self.level,
+            "pending": self.steps[self.pending[0]].name if self.pending else None,
+            "steps": {name: dict(counts) for name, counts in self.counts.items()},
+        }
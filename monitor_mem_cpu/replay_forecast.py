@@ -0,0 +1,138 @@
+"""
+Bancada de replay para a previsão de vazamento de memória (`forecast.LeakForecaster`).
+
+Alimenta o previsor com séries sintéticas (ou gravadas pelo monitor) e mede, para cada método:
+
+- antecedência: quanto tempo antes de a memória atingir o nível crítico o previsor disparou
+  (séries com vazamento; "perdido" se não disparou antes do cruzamento);
+- falsos positivos: disparos em séries sem vazamento, que nunca chegam ao nível crítico,
+  também como taxa por dia.
+
+Uso:
+    python replay_forecast.py
+    python replay_forecast.py --step 3 --horizon 600
+    python replay_forecast.py --store /home/ubuntu/logs/amostras --since 14
+"""
+import argparse
+import math
+import random
+import time
+
+from forecast import LeakForecaster
+
+HOUR = 3600.0
+
+
+def synthetic_traces(step, seed, critical):
+    """
+    Séries (nome, tem_vazamento, [(instante, memória)], cruzamento) com ruído reproduzível.
+
+    O cruzamento do nível crítico é calculado pela curva sem ruído, para que um pico isolado
+    não conte como o momento em que a memória acabou.
+    """
+    rng = random.Random(seed)
+
+    def build(duration, func, noise=1.0, spikes=0.0):
+        points = []
+        crossing = None
+        t = 0.0
+        while t <= duration:
+            if crossing is None and func(t) >= critical:
+                crossing = t
+            value = func(t) + rng.gauss(0, noise)
+            if spikes and rng.random() < spikes:
+                value += rng.uniform(5, 15)  # Pico de alocação momentâneo
+            points.append((t, min(100.0, max(0.0, value))))
+            t += step
+        return points, crossing
+
+    return [
+        ("vazamento lento (2%/h)", True, *build(30 * HOUR, lambda t: 40 + 2 * t / HOUR)),
+        ("vazamento rápido (20%/h)", True, *build(4 * HOUR, lambda t: 40 + 20 * t / HOUR)),
+        ("vazamento com picos", True, *build(12 * HOUR, lambda t: 40 + 5 * t / HOUR, noise=2.0, spikes=0.02)),
+        ("vazamento tardio", True, *build(16 * HOUR, lambda t: 45 + max(0.0, t - 8 * HOUR) * 8 / HOUR)),
+        ("estável com ruído", False, *build(24 * HOUR, lambda t: 55, noise=3.0)),
+        ("serra (coleta de lixo)", False, *build(24 * HOUR, lambda t: 45 + 30 * ((t % (20 * 60)) / (20 * 60)))),
+        ("degrau de carga", False, *build(24 * HOUR, lambda t: 45 if t < 6 * HOUR else 80)),
+        ("ciclo diário", False, *build(48 * HOUR, lambda t: 55 + 20 * math.sin(2 * math.pi * t / (24 * HOUR)))),
+        ("picos sem vazamento", False, *build(24 * HOUR, lambda t: 60, noise=2.0, spikes=0.05)),
+    ]
+
+
+def stored_trace(directory, since, critical):
+    import timeseries
+    columns = timeseries.read_range(directory, since, None, fields=("timestamp", "mem"))
+    points = [(t, m) for t, m in zip(columns["timestamp"], columns["mem"]) if m == m]
+    crossing = next((t for t, m in points if m >= critical), None)
+    return [("histórico gravado", None, points, crossing)]
+
+
+def replay(points, make_forecaster):
+    """Instantes em que o previsor passou a indicar que o nível crítico está próximo."""
+    forecaster = make_forecaster()
+    triggers = []
+    was_imminent = False
+    for timestamp, value in points:
+        forecaster.update(timestamp, value)
+        if forecaster.imminent and not was_imminent:
+            triggers.append(timestamp)
+        was_imminent = forecaster.imminent
+    return triggers
+
+
+def format_minutes(seconds):
+    return f"{seconds / 60:6.1f}min"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Antecedência e falsos positivos da previsão de vazamento")
+    parser.add_argument("--critical", type=float, default=90.0, help="nível crítico de memória (%%)")
+    parser.add_argument("--horizon", type=float, default=900.0, help="horizonte de disparo (segundos)")
+    parser.add_argument("--step", type=float, default=30.0, help="intervalo das séries sintéticas (segundos)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--store", help="diretório de amostras gravadas pelo monitor (em vez das sintéticas)")
+    parser.add_argument("--since", type=float, default=14.0, help="dias de histórico a reproduzir com --store")
+    args = parser.parse_args(argv)
+
+    if args.store:
+        traces = stored_trace(args.store, time.time() - args.since * 86400, args.critical)
+    else:
+        traces = synthetic_traces(args.step, args.seed, args.critical)
+
+    for method in ("linear", "robust"):
+        print(f"Método {method} (crítico {args.critical:.0f}%, horizonte {format_minutes(args.horizon).strip()}):")
+        false_positives = 0
+        negative_days = 0.0
+        leads = []
+        started = time.perf_counter()
+        updates = 0
+        for name, leaking, points, crossing in traces:
+            triggers = replay(points, lambda: LeakForecaster(args.critical, args.horizon, method=method))
+            updates += len(points)
+            days = (points[-1][0] - points[0][0]) / 86400 if points else 0.0
+            if leaking is False:
+                false_positives += len(triggers)
+                negative_days += days
+                print(f"  {name:<26} {len(triggers)} disparo(s) sem vazamento")
+                continue
+            early = [t for t in triggers if crossing is None or t <= crossing]
+            if crossing is None:
+                print(f"  {name:<26} nível crítico não atingido; {len(triggers)} disparo(s)")
+            elif early:
+                lead = crossing - early[0]
+                leads.append(lead)
+                print(f"  {name:<26} disparou {format_minutes(lead)} antes do nível crítico")
+            else:
+                print(f"  {name:<26} perdido (nenhum disparo antes do nível crítico)")
+        elapsed = time.perf_counter() - started
+        if leads:
+            print(f"  antecedência média {format_minutes(sum(leads) / len(leads)).strip()}, "
+                  f"mínima {format_minutes(min(leads)).strip()}")
+        if negative_days:
+            print(f"  falsos positivos: {false_positives} em {negative_days:.1f} dias "
+                  f"({false_positives / negative_days:.2f}/dia)")
+        print(f"  custo: {elapsed / max(updates, 1) * 1e6:.1f}µs por amostra\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import asyncio
+import inspect
+import time
+
+
+class Tick:
+    """
+    Dados de uma rodada do amostrador, passados de estágio em estágio.
+
+    Atributos:
+        seq (int): Número da rodada.
+        timestamp (float): Instante (epoch) do início da rodada.
+        elapsed (float): Segundos desde a rodada anterior (0 na primeira).
+        values (dict): Leituras feitas pelos estágios de amostragem.
+        alert (bool): Algum avaliador considerou o sistema perto dos limites (amostragem rápida).
+        decision (str | None): Ação pedida pelos avaliadores (ex.: "remediate").
+        notes (dict): Informações extras que um estágio deixa para os seguintes.
+    """
+
+    __slots__ = ("seq", "timestamp", "elapsed", "values", "alert", "decision", "notes")
+
+    def __init__(self, seq, timestamp, elapsed):
+        self.seq = seq
+        self.timestamp = timestamp
+        self.elapsed = elapsed
+        self.values = {}
+        self.alert = False
+        self.decision = None
+        self.notes = {}
+
+
+class AsyncSampler:
+    """
+    Amostrador contínuo em asyncio, composto por três fases de estágios: amostrar, avaliar e agir.
+
+    Cada estágio é uma função `stage(tick)`, síncrona ou `async`, que lê e preenche o `Tick`.
+    As fases rodam em ordem a cada rodada; um estágio que levanta exceção é reportado a
+    `on_error` e não interrompe os demais nem o laço.
+
+    O intervalo é adaptativo: `slow_interval` enquanto o sistema está saudável e `fast_interval`
+    quando algum avaliador marca `tick.alert`. O próximo instante é calculado a partir do início
+    da rodada, então o tempo gasto nos estágios não se acumula como atraso. A espera é um
+    `asyncio.wait_for` sobre o evento de parada: o laço não bloqueia e `stop()` tem efeito imediato.
+    """
+
+    PHASES = ("sample", "evaluate", "act")
+
+    def __init__(self, samplers=(), evaluators=(), actors=(), slow_interval=30.0, fast_interval=2.0,
+                 on_error=None):
+        self.stages = {"sample": list(samplers), "evaluate": list(evaluators), "act": list(actors)}
+        self.slow_interval = slow_interval
+        self.fast_interval = fast_interval
+        self.on_error = on_error
+        self._stop = None
+        self.last_tick = None
+
+        # Métricas do próprio amostrador
+        self.ticks = 0
+        self.overruns = 0  # Rodadas que levaram mais que o intervalo seguinte
+        self.errors = 0
+        self.last_durations = {phase: 0.0 for phase in self.PHASES}
+        self.max_durations = {phase: 0.0 for phase in self.PHASES}
+        self.last_interval = slow_interval
+
+    def add_stage(self, phase, stage):
+        self.stages[phase].append(stage)
+
+    async def _run_phase(self, phase, tick):
+        start = time.perf_counter()
+        for stage in self.stages[phase]:
+            try:
+                result = stage(tick)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as exc:
+                self.errors += 1
+                if self.on_error is not None:
+                    self.on_error(stage, exc)
+        duration = time.perf_counter() - start
+        self.last_durations[phase] = duration
+        self.max_durations[phase] = max(self.max_durations[phase], duration)
+
+    async def run_once(self, previous_timestamp=None):
+        now = time.time()
+        tick = Tick(self.ticks, now, now - previous_timestamp if previous_timestamp else 0.0)
+        for phase in self.PHASES:
+            await self._run_phase(phase, tick)
+        self.ticks += 1
+        self.last_tick = tick
+        return tick
+
+    async def run(self):
+        self._stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        previous = None
+        while not self._stop.is_set():
+            started = loop.time()
+            tick = await self.run_once(previous)
+            previous = tick.timestamp
+
+            interval = self.fast_interval if tick.alert else self.slow_interval
+            self.last_interval = interval
+            remaining = started + interval - loop.time()
+            if remaining <= 0:
+                self.overruns += 1
+                remaining = 0
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self):
+        if self._stop is not None:
+            self._stop.set()
+
+    def stats(self):
+        return {
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "errors": self.errors,
+            "interval": self.last_interval,
+            "last_durations": dict(self.last_durations),
+            "max_durations": dict(self.max_durations),
+        }
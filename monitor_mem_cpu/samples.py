@@ -0,0 +1,284 @@
+import math
+from array import array
+from collections import deque
+
+# Colunas de cada amostra, na ordem usada por SampleRing.append
+FIELDS = ("timestamp", "cpu", "mem", "swap", "load")
+
+
+class SampleRing:
+    """
+    Buffer circular de amostras com memória fixa.
+
+    Cada coluna é um `array('d')` pré-alocado com `capacity` posições. As amostras recebem um
+    número de sequência crescente; a amostra `seq` fica na posição `seq % capacity`. Quando o
+    buffer enche, a amostra mais antiga é sobrescrita, então a memória não cresce, não importa
+    por quanto tempo o monitor rode.
+    """
+
+    def __init__(self, capacity=2048):
+        self.capacity = capacity
+        self.columns = {name: array("d", bytes(8 * capacity)) for name in FIELDS}
+        self.next_seq = 0  # Sequência que a próxima amostra receberá
+
+    def __len__(self):
+        return min(self.next_seq, self.capacity)
+
+    @property
+    def oldest_seq(self):
+        return max(0, self.next_seq - self.capacity)
+
+    def append(self, timestamp, cpu, mem, swap, load):
+        seq = self.next_seq
+        index = seq % self.capacity
+        columns = self.columns
+        columns["timestamp"][index] = timestamp
+        columns["cpu"][index] = cpu
+        columns["mem"][index] = mem
+        columns["swap"][index] = swap
+        columns["load"][index] = load
+        self.next_seq = seq + 1
+        return seq
+
+    def value(self, field, seq):
+        return self.columns[field][seq % self.capacity]
+
+    def latest(self):
+        if not self.next_seq:
+            return None
+        index = (self.next_seq - 1) % self.capacity
+        return {name: column[index] for name, column in self.columns.items()}
+
+    def iter_range(self, field, start_seq=None):
+        """Percorre os valores de uma coluna, do mais antigo (ou `start_seq`) ao mais recente."""
+        start = self.oldest_seq if start_seq is None else max(start_seq, self.oldest_seq)
+        column = self.columns[field]
+        for seq in range(start, self.next_seq):
+            yield column[seq % self.capacity]
+
+    def memory_bytes(self):
+        return sum(column.itemsize * len(column) for column in self.columns.values())
+
+
+class Ewma:
+    """
+    Média móvel exponencial ponderada pelo tempo.
+
+    O peso de cada amostra depende do intervalo desde a anterior (`1 - exp(-dt / tau)`),
+    então a média continua correta mesmo quando o intervalo de amostragem varia.
+    """
+
+    def __init__(self, tau_seconds):
+        self.tau = tau_seconds
+        self.value = None
+        self._last_ts = None
+
+    def update(self, timestamp, value):
+        if self.value is None:
+            self.value = value
+        else:
+            dt = max(timestamp - self._last_ts, 0.0)
+            alpha = 1.0 - math.exp(-dt / self.tau)
+            self.value += alpha * (value - self.value)
+        self._last_ts = timestamp
+        return self.value
+
+
+class WindowStats:
+    """
+    Estatísticas de uma coluna sobre uma janela de tempo deslizante, atualizadas em O(1) por amostra.
+
+    - mínimo e máximo: deques monotônicas de números de sequência (O(1) amortizado);
+    - percentis: histograma de `bins` faixas entre `low` e `high` (custo fixo por consulta);
+    - inclinação: regressão linear com somas acumuladas (Σx, Σy, Σxy, Σx²), em unidades por segundo.
+
+    As somas são recalculadas a partir do buffer a cada `capacity` amostras para que erros de
+    ponto flutuante não se acumulem em execuções longas.
+    """
+
+    def __init__(self, ring, field, window_seconds, low=0.0, high=100.0, bins=1000):
+        self.ring = ring
+        self.field = field
+        self.window = window_seconds
+        self.low = low
+        self.high = high
+        self.bins = bins
+        self._bin_width = (high - low) / bins
+        self._histogram = array("l", bytes(array("l").itemsize * bins))
+        self._min = deque()
+        self._max = deque()
+        self._tail = 0  # Sequência da amostra mais antiga dentro da janela
+        self._origin = None  # Referência de tempo para a regressão (precisão numérica)
+        self._reset_sums()
+        self._since_rebuild = 0
+
+    def _reset_sums(self):
+        self.count = 0
+        self._sx = self._sy = self._sxy = self._sxx = 0.0
+
+    def _bin(self, value):
+        index = int((value - self.low) / self._bin_width)
+        return min(max(index, 0), self.bins - 1)
+
+    def _add(self, seq):
+        ring = self.ring
+        x = ring.value("timestamp", seq) - self._origin
+        y = ring.value(self.field, seq)
+        self.count += 1
+        self._sx += x
+        self._sy += y
+        self._sxy += x * y
+        self._sxx += x * x
+        self._histogram[self._bin(y)] += 1
+
+        column = ring.columns[self.field]
+        capacity = ring.capacity
+        while self._min and column[self._min[-1] % capacity] >= y:
+            self._min.pop()
+        self._min.append(seq)
+        while self._max and column[self._max[-1] % capacity] <= y:
+            self._max.pop()
+        self._max.append(seq)
+
+    def _remove(self, seq):
+        ring = self.ring
+        x = ring.value("timestamp", seq) - self._origin
+        y = ring.value(self.field, seq)
+        self.count -= 1
+        self._sx -= x
+        self._sy -= y
+        self._sxy -= x * y
+        self._sxx -= x * x
+        self._histogram[self._bin(y)] -= 1
+        if self._min and self._min[0] == seq:
+            self._min.popleft()
+        if self._max and self._max[0] == seq:
+            self._max.popleft()
+
+    def _rebuild_sums(self):
+        self._origin = self.ring.value("timestamp", self._tail)
+        self._sx = self._sy = self._sxy = self._sxx = 0.0
+        for seq in range(self._tail, self.ring.next_seq):
+            x = self.ring.value("timestamp", seq) - self._origin
+            y = self.ring.value(self.field, seq)
+            self._sx += x
+            self._sy += y
+            self._sxy += x * y
+            self._sxx += x * x
+        self._since_rebuild = 0
+
+    def before_append(self):
+        """
+        Remove da janela a amostra que o próximo `append` vai sobrescrever no buffer.
+
+        Deve ser chamado antes de `SampleRing.append`, enquanto o valor antigo ainda está lá.
+        """
+        overwritten = self.ring.next_seq - self.ring.capacity
+        while self.count and self._tail <= overwritten:
+            self._remove(self._tail)
+            self._tail += 1
+
+    def push(self, seq):
+        """Inclui a amostra `seq` (já gravada no buffer) e remove as que saíram da janela de tempo."""
+        if self._origin is None or not self.count:
+            self._origin = self.ring.value("timestamp", seq)
+            self._tail = seq
+        now = self.ring.value("timestamp", seq)
+        while self._tail < seq and self.ring.value("timestamp", self._tail) < now - self.window:
+            self._remove(self._tail)
+            self._tail += 1
+        self._add(seq)
+
+        self._since_rebuild += 1
+        if self._since_rebuild >= self.ring.capacity:
+            self._rebuild_sums()
+
+    @property
+    def minimum(self):
+        return self.ring.value(self.field, self._min[0]) if self._min else None
+
+    @property
+    def maximum(self):
+        return self.ring.value(self.field, self._max[0]) if self._max else None
+
+    @property
+    def mean(self):
+        return self._sy / self.count if self.count else None
+
+    @property
+    def covered_seconds(self):
+        """Intervalo de tempo efetivamente coberto pelas amostras da janela."""
+        if not self.count:
+            return 0.0
+        return self.ring.value("timestamp", self.ring.next_seq - 1) - self.ring.value("timestamp", self._tail)
+
+    def percentile(self, p):
+        """
+        Percentil aproximado pelo limite inferior da faixa do histograma.
+
+        Com o padrão de 1000 faixas entre 0 e 100%, o erro é menor que 0,1 ponto percentual.
+        """
+        if not self.count:
+            return None
+        target = max(1, math.ceil(self.count * p / 100.0))
+        seen = 0
+        for index, amount in enumerate(self._histogram):
+            seen += amount
+            if seen >= target:
+                return self.low + index * self._bin_width
+        return self.high
+
+    def slope(self):
+        """Inclinação da regressão linear (unidades por segundo); None com menos de 2 amostras."""
+        n = self.count
+        if n < 2:
+            return None
+        denominator = n * self._sxx - self._sx * self._sx
+        if denominator <= 0:
+            return 0.0
+        return (n * self._sxy - self._sx * self._sy) / denominator
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "min": self.minimum,
+            "max": self.maximum,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "slope_per_min": None if self.slope() is None else self.slope() * 60,
+        }
+
+
+class RollingMonitor:
+    """
+    Junta o buffer circular, as EWMAs e as janelas de estatísticas de cada métrica.
+
+    A memória usada é fixa: `capacity` amostras por coluna, mais um histograma e duas deques
+    (limitadas pela capacidade) por janela.
+    """
+
+    def __init__(self, capacity=2048, window_seconds=300, ewma_tau=60):
+        self.ring = SampleRing(capacity)
+        self.ewma = {name: Ewma(ewma_tau) for name in FIELDS[1:]}
+        self.windows = {
+            "cpu": WindowStats(self.ring, "cpu", window_seconds),
+            "mem": WindowStats(self.ring, "mem", window_seconds),
+            "swap": WindowStats(self.ring, "swap", window_seconds),
+            "load": WindowStats(self.ring, "load", window_seconds, low=0.0, high=64.0, bins=256),
+        }
+
+    def add(self, timestamp, cpu, mem, swap, load):
+        for window in self.windows.values():
+            window.before_append()
+        seq = self.ring.append(timestamp, cpu, mem, swap, load)
+        for name, value in (("cpu", cpu), ("mem", mem), ("swap", swap), ("load", load)):
+            self.ewma[name].update(timestamp, value)
+            self.windows[name].push(seq)
+        return seq
+
+    def summary(self):
+        return {
+            name: dict(window.summary(), ewma=self.ewma[name].value)
+            for name, window in self.windows.items()
+        }
@@ -1,77 +1,236 @@
-from rocketry import Rocketry
-from rocketry.conds import daily
+import asyncio
 import psutil
 import os
 import time
 from datetime import datetime
 
-# Configuração do Rocketry
-app = Rocketry()
+import log_writer
+from fleet import SamplePusher
+from forecast import LeakForecaster
+from metrics import MetricsServer, MetricsSnapshot
+from processes import ProcessTracker, format_top
+from remediation import DropPageCaches, Reboot, RemediationLadder, RestartPrograms
+from sampler import AsyncSampler
+from samples import RollingMonitor
+from timeseries import TimeSeriesStore
 
 # Diretórios e arquivos de log
 LOG_DIR = "/home/ubuntu/logs"
 MONITOR_LOG = os.path.join(LOG_DIR, "monitor_memoria.log")
 RESTART_LOG = os.path.join(LOG_DIR, "historico_reinicios.txt")
+SAMPLES_DIR = os.path.join(LOG_DIR, "amostras")  # Histórico binário (consultado por check_status_manual.py)
+SAMPLES_RETENTION_DAYS = 90  # Dias de histórico binário mantidos
 
 # Limites configuráveis
 CPU_MIN_THRESHOLD = 1  # Percentual mínimo de utilização da CPU
 MEMORY_MAX_THRESHOLD = 60  # Percentual mínimo de memória para iniciar monitoramento
-CPU_CHECK_INTERVAL = 3  # Intervalo de checagem (em segundos) quando memória está alta
 LOW_CPU_DURATION = 30  # Tempo acumulado (em segundos) para reiniciar o servidor
 
+# Intervalo adaptativo do amostrador
+SLOW_INTERVAL = 30  # Intervalo (em segundos) enquanto o sistema está saudável
+FAST_INTERVAL = 3  # Intervalo (em segundos) perto dos limites
+NEAR_THRESHOLD_MARGIN = 10  # Pontos percentuais abaixo de MEMORY_MAX_THRESHOLD que já aceleram a amostragem
+
+# Estatísticas móveis usadas para confirmar a decisão de reinício. Com o monitor contínuo a janela
+# (em segundos) cobre a sequência de CPU baixa mais uma amostra rápida
+ROLLING_WINDOW = LOW_CPU_DURATION + FAST_INTERVAL
+ROLLING_CAPACITY = 2048  # Amostras mantidas em memória (tamanho fixo)
+RESTART_CPU_PERCENTILE = 95  # Percentil da CPU que precisa ficar abaixo de CPU_MIN_THRESHOLD
+
+# Configuração da escrita dos logs
+LOG_BUFFER_SIZE = 64 * 1024  # Bytes acumulados em memória antes de gravar
+LOG_FLUSH_INTERVAL = 10  # Intervalo máximo (em segundos) entre gravações
+LOG_MAX_BYTES = 10 * 1024 * 1024  # Tamanho máximo de cada arquivo antes da rotação
+LOG_BACKUP_COUNT = 14  # Quantidade de segmentos antigos (comprimidos) mantidos
+
+# Atribuição da memória aos processos
+TOP_PROCESSES = 5  # Quantidade de maiores consumidores registrados em cada amostra
+USS_CANDIDATES = 10  # Processos de maior RSS que têm o USS (memória exclusiva) medido
+PROCESS_CPU_BUDGET = 0.1  # Segundos de CPU que a varredura de processos pode gastar por amostra
+
+# Escada de remediação: limpar caches -> reiniciar programas -> reiniciar o servidor
+REMEDIATION_DRY_RUN = os.environ.get("MONITOR_DRY_RUN") == "1"  # Apenas registra as ações, sem executá-las
+SUPERVISOR_PROGRAMS = []  # Programas do Supervisor a reiniciar (vazio: degrau pulado, salvo KILL_TOP_PROCESS)
+KILL_TOP_PROCESS = False  # Sem programas configurados, encerra (SIGTERM) o maior consumidor de memória
+# A limpeza de caches raramente baixa o percentual medido (que já desconta o cache recuperável):
+# espera-se que ela seja dada como "não resolveu" e a escada siga para o próximo degrau
+DROP_CACHES_COOLDOWN = 600  # Segundos mínimos entre duas limpezas de cache
+DROP_CACHES_SETTLE = 15  # Segundos aguardados antes de verificar o efeito da limpeza
+PROGRAMS_COOLDOWN = 900  # Segundos mínimos entre dois reinícios de programas
+PROGRAMS_SETTLE = 60  # Segundos aguardados antes de verificar o efeito do reinício dos programas
+REBOOT_COOLDOWN = 3600  # Segundos mínimos entre dois reboots (evita laços de reinício)
+
+# Previsão de vazamento: remedia antes de a memória chegar ao nível crítico (avaliada com replay_forecast.py)
+FORECAST_ENABLED = True
+FORECAST_CRITICAL = 90  # Percentual de memória considerado crítico
+FORECAST_HORIZON = 900  # Remedia quando a previsão para o nível crítico fica abaixo deste tempo (segundos)
+FORECAST_METHOD = "linear"  # "linear" (O(1) por amostra) ou "robust" (Theil-Sen, resiste a picos)
+FORECAST_TAU = 1800  # Segundos de "memória" da regressão linear (peso exp(-idade / tau))
+
+# Envio das amostras a um coletor central (collector.py), ex.: udp://coletor:9200 ou tcp://coletor:9201
+PUSH_URL = os.environ.get("MONITOR_PUSH_URL")  # Vazio desativa o envio
+PUSH_BATCH_SIZE = 20  # Amostras por lote
+PUSH_MAX_DELAY = 10  # Segundos máximos que uma amostra espera na fila antes do envio
+PUSH_MAX_PENDING = 2000  # Amostras mantidas na fila enquanto o coletor está inacessível
+
+# Endpoint de métricas (formato Prometheus), servido a partir do snapshot da última rodada
+METRICS_ENABLED = True
+METRICS_HOST = "127.0.0.1"  # Apenas local; exponha por um proxy se precisar coletar de fora
+METRICS_PORT = int(os.environ.get("MONITOR_METRICS_PORT", "9101"))
+
+process_tracker = ProcessTracker(
+    top_n=TOP_PROCESSES, uss_candidates=USS_CANDIDATES, cpu_budget=PROCESS_CPU_BUDGET
+)
+sample_store = TimeSeriesStore(SAMPLES_DIR, retention_days=SAMPLES_RETENTION_DAYS)
+pusher = SamplePusher(
+    PUSH_URL, batch_size=PUSH_BATCH_SIZE, max_delay=PUSH_MAX_DELAY, max_pending=PUSH_MAX_PENDING
+) if PUSH_URL else None
+rolling = RollingMonitor(capacity=ROLLING_CAPACITY, window_seconds=ROLLING_WINDOW)
+forecaster = LeakForecaster(
+    critical=FORECAST_CRITICAL, horizon=FORECAST_HORIZON, method=FORECAST_METHOD, tau=FORECAST_TAU
+)
+metrics = MetricsSnapshot()
+
+# Estado atual do monitor, atualizado a cada rodada
+status = {
+    "low_cpu_seconds": 0.0,  # Tempo contínuo com CPU baixa e memória alta
+}
+
 # Função para registrar mensagens no log
 def write_to_log(file_path, message):
-    with open(file_path, "a") as log_file:
-        log_file.write(f"{message}\n")
+    log_writer.get_writer(
+        file_path,
+        buffer_size=LOG_BUFFER_SIZE,
+        flush_interval=LOG_FLUSH_INTERVAL,
+        max_bytes=LOG_MAX_BYTES,
+        backup_count=LOG_BACKUP_COUNT,
+    ).write(message)
 
-# Função para verificar o uso de memória
-def is_memory_high():
-    memory_usage = psutil.virtual_memory().percent
-    log_message = f"[{datetime.now()}] Utilização de Memória: {memory_usage}%"
+def log(message):
+    log_message = f"[{datetime.now()}] {message}"
     print(log_message)
     write_to_log(MONITOR_LOG, log_message)
-    return memory_usage >= MEMORY_MAX_THRESHOLD
-
-# Função para monitorar CPU e memória
-def monitor_system():
-    low_cpu_time = 0
-
-    while True:
-        # Obtém uso da CPU
-        cpu_usage = psutil.cpu_percent(interval=1)
-        # Obtém uso da memória
-        memory_usage = psutil.virtual_memory().percent
-
-        log_message = (
-            f"[{datetime.now()}] Utilização da CPU: {cpu_usage}%, "
-            f"Utilização de Memória: {memory_usage}%"
-        )
-        print(log_message)
-        write_to_log(MONITOR_LOG, log_message)
-
-        # Verifica se ambas as condições estão atendidas
-        if cpu_usage <= CPU_MIN_THRESHOLD and memory_usage >= MEMORY_MAX_THRESHOLD:
-            low_cpu_time += CPU_CHECK_INTERVAL
-            log_message = (
-                f"[{datetime.now()}] CPU abaixo do limite e memória acima do limite "
-                f"por {low_cpu_time} segundos."
-            )
-            print(log_message)
-            write_to_log(MONITOR_LOG, log_message)
-
-            # Reinicia o sistema se as condições persistirem
-            if low_cpu_time >= LOW_CPU_DURATION:
-                log_restart(cpu_usage, memory_usage)
-                restart_system()
-        else:
-            # Reseta o contador caso as condições não sejam atendidas
-            low_cpu_time = 0
-
-        # Pausa antes da próxima verificação
-        time.sleep(CPU_CHECK_INTERVAL)
+
+# ---------------------------------------------------------------------------
+# Estágio de amostragem
+# ---------------------------------------------------------------------------
+
+# Lê CPU, memória, swap e load sem bloquear: cpu_percent(interval=None) retorna o uso
+# médio desde a chamada anterior, ou seja, desde a rodada anterior
+def read_system(tick):
+    cpu_usage = psutil.cpu_percent(interval=None)
+    memory_usage = psutil.virtual_memory().percent
+    swap_usage = psutil.swap_memory().percent
+    load_average = os.getloadavg()[0]
+    tick.values.update(cpu=cpu_usage, mem=memory_usage, swap=swap_usage, load=load_average)
+    rolling.add(tick.timestamp, cpu_usage, memory_usage, swap_usage, load_average)
+    sample_store.append(tick.timestamp, cpu_usage, memory_usage, swap_usage, load_average)
+
+# Só enfileira a amostra para o coletor: o envio roda na tarefa pusher.run() (ver main) e nunca
+# bloqueia a rodada, mesmo com o coletor fora do ar
+def push_sample(tick):
+    values = tick.values
+    pusher.add(tick.timestamp, values["cpu"], values["mem"], values["swap"], values["load"])
+
+# ---------------------------------------------------------------------------
+# Estágio de avaliação
+# ---------------------------------------------------------------------------
+
+# Função que confirma o reinício com as estatísticas da janela, e não com uma única leitura
+def restart_condition_met(rolling):
+    cpu = rolling.windows["cpu"]
+    mem = rolling.windows["mem"]
+    if cpu.covered_seconds < LOW_CPU_DURATION:
+        return False
+    return (
+        cpu.percentile(RESTART_CPU_PERCENTILE) <= CPU_MIN_THRESHOLD
+        and mem.minimum >= MEMORY_MAX_THRESHOLD
+        and mem.slope() >= 0
+    )
+
+def evaluate_thresholds(tick):
+    cpu_usage = tick.values["cpu"]
+    memory_usage = tick.values["mem"]
+    tick.alert = memory_usage >= MEMORY_MAX_THRESHOLD - NEAR_THRESHOLD_MARGIN
+
+    # Verifica se ambas as condições estão atendidas
+    if cpu_usage <= CPU_MIN_THRESHOLD and memory_usage >= MEMORY_MAX_THRESHOLD:
+        # O intervalo é variável, então a sequência é medida pelo tempo real entre as rodadas
+        status["low_cpu_seconds"] += tick.elapsed
+        # Pede a remediação se as condições persistirem e forem confirmadas pela janela
+        if status["low_cpu_seconds"] >= LOW_CPU_DURATION and restart_condition_met(rolling):
+            tick.decision = "remediate"
+            tick.notes["low_cpu_confirmed"] = True
+    else:
+        # Reseta o contador caso as condições não sejam atendidas
+        status["low_cpu_seconds"] = 0.0
+
+# Estima quando a memória chega ao nível crítico; acelera a amostragem com a previsão a até dois
+# horizontes e pede a remediação quando ela fica abaixo do horizonte por algumas rodadas seguidas.
+# Sozinha, a previsão não chega ao reboot: ele exige a CPU ociosa confirmada (ver `reboot_allowed`)
+def forecast_memory(tick):
+    eta = forecaster.update(tick.timestamp, tick.values["mem"])
+    tick.notes["eta"] = eta
+    if eta is not None and eta <= 2 * FORECAST_HORIZON:
+        tick.alert = True
+    if forecaster.imminent:
+        tick.decision = "remediate"
+
+# ---------------------------------------------------------------------------
+# Estágio de ação
+# ---------------------------------------------------------------------------
+
+def log_sample(tick):
+    values = tick.values
+    cpu_stats = rolling.windows["cpu"]
+    mem_stats = rolling.windows["mem"]
+    log(
+        f"Utilização da CPU: {values['cpu']}%, "
+        f"Utilização de Memória: {values['mem']}%, Swap: {values['swap']}%, Load: {values['load']:.2f} | "
+        f"CPU p{RESTART_CPU_PERCENTILE}: {cpu_stats.percentile(RESTART_CPU_PERCENTILE):.1f}%, "
+        f"Memória EWMA: {rolling.ewma['mem'].value:.1f}%, "
+        f"tendência: {mem_stats.slope() * 60 if mem_stats.count > 1 else 0.0:+.3f}%/min"
+    )
+    eta = tick.notes.get("eta")
+    if eta is not None and eta <= 2 * FORECAST_HORIZON:
+        log(f"Previsão: memória em {FORECAST_CRITICAL}% em {eta / 60:.0f} minutos "
+            f"({forecaster.slope * 3600:+.1f}%/h).")
+    if status["low_cpu_seconds"]:
+        log(f"CPU abaixo do limite e memória acima do limite por {status['low_cpu_seconds']:.0f} segundos.")
+
+# A varredura de processos roda em uma thread para não bloquear o laço, e só perto dos limites
+async def log_top_processes(tick):
+    if not tick.alert:
+        return
+    top = await asyncio.get_running_loop().run_in_executor(None, process_tracker.sample)
+    tick.notes["top_processes"] = top
+    truncated = " (varredura truncada pelo limite de CPU)" if process_tracker.last_truncated else ""
+    log(
+        f"Maiores consumidores de memória{truncated}: {format_top(top)} "
+        f"[{process_tracker.last_process_count} processos em {process_tracker.last_cpu_time * 1000:.0f}ms de CPU]"
+    )
+
+async def remediate_if_needed(tick):
+    await remediation.handle(tick, tick.decision == "remediate")
+
+# A remediação resolveu quando a memória volta para baixo do limite e deixa de subir para o nível crítico
+def memory_recovered(tick):
+    return tick.values["mem"] < MEMORY_MAX_THRESHOLD and not (FORECAST_ENABLED and forecaster.imminent)
+
+# O reboot só é permitido com a condição original (CPU baixa e memória alta confirmadas pela janela)
+def reboot_allowed(tick):
+    return tick.notes.get("low_cpu_confirmed", False)
+
+def log_remediation(message):
+    log(message)
+    write_to_log(RESTART_LOG, f"[{datetime.now()}] {message}")
+
+def reboot(tick):
+    log_restart(tick.values["cpu"], tick.values["mem"], tick.notes.get("top_processes"))
+    restart_system()
 
 # Função para registrar informações de reinício
-def log_restart(cpu_usage, memory_usage):
+def log_restart(cpu_usage, memory_usage, top_processes=None):
     restart_time = datetime.now()
     log_message = (
         f"[{restart_time}] Reiniciando o sistema.\n"
@@ -79,30 +238,135 @@ def log_restart(cpu_usage, memory_usage):
         f" - Memória: {memory_usage}%\n"
         f" - Data/Hora: {restart_time.strftime('%Y-%m-%d %H:%M:%S')}\n"
     )
+    for process in top_processes or []:
+        log_message += f" - Processo: {format_top([process])}\n"
     print(log_message)
     write_to_log(RESTART_LOG, log_message)
 
 # Função para reiniciar o sistema
 def restart_system():
+    # Garante que todas as mensagens em buffer estejam no disco antes do reboot
+    log_writer.flush_all(sync=True)
+    sample_store.sync()
     os.system('sudo reboot')
 
-# Tarefa principal do Rocketry
-@app.task(daily.at("13:00"))  # Executa todos os dias às 13h
-def daily_monitor():
-    print(f"[{datetime.now()}] Tarefa iniciada: Verificando memória...")
-    write_to_log(MONITOR_LOG, f"[{datetime.now()}] Tarefa iniciada: Verificando memória...")
-    
-    if is_memory_high():
-        print(f"[{datetime.now()}] Memória acima do limite. Iniciando monitoramento detalhado.")
-        write_to_log(MONITOR_LOG, f"[{datetime.now()}] Memória acima do limite. Iniciando monitoramento detalhado.")
-        monitor_system()
-    else:
-        print(f"[{datetime.now()}] Memória abaixo do limite. Monitoramento encerrado para hoje.")
-        write_to_log(MONITOR_LOG, f"[{datetime.now()}] Memória abaixo do limite. Monitoramento encerrado para hoje.")
+remediation = RemediationLadder(
+    [
+        DropPageCaches(cooldown=DROP_CACHES_COOLDOWN, settle=DROP_CACHES_SETTLE),
+        RestartPrograms(SUPERVISOR_PROGRAMS, cooldown=PROGRAMS_COOLDOWN, settle=PROGRAMS_SETTLE,
+                        kill_top_process=KILL_TOP_PROCESS),
+        Reboot(reboot, cooldown=REBOOT_COOLDOWN, allowed=reboot_allowed),
+    ],
+    check=memory_recovered,
+    dry_run=REMEDIATION_DRY_RUN,
+    log=log_remediation,
+)
 
-# Inicia o aplicativo Rocketry
-if __name__ == "__main__":
-    print("Iniciando aplicação Monitoramento de Memória Rocketry...")
+# Renderiza as métricas da rodada; a coleta HTTP só devolve o texto já pronto
+def publish_metrics(tick, sampler):
+    metrics.begin()
+    values = tick.values
+    cpu_stats = rolling.windows["cpu"]
+    mem_stats = rolling.windows["mem"]
+    metrics.gauge("monitor_cpu_percent", "Uso de CPU desde a rodada anterior.", values.get("cpu"))
+    metrics.gauge("monitor_memory_percent", "Uso de memória.", values.get("mem"))
+    metrics.gauge("monitor_swap_percent", "Uso de swap.", values.get("swap"))
+    metrics.gauge("monitor_load1", "Load average de 1 minuto.", values.get("load"))
+    metrics.gauge("monitor_memory_ewma_percent", "Média móvel exponencial da memória.", rolling.ewma["mem"].value)
+    metrics.gauge(f"monitor_cpu_p{RESTART_CPU_PERCENTILE}_percent", "Percentil da CPU na janela móvel.",
+                  cpu_stats.percentile(RESTART_CPU_PERCENTILE))
+    metrics.gauge("monitor_memory_trend_percent_per_minute", "Inclinação da memória na janela móvel.",
+                  mem_stats.slope() * 60 if mem_stats.count > 1 else 0.0)
+    if FORECAST_ENABLED:
+        metrics.gauge("monitor_memory_forecast_eta_seconds",
+                      f"Tempo previsto até a memória chegar a {FORECAST_CRITICAL}% (NaN sem tendência de alta).",
+                      tick.notes.get("eta"))
+        metrics.gauge("monitor_memory_forecast_imminent", "1 quando a previsão está abaixo do horizonte.",
+                      forecaster.imminent)
+    metrics.gauge("monitor_low_cpu_streak_seconds", "Tempo contínuo com CPU baixa e memória alta.",
+                  status["low_cpu_seconds"])
+    metrics.gauge("monitor_alert", "1 quando o sistema está perto dos limites (amostragem rápida).", tick.alert)
+
+    steps = remediation.stats()["steps"]
+    for key, help_text in (("attempts", "Remediações executadas."), ("successes", "Remediações que resolveram."),
+                           ("failures", "Remediações que não resolveram."), ("errors", "Remediações que falharam ao executar.")):
+        metrics.counter(f"monitor_remediation_{key}_total", help_text,
+                        samples=[({"step": name}, counts[key]) for name, counts in steps.items()])
+    metrics.gauge("monitor_remediation_level", "Degrau atual da escada de remediação.", remediation.level)
+
+    stats = sampler.stats()
+    metrics.counter("monitor_sampler_ticks_total", "Rodadas do amostrador.", stats["ticks"])
+    metrics.counter("monitor_sampler_overruns_total", "Rodadas mais longas que o intervalo.", stats["overruns"])
+    metrics.counter("monitor_sampler_errors_total", "Exceções levantadas por estágios.", stats["errors"])
+    metrics.gauge("monitor_sampler_interval_seconds", "Intervalo atual do amostrador.", stats["interval"])
+    metrics.gauge("monitor_sampler_phase_seconds", "Duração da fase na última rodada completa.",
+                  samples=[({"phase": phase}, duration) for phase, duration in stats["last_durations"].items()])
+    metrics.gauge("monitor_sampler_phase_max_seconds", "Maior duração observada da fase.",
+                  samples=[({"phase": phase}, duration) for phase, duration in stats["max_durations"].items()])
+    metrics.gauge("monitor_process_scan_cpu_seconds", "CPU gasta na última varredura de processos.",
+                  process_tracker.last_cpu_time)
+    metrics.counter("monitor_samples_written_total", "Amostras gravadas no histórico binário.",
+                    sample_store.records_written)
+
+    writers = log_writer.writers()
+    now = time.time()
+    metrics.gauge("monitor_log_pending_bytes", "Bytes no buffer aguardando gravação.",
+                  samples=[({"file": os.path.basename(w.path)}, w.pending_bytes()) for w in writers])
+    metrics.gauge("monitor_log_flush_age_seconds", "Segundos desde a última gravação do buffer.",
+                  samples=[({"file": os.path.basename(w.path)}, now - w.last_flush) for w in writers])
+    metrics.counter("monitor_log_bytes_written_total", "Bytes gravados no arquivo de log.",
+                    samples=[({"file": os.path.basename(w.path)}, w.bytes_written) for w in writers])
+    metrics.counter("monitor_log_write_errors_total", "Falhas ao gravar o buffer no arquivo de log.",
+                    samples=[({"file": os.path.basename(w.path)}, w.write_errors) for w in writers])
+    metrics.counter("monitor_log_dropped_lines_total", "Linhas descartadas com o buffer do log cheio.",
+                    samples=[({"file": os.path.basename(w.path)}, w.dropped_lines) for w in writers])
+    if pusher is not None:
+        pushed = pusher.stats()
+        metrics.counter("monitor_push_samples_total", "Amostras enviadas ao coletor.", pushed["sent_samples"])
+        metrics.counter("monitor_push_dropped_total", "Amostras descartadas com a fila cheia.", pushed["dropped"])
+        metrics.counter("monitor_push_errors_total", "Falhas de envio ao coletor.", pushed["send_errors"])
+        metrics.gauge("monitor_push_pending", "Amostras aguardando envio.", pushed["pending"])
+    metrics.gauge("monitor_last_tick_timestamp_seconds", "Instante da última rodada.", tick.timestamp)
+    metrics.publish()
+
+def log_stage_error(stage, exc):
+    log(f"Erro no estágio {getattr(stage, '__name__', stage)}: {exc!r}")
+
+def build_sampler():
+    sampler = AsyncSampler(
+        samplers=[read_system],
+        evaluators=[evaluate_thresholds],
+        actors=[log_sample, log_top_processes, remediate_if_needed],
+        slow_interval=SLOW_INTERVAL,
+        fast_interval=FAST_INTERVAL,
+        on_error=log_stage_error,
+    )
+
+    def publish(tick):
+        publish_metrics(tick, sampler)
+
+    if pusher is not None:
+        sampler.add_stage("sample", push_sample)
+    if FORECAST_ENABLED:
+        sampler.add_stage("evaluate", forecast_memory)
+    sampler.add_stage("act", publish)
+    return sampler
+
+async def main():
     os.makedirs(LOG_DIR, exist_ok=True)  # Garante que o diretório de logs existe
-    write_to_log(MONITOR_LOG, f"[{datetime.now()}] Aplicação Rocketry iniciada.")
-    app.run()
+    psutil.cpu_percent(interval=None)  # A primeira leitura só define a referência
+    log("Monitoramento contínuo iniciado." + (" Remediação em modo dry-run." if REMEDIATION_DRY_RUN else ""))
+    if METRICS_ENABLED:
+        server = await MetricsServer(metrics, METRICS_HOST, METRICS_PORT).start()
+        log(f"Métricas em http://{METRICS_HOST}:{server.port}/metrics")
+    push_task = asyncio.get_running_loop().create_task(pusher.run()) if pusher is not None else None
+    try:
+        await build_sampler().run()
+    finally:
+        if push_task is not None:
+            push_task.cancel()
+
+# Inicia o monitoramento
+if __name__ == "__main__":
+    print("Iniciando aplicação Monitoramento de Memória...")
+    asyncio.run(main())
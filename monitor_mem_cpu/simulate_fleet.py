@@ -0,0 +1,112 @@
+"""
+Teste de carga do coletor com muitos agentes locais (loopback).
+
+Sobe um `Collector` neste processo e dispara `--agents` processos, cada um simulando
+`--hosts-per-agent` hosts com um `SamplePusher` próprio. Cada host envia `--samples` amostras
+(em `--duration` segundos, ou todas de uma vez com `--burst`). No fim compara o enviado com o
+recebido, mostra os descartes e a memória do coletor e responde "hosts acima de 60% de memória",
+conferindo com o valor esperado.
+
+Uso:
+    python simulate_fleet.py --agents 50 --hosts-per-agent 4 --protocol udp
+    python simulate_fleet.py --agents 50 --protocol tcp --burst
+"""
+import argparse
+import asyncio
+import multiprocessing
+import time
+
+import collector as fleet_collector
+from fleet import SamplePusher
+
+MEMORY_THRESHOLD = 60
+
+
+def host_memory(index):
+    """Memória fixa de cada host simulado (30% a 79%), para saber de antemão quem está acima do limite."""
+    return 30.0 + index % 50
+
+
+async def run_agent(url, first_host, hosts, samples, duration, burst, batch_size):
+    pushers = [SamplePusher(url, host=f"host-{first_host + i:04d}", batch_size=batch_size, max_delay=0.5)
+               for i in range(hosts)]
+    interval = 0 if burst else duration / samples
+    start = time.time()
+    for n in range(samples):
+        for i, pusher in enumerate(pushers):
+            pusher.add(start + n * interval, 5.0, host_memory(first_host + i), 0.0, 0.1)
+            await pusher.flush()
+        if interval:
+            await asyncio.sleep(interval)
+    for pusher in pushers:
+        await pusher.close()
+    return [pusher.stats() for pusher in pushers]
+
+
+def agent_process(url, first_host, hosts, samples, duration, burst, batch_size, results):
+    stats = asyncio.run(run_agent(url, first_host, hosts, samples, duration, burst, batch_size))
+    results.put((
+        sum(s["sent_samples"] for s in stats),
+        sum(s["dropped"] for s in stats),
+        sum(s["send_errors"] for s in stats),
+    ))
+
+
+async def run(args):
+    collector = fleet_collector.Collector(capacity=args.capacity, max_hosts=args.max_hosts)
+    closers, ports = await fleet_collector.start(collector, udp="127.0.0.1:0", tcp="127.0.0.1:0")
+    url = f"{args.protocol}://127.0.0.1:{ports[args.protocol]}"
+
+    results = multiprocessing.Queue()
+    agents = [
+        multiprocessing.Process(target=agent_process, args=(
+            url, i * args.hosts_per_agent, args.hosts_per_agent, args.samples, args.duration,
+            args.burst, args.batch_size, results))
+        for i in range(args.agents)
+    ]
+    started = time.perf_counter()
+    for agent in agents:
+        agent.start()
+    loop = asyncio.get_running_loop()
+    reports = [await loop.run_in_executor(None, results.get) for _ in agents]
+    for agent in agents:
+        await loop.run_in_executor(None, agent.join)
+    await asyncio.sleep(0.5)  # Últimos datagramas ainda no buffer do kernel
+    elapsed = time.perf_counter() - started
+    for closer in closers:
+        closer.close()
+
+    sent = sum(report[0] for report in reports)
+    stats = collector.stats()
+    # Com mais hosts que --max-hosts, quem entra depende da ordem de chegada: confere só os aceitos
+    expected_above = sum(1 for host in collector.hosts if host_memory(int(host.split("-")[1])) > MEMORY_THRESHOLD)
+    above = collector.hosts_above("mem", MEMORY_THRESHOLD)
+
+    print(f"{args.agents} agentes x {args.hosts_per_agent} hosts via {args.protocol.upper()}"
+          f"{' em rajada' if args.burst else ''}: {elapsed:.1f}s")
+    print(f"amostras enviadas {sent:,}, recebidas {stats['samples']:,} "
+          f"({stats['samples'] / sent:.1%}), lotes {stats['packets']:,}")
+    print(f"descartes: fila dos agentes {sum(r[1] for r in reports)}, erros de envio {sum(r[2] for r in reports)}, "
+          f"lotes perdidos {stats['lost_batches']}, inválidos {stats['malformed']}, "
+          f"hosts recusados {stats['rejected_hosts']}")
+    print(f"memória das séries: {stats['ring_bytes'] / 1024 / 1024:.1f}MB para {stats['hosts']} hosts")
+    print(f"hosts acima de {MEMORY_THRESHOLD}% de memória: {len(above)} (esperado {expected_above})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga do coletor com agentes locais")
+    parser.add_argument("--agents", type=int, default=50)
+    parser.add_argument("--hosts-per-agent", type=int, default=4)
+    parser.add_argument("--samples", type=int, default=200, help="amostras por host")
+    parser.add_argument("--duration", type=float, default=5.0, help="segundos para enviar as amostras")
+    parser.add_argument("--burst", action="store_true", help="envia todas as amostras sem pausa")
+    parser.add_argument("--protocol", choices=("udp", "tcp"), default="udp")
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--capacity", type=int, default=1024)
+    parser.add_argument("--max-hosts", type=int, default=1000)
+    args = parser.parse_args(argv)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Bancada para medir o tempo de recuperação da escada de remediação sem tocar no servidor.
+
+Modo simulado (padrão): um modelo de memória com vazamento é amostrado em tempo virtual pelos
+mesmos estágios de avaliação do serviço (`evaluate_thresholds` e `restart_condition_met`), e a
+`RemediationLadder` executa degraus simulados, cada um liberando uma parte da memória. Cada
+cenário mostra quais degraus foram usados e quanto tempo levou até a recuperação ser confirmada.
+
+Modo real (`--real MB`): um processo filho aloca MB de memória de verdade. Os limites são
+calculados a partir do uso atual; a limpeza de caches e o reboot ficam em dry-run e o degrau de
+programas encerra apenas o processo filho. O tempo de recuperação é medido no relógio real.
+
+Uso:
+    python simulate_remediation.py
+    python simulate_remediation.py --real 512
+"""
+import argparse
+import asyncio
+import multiprocessing
+import time
+
+import psutil
+
+import service_mem_monitor as service
+from remediation import RemediationLadder, RemediationStep
+from sampler import Tick
+from samples import RollingMonitor
+
+
+class MemoryModel:
+    """Memória (%) que cresce `leak` pontos por segundo até uma ação estancar o vazamento."""
+
+    def __init__(self, start, leak):
+        self.value = start
+        self.leak = leak
+
+    def advance(self, seconds):
+        self.value = min(100.0, self.value + self.leak * seconds)
+
+    def release(self, points, stop_leak):
+        self.value = max(0.0, self.value - points)
+        if stop_leak:
+            self.leak = 0.0
+
+
+class SimulatedStep(RemediationStep):
+    def __init__(self, name, model, points, stop_leak, cooldown, settle):
+        super().__init__(cooldown=cooldown, settle=settle)
+        self.name = name
+        self.model = model
+        self.points = points
+        self.stop_leak = stop_leak
+
+    def describe(self, tick):
+        return f"libera {self.points} ponto(s){' e estanca o vazamento' if self.stop_leak else ''}"
+
+    def run(self, tick):
+        self.model.release(self.points, self.stop_leak)
+
+
+# Pontos de memória liberados por degrau e se ele estanca o vazamento, por cenário
+SCENARIOS = {
+    "caches resolvem": {"limpar caches": (15, True), "reiniciar programas": (30, True), "reiniciar servidor": (50, True)},
+    "programa vazando": {"limpar caches": (1, False), "reiniciar programas": (30, True), "reiniciar servidor": (50, True)},
+    "só reboot resolve": {"limpar caches": (1, False), "reiniciar programas": (2, False), "reiniciar servidor": (50, True)},
+}
+
+
+def reset_service_state():
+    service.rolling = RollingMonitor(capacity=service.ROLLING_CAPACITY, window_seconds=service.ROLLING_WINDOW)
+    service.status["low_cpu_seconds"] = 0.0
+
+
+async def run_scenario(name, effects, leak, duration):
+    reset_service_state()
+    model = MemoryModel(start=service.MEMORY_MAX_THRESHOLD - 5, leak=leak)
+    settings = [
+        ("limpar caches", service.DROP_CACHES_COOLDOWN, service.DROP_CACHES_SETTLE),
+        ("reiniciar programas", service.PROGRAMS_COOLDOWN, service.PROGRAMS_SETTLE),
+        ("reiniciar servidor", service.REBOOT_COOLDOWN, 60),
+    ]
+    steps = [SimulatedStep(step, model, *effects[step], cooldown, settle) for step, cooldown, settle in settings]
+    events = []
+    clock = [0.0]
+    ladder = RemediationLadder(steps, check=service.memory_recovered,
+                               log=lambda message: events.append(f"  t={clock[0]:6.0f}s {message}"))
+
+    now, previous, seq = 0.0, None, 0
+    crossed = recovered = None
+    while now < duration:
+        clock[0] = now
+        tick = Tick(seq, now, now - previous if previous is not None else 0.0)
+        tick.values.update(cpu=0.5, mem=model.value, swap=0.0, load=0.0)
+        service.rolling.add(now, 0.5, model.value, 0.0, 0.0)
+        service.evaluate_thresholds(tick)
+        await ladder.handle(tick, tick.decision == "remediate")
+
+        if crossed is None and model.value >= service.MEMORY_MAX_THRESHOLD:
+            crossed = now
+        if crossed is not None and recovered is None and ladder.pending is None and service.memory_recovered(tick):
+            recovered = now
+            break
+        interval = service.FAST_INTERVAL if tick.alert else service.SLOW_INTERVAL
+        previous, now, seq = now, now + interval, seq + 1
+        model.advance(interval)
+
+    print(f"Cenário '{name}':")
+    for line in events:
+        print(line)
+    if recovered is None:
+        print(f"  não recuperou em {duration:.0f}s")
+    else:
+        print(f"  recuperação confirmada {recovered - crossed:.0f}s depois de cruzar o limite (t={crossed:.0f}s)")
+    used = [step for step, counts in ladder.stats()["steps"].items() if counts["attempts"]]
+    print(f"  degraus usados: {', '.join(used) or 'nenhum'}\n")
+
+
+def hog(megabytes):
+    block = bytearray(megabytes * 1024 * 1024)
+    for offset in range(0, len(block), 4096):  # Toca cada página para que vire memória residente
+        block[offset] = 1
+    time.sleep(3600)
+
+
+class TerminateHog(RemediationStep):
+    name = "reiniciar programas"
+
+    def __init__(self, process, settle):
+        super().__init__(cooldown=0, settle=settle)
+        self.process = process
+
+    def describe(self, tick):
+        return f"SIGTERM no processo de carga [{self.process.pid}]"
+
+    def run(self, tick):
+        self.process.terminate()
+        self.process.join()
+
+
+class DryRunStep(RemediationStep):
+    def __init__(self, name, settle):
+        super().__init__(cooldown=0, settle=settle)
+        self.name = name
+
+    def describe(self, tick):
+        return "apenas registrado (dry-run)"
+
+    def run(self, tick):
+        pass
+
+
+async def run_real(megabytes, interval, settle):
+    total = psutil.virtual_memory().total
+    baseline = psutil.virtual_memory().percent
+    threshold = baseline + megabytes * 1024 * 1024 / total * 100 / 2
+    print(f"Uso atual {baseline:.1f}%; limite da simulação {threshold:.1f}% (+{megabytes}MB de carga)")
+
+    process = multiprocessing.Process(target=hog, args=(megabytes,), daemon=True)
+    process.start()
+    started = time.time()
+    ladder = RemediationLadder(
+        [DryRunStep("limpar caches", settle), TerminateHog(process, settle), DryRunStep("reiniciar servidor", settle)],
+        check=lambda tick: tick.values["mem"] < threshold,
+        log=lambda message: print(f"  t={time.time() - started:5.1f}s {message}"),
+    )
+
+    crossed = None
+    previous = None
+    while True:
+        now = time.time()
+        tick = Tick(0, now, now - previous if previous else 0.0)
+        tick.values["mem"] = psutil.virtual_memory().percent
+        previous = now
+        above = tick.values["mem"] >= threshold
+        if above and crossed is None:
+            crossed = now
+            print(f"  t={now - started:5.1f}s memória em {tick.values['mem']:.1f}%: limite cruzado")
+        await ladder.handle(tick, above)
+        if crossed is not None and not above and ladder.pending is None:
+            print(f"  t={now - started:5.1f}s memória em {tick.values['mem']:.1f}%: recuperado em {now - crossed:.1f}s")
+            break
+        if now - started > 120:
+            print("  sem recuperação em 120s")
+            break
+        await asyncio.sleep(interval)
+    if process.is_alive():
+        process.terminate()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede o tempo de recuperação da escada de remediação")
+    parser.add_argument("--real", type=int, metavar="MB", help="aloca MB de memória em um processo filho")
+    parser.add_argument("--leak", type=float, default=0.2, help="vazamento simulado, em pontos percentuais por segundo")
+    parser.add_argument("--duration", type=float, default=4 * 3600, help="duração máxima (tempo virtual) por cenário")
+    parser.add_argument("--interval", type=float, default=0.5, help="intervalo de amostragem no modo real")
+    parser.add_argument("--settle", type=float, default=2.0, help="espera antes da verificação no modo real")
+    args = parser.parse_args(argv)
+
+    if args.real:
+        asyncio.run(run_real(args.real, args.interval, args.settle))
+        return
+    for name, effects in SCENARIOS.items():
+        asyncio.run(run_scenario(name, effects, args.leak, args.duration))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+import bisect
+import math
+import mmap
+import os
+import struct
+import time
+from datetime import date, datetime, timedelta
+
+# Colunas de cada registro, na mesma ordem de samples.FIELDS
+FIELDS = ("timestamp", "cpu", "mem", "swap", "load")
+
+# Cabeçalho de cada segmento: assinatura, versão, colunas, tamanho do registro e instante base
+HEADER = struct.Struct("<8sHHId")
+MAGIC = b"MONTS\x00\x00\x01"
+VERSION = 1
+# Registro de largura fixa: 5 float32. O instante é gravado em segundos desde o início do dia do
+# segmento (float32 tem resolução melhor que 10ms nesse intervalo).
+RECORD = struct.Struct("<5f")
+
+SEGMENT_PREFIX = "amostras-"
+SEGMENT_SUFFIX = ".bin"
+
+
+def segment_name(day):
+    return f"{SEGMENT_PREFIX}{day:%Y%m%d}{SEGMENT_SUFFIX}"
+
+
+def segment_day(name):
+    """Dia de um arquivo de segmento, ou None se o nome não for de um segmento."""
+    if not (name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)):
+        return None
+    try:
+        return datetime.strptime(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)], "%Y%m%d").date()
+    except ValueError:
+        return None
+
+
+def day_start(day):
+    return time.mktime(day.timetuple())
+
+
+class Segment:
+    """
+    Leitura de um segmento diário mapeado em memória.
+
+    O arquivo é mapeado com `mmap` e visto como uma sequência plana de float32; cada coluna é uma
+    fatia com passo (`flat[i::5]`), sem cópia. Como os registros são gravados em ordem de tempo, a
+    coluna de instantes é ordenada e serve de índice: `bisect` localiza o início e o fim de um
+    intervalo lendo só O(log n) registros.
+
+    Deve ser usado como gerenciador de contexto, para que o mapeamento seja liberado.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as source:
+            self._mmap = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, fields, record_size, self.base = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION or fields != len(FIELDS) or record_size != RECORD.size:
+            self._mmap.close()
+            raise ValueError(f"{path} não é um segmento de amostras válido")
+        # Um registro incompleto no fim (gravação interrompida) é ignorado
+        self.count = (len(self._mmap) - HEADER.size) // RECORD.size
+        self._view = memoryview(self._mmap)[HEADER.size:HEADER.size + self.count * RECORD.size]
+        self._flat = self._view.cast("f")
+        self.columns = {name: self._flat[index::len(FIELDS)] for index, name in enumerate(FIELDS)}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for column in self.columns.values():
+            column.release()
+        self._flat.release()
+        self._view.release()
+        self._mmap.close()
+
+    def bounds(self, start, end):
+        """Índices [lo, hi) dos registros com instante entre `start` e `end` (epoch, inclusivo)."""
+        offsets = self.columns["timestamp"]
+        lo = 0 if start is None else bisect.bisect_left(offsets, start - self.base)
+        hi = self.count if end is None else bisect.bisect_right(offsets, end - self.base)
+        return lo, max(lo, hi)
+
+    def values(self, field, lo, hi):
+        with self.columns[field][lo:hi] as part:
+            values = part.tolist()
+        if field == "timestamp":
+            base = self.base
+            return [base + offset for offset in values]
+        return values
+
+
+class TimeSeriesStore:
+    """
+    Gravação das amostras do monitor em segmentos binários diários, somente de acréscimo.
+
+    Cada dia vira um arquivo `amostras-AAAAMMDD.bin` com um cabeçalho de 24 bytes e registros de
+    20 bytes (instante, CPU, memória, swap, load), cerca de 560KB por dia com uma amostra a cada
+    3 segundos. Valores desconhecidos são gravados como NaN. Os instantes de um segmento nunca
+    diminuem (um relógio que volta é limitado ao último instante gravado), o que mantém o
+    índice de tempo ordenado. Segmentos com mais de `retention_days` dias são apagados.
+    """
+
+    def __init__(self, directory, retention_days=90):
+        self.directory = directory
+        self.retention_days = retention_days
+        self._fd = None
+        self._day = None
+        self._base = 0.0
+        self._last_offset = 0.0
+        self.records_written = 0
+
+    def _open_segment(self, day):
+        self.close()
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, segment_name(day))
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        size = os.fstat(fd).st_size
+        if size < HEADER.size:
+            os.ftruncate(fd, 0)
+            self._base = day_start(day)
+            os.write(fd, HEADER.pack(MAGIC, VERSION, len(FIELDS), RECORD.size, self._base))
+            self._last_offset = 0.0
+        else:
+            magic, version, fields, record_size, self._base = HEADER.unpack(os.pread(fd, HEADER.size, 0))
+            if magic != MAGIC or version != VERSION or fields != len(FIELDS) or record_size != RECORD.size:
+                os.close(fd)
+                raise ValueError(f"{path} não é um segmento de amostras válido")
+            records = (size - HEADER.size) // RECORD.size
+            end = HEADER.size + records * RECORD.size
+            if end != size:
+                os.ftruncate(fd, end)  # Descarta um registro incompleto de uma gravação interrompida
+            self._last_offset = RECORD.unpack(os.pread(fd, RECORD.size, end - RECORD.size))[0] if records else 0.0
+        self._fd = fd
+        self._day = day
+        self._remove_old_segments(day)
+
+    def append(self, timestamp, cpu, mem, swap, load):
+        day = date.fromtimestamp(timestamp)
+        if day != self._day:
+            self._open_segment(day)
+        offset = max(timestamp - self._base, self._last_offset)
+        self._last_offset = offset
+        # Um único write por registro: com O_APPEND, leitores nunca veem um registro pela metade
+        os.write(self._fd, RECORD.pack(offset, cpu, mem, swap, load))
+        self.records_written += 1
+
+    def sync(self):
+        if self._fd is not None:
+            os.fsync(self._fd)
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            self._day = None
+
+    def _remove_old_segments(self, today):
+        if not self.retention_days:
+            return
+        oldest = today - timedelta(days=self.retention_days)
+        for name in os.listdir(self.directory):
+            day = segment_day(name)
+            if day is not None and day < oldest:
+                os.remove(os.path.join(self.directory, name))
+
+
+# ---------------------------------------------------------------------------
+# Consultas
+# ---------------------------------------------------------------------------
+
+def segment_paths(directory, start=None, end=None):
+    """Segmentos (em ordem) que podem conter amostras entre `start` e `end` (epoch)."""
+    if not os.path.isdir(directory):
+        return []
+    # Um dia a mais de folga nas pontas cobre instantes limitados pelo relógio e mudanças de horário
+    first = None if start is None else date.fromtimestamp(start) - timedelta(days=1)
+    last = None if end is None else date.fromtimestamp(end) + timedelta(days=1)
+    selected = []
+    for name in os.listdir(directory):
+        day = segment_day(name)
+        if day is None or (first and day < first) or (last and day > last):
+            continue
+        selected.append((day, os.path.join(directory, name)))
+    return [path for _, path in sorted(selected)]
+
+
+def read_range(directory, start=None, end=None, fields=FIELDS):
+    """Amostras entre `start` e `end` como colunas: {campo: [valores]}."""
+    result = {field: [] for field in fields}
+    for path in segment_paths(directory, start, end):
+        with Segment(path) as segment:
+            lo, hi = segment.bounds(start, end)
+            for field in fields:
+                result[field].extend(segment.values(field, lo, hi))
+    return result
+
+
+def downsample(directory, field, bucket_seconds, start=None, end=None):
+    """
+    Agrega uma coluna em faixas de `bucket_seconds` alinhadas ao epoch.
+
+    Os limites de cada faixa são localizados com `bisect` no índice de tempo; os valores da faixa
+    são lidos de uma vez da fatia mapeada. Retorna [(início, quantidade, mínimo, média, máximo)].
+    """
+    buckets = {}
+    for path in segment_paths(directory, start, end):
+        with Segment(path) as segment:
+            lo, hi = segment.bounds(start, end)
+            if lo == hi:
+                continue
+            offsets = segment.columns["timestamp"]
+            base = segment.base
+            index = lo
+            while index < hi:
+                bucket = math.floor((base + offsets[index]) / bucket_seconds) * bucket_seconds
+                stop = min(hi, bisect.bisect_left(offsets, bucket + bucket_seconds - base, index, hi))
+                stop = max(stop, index + 1)
+                values = [v for v in segment.values(field, index, stop) if v == v]  # Ignora NaN
+                if values:
+                    count, total, low, high = buckets.get(bucket, (0, 0.0, math.inf, -math.inf))
+                    buckets[bucket] = (
+                        count + len(values), total + sum(values), min(low, min(values)), max(high, max(values))
+                    )
+                index = stop
+    return [
+        (bucket, count, low, total / count, high)
+        for bucket, (count, total, low, high) in sorted(buckets.items())
+    ]
+
+
+def percentile(ordered, p):
+    """Percentil pelo método do posto mais próximo em uma lista já ordenada."""
+    if not ordered:
+        return None
+    rank = max(1, math.ceil(len(ordered) * p / 100.0))
+    return ordered[rank - 1]
+
+
+def summarize(directory, field, start=None, end=None):
+    """Estatísticas de uma coluna no intervalo: quantidade, mínimo, média, máximo e percentis."""
+    columns = read_range(directory, start, end, fields=("timestamp", field))
+    values = sorted(v for v in columns[field] if v == v)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "first": columns["timestamp"][0],
+        "last": columns["timestamp"][-1],
+        "min": values[0],
+        "mean": sum(values) / len(values),
+        "max": values[-1],
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+    }